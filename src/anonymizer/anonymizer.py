@@ -22,6 +22,7 @@ from pydicom import dcmread
 from pydicom._version import __version__ as pydicom_version  # type: ignore
 from pynetdicom._version import __version__ as pynetdicom_version  # type: ignore
 
+from anonymizer.controller.ocr_service import OCR_MODEL_DIR, get_ocr_service
 from anonymizer.controller.project import ProjectController
 from anonymizer.model.project import DICOMRuntimeError, ProjectModel
 from anonymizer.utils.logging import init_logging
@@ -483,6 +484,10 @@ class Anonymizer(ctk.CTk):
 
         try:
             self.controller.start_scp()
+            # Resume any bulk move jobs interrupted by a restart or crash:
+            self.controller.resume_move_jobs_ex()
+            # Resume queued exports and retry failed exports:
+            self.controller.start_export_queue_ex()
         except DICOMRuntimeError as e:
             messagebox.showerror(title=_("Local DICOM Server Error"), message=str(e), parent=self)
 
@@ -519,6 +524,7 @@ class Anonymizer(ctk.CTk):
             self.dashboard.destroy()
             self.dashboard = None
         if self.controller:
+            self.controller.stop_export_queue()
             self.controller.stop_scp()
             self.controller.shutdown()
             self.controller.save_model()
@@ -1183,6 +1189,11 @@ def run_HEADLESS(project_model_path: Path):
         logger.error(_("Local DICOM Server Error") + f": {e}")
         return
 
+    # Resume any bulk move jobs interrupted by a restart or crash:
+    controller.resume_move_jobs_ex()
+    # Resume queued exports and retry failed exports unattended:
+    controller.start_export_queue_ex()
+
     logger.info(
         f"{controller.model.project_name}[{controller.model.site_id}] => {controller.model.abridged_storage_dir()}"
     )
@@ -1205,6 +1216,7 @@ def run_HEADLESS(project_model_path: Path):
 
     logger.info("ANONYMIZER HEADLESS MAINLOOP end.")
 
+    controller.stop_export_queue()
     controller.stop_scp()
     controller.shutdown()
     controller.save_model()
@@ -1234,20 +1246,11 @@ def main(config: Path | None = None):
     logger.info(f"Customtkinter Version: {ctk.__version__}")
     logger.info(f"pydicom Version: {pydicom_version}, pynetdicom Version: {pynetdicom_version}")
 
-    ocr_model_dir = Path("assets/ocr/model")
-    if not ocr_model_dir.exists():
-        logger.warning("Downloading OCR models...")
-        from easyocr import Reader
-
-        Reader(
-            lang_list=["en", "de", "fr", "es"],
-            model_storage_directory=ocr_model_dir,
-            verbose=True,
-        )
-    models = os.listdir(ocr_model_dir)
+    # Download OCR models if not present, the OCR service loads the models on first use:
+    models = get_ocr_service().download_models()
     if len(models) < 2:
         logger.error("Error downloading OCR detection and recognition models")
-        ocr_model_dir.unlink()
+        shutil.rmtree(OCR_MODEL_DIR, ignore_errors=True)
     else:
         logger.info(f"OCR downloaded models: {models}")
 
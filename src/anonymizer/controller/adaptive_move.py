@@ -0,0 +1,306 @@
+"""
+Adaptive control of bulk DICOM C-MOVE operations.
+
+This module provides the AdaptiveMoveController class used by ProjectController._manage_move to:
+- tune the number of concurrent study moves using AIMD (Additive Increase, Multiplicative Decrease)
+- fall back from STUDY to SERIES to INSTANCE move level, per study, when the remote PACS misbehaves
+
+The controller is fed a MoveOutcome for every completed study move and measures per study throughput,
+timeouts and C-MOVE failure statuses. Every decision it takes is logged.
+"""
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from enum import Enum
+
+from anonymizer.utils.translate import _
+
+logger = logging.getLogger(__name__)
+
+
+class MoveLevel(Enum):
+    STUDY = "STUDY"
+    SERIES = "SERIES"
+    INSTANCE = "INSTANCE"
+
+    @classmethod
+    def from_str(cls, level: str | None, default: "MoveLevel") -> "MoveLevel":
+        """
+        Converts a move level string (eg. from MoveStudiesRequest.level) to a MoveLevel.
+        The level may be the English or translated label shown in the view, IMAGE is accepted as an alias for INSTANCE.
+        """
+        if not level:
+            return default
+        level = level.strip().upper()
+        for move_level, labels in [
+            (cls.STUDY, ["STUDY"]),
+            (cls.SERIES, ["SERIES"]),
+            (cls.INSTANCE, ["INSTANCE", "IMAGE"]),
+        ]:
+            if level in labels or level in [_(label).upper() for label in labels]:
+                return move_level
+        if "STUDY" in level:
+            return cls.STUDY
+        if level in ["IMAGE", "INSTANCE"]:
+            return cls.INSTANCE
+        if "SERIES" in level:
+            return cls.SERIES
+        return default
+
+    def next_level_down(self) -> "MoveLevel | None":
+        if self == MoveLevel.STUDY:
+            return MoveLevel.SERIES
+        if self == MoveLevel.SERIES:
+            return MoveLevel.INSTANCE
+        return None
+
+
+class MoveOutcomeType(Enum):
+    SUCCESS = "success"
+    SKIPPED = "skipped"  # nothing to move, eg. all instances already imported
+    TIMEOUT = "timeout"
+    FAILURE_STATUS = "failure status"  # C-MOVE failure status which may be resolved by moving at a lower level
+    CONNECTION_ERROR = "connection error"
+    PERMANENT_ERROR = "permanent error"  # eg. Move destination unknown, down leveling will not help
+    ABORTED = "aborted"
+
+
+@dataclass
+class MoveOutcome:
+    study_uid: str
+    level: MoveLevel
+    duration: float  # seconds
+    instances_moved: int
+    error_msg: str | None
+
+    # C-MOVE failure statuses which will not be resolved by moving the study at a lower level:
+    PERMANENT_FAILURE_STATUSES = [
+        0xA801,  # Refused: Move destination unknown
+    ]
+    # Error messages returned by ProjectController move operations which indicate there was nothing to move:
+    SKIP_ERROR_MSGS = ["No Series in Study", "No Instances in Study", "All Instances already imported"]
+
+    def throughput(self) -> float:
+        """Instances moved per second"""
+        if self.duration <= 0:
+            return 0.0
+        return self.instances_moved / self.duration
+
+    def outcome_type(self) -> MoveOutcomeType:
+        """Classifies the error message returned by the ProjectController move operation"""
+        if not self.error_msg:
+            return MoveOutcomeType.SUCCESS
+        if self.error_msg in self.SKIP_ERROR_MSGS:
+            return MoveOutcomeType.SKIPPED
+        # Check for timeout first, "Connection timed out or aborted" is not a user abort:
+        if "timeout" in self.error_msg.lower() or "timed out" in self.error_msg.lower():
+            return MoveOutcomeType.TIMEOUT
+        if "abort" in self.error_msg.lower():
+            return MoveOutcomeType.ABORTED
+        match = re.search(r"STATUS:\s*(0X[0-9A-F]+)", self.error_msg.upper())
+        if match:
+            if int(match.group(1), 16) in self.PERMANENT_FAILURE_STATUSES:
+                return MoveOutcomeType.PERMANENT_ERROR
+            return MoveOutcomeType.FAILURE_STATUS
+        if "connection" in self.error_msg.lower():
+            return MoveOutcomeType.CONNECTION_ERROR
+        return MoveOutcomeType.PERMANENT_ERROR
+
+
+class AdaptiveMoveController:
+    """
+    AIMD controller for the number of concurrent study moves and per study move level fallback.
+
+    Concurrency:
+        Additive increase by increase_step after every successful study move whose throughput
+        has not degraded below degraded_throughput_ratio of the moving average throughput.
+        Multiplicative decrease by decrease_factor on timeouts, failure statuses & connection errors
+        or when the throughput of a successful move has degraded.
+
+    Move level fallback:
+        On timeout, failure status or connection error, a study is retried at the next level down
+        (STUDY => SERIES => INSTANCE), limited by lowest_level.
+
+    If adaptive is False, concurrency remains fixed at initial_concurrency and there is no level fallback.
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int,
+        max_concurrency: int,
+        lowest_level: MoveLevel = MoveLevel.INSTANCE,
+        adaptive: bool = True,
+        min_concurrency: int = 1,
+        increase_step: int = 1,
+        decrease_factor: float = 0.5,
+        degraded_throughput_ratio: float = 0.5,
+        throughput_smoothing: float = 0.3,
+    ):
+        if min_concurrency < 1:
+            raise ValueError("min_concurrency must be at least 1")
+        if max_concurrency < min_concurrency:
+            raise ValueError("max_concurrency must be greater than or equal to min_concurrency")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.adaptive = adaptive
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.lowest_level = lowest_level
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.degraded_throughput_ratio = degraded_throughput_ratio
+        self.throughput_smoothing = throughput_smoothing
+        self._concurrency = min(max(initial_concurrency, min_concurrency), max_concurrency)
+        self._avg_throughput: float | None = None  # exponential moving average, instances/sec
+        self._lock = threading.Lock()
+        logger.info(
+            f"AdaptiveMoveController adaptive={adaptive} concurrency={self._concurrency} "
+            f"range=[{min_concurrency}..{max_concurrency}] lowest_level={lowest_level.value}"
+        )
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    @property
+    def avg_throughput(self) -> float | None:
+        return self._avg_throughput
+
+    def _increase(self, reason: str) -> None:
+        new_concurrency = min(self._concurrency + self.increase_step, self.max_concurrency)
+        if new_concurrency != self._concurrency:
+            logger.info(f"Move concurrency INCREASE {self._concurrency} => {new_concurrency}: {reason}")
+            self._concurrency = new_concurrency
+
+    def _decrease(self, reason: str) -> None:
+        new_concurrency = max(int(self._concurrency * self.decrease_factor), self.min_concurrency)
+        if new_concurrency != self._concurrency:
+            logger.warning(f"Move concurrency DECREASE {self._concurrency} => {new_concurrency}: {reason}")
+            self._concurrency = new_concurrency
+        else:
+            logger.warning(f"Move concurrency HOLD at minimum {self._concurrency}: {reason}")
+
+    def _fallback_level(self, outcome: MoveOutcome, reason: str) -> MoveLevel | None:
+        next_level = outcome.level.next_level_down()
+        if next_level is None or list(MoveLevel).index(next_level) > list(MoveLevel).index(self.lowest_level):
+            logger.warning(
+                f"Study[{outcome.study_uid}] move FAILED at {outcome.level.value} level, no further fallback: {reason}"
+            )
+            return None
+        logger.warning(
+            f"Study[{outcome.study_uid}] move level FALLBACK {outcome.level.value} => {next_level.value}: {reason}"
+        )
+        return next_level
+
+    def record(self, outcome: MoveOutcome) -> MoveLevel | None:
+        """
+        Record the outcome of a study move and adapt concurrency accordingly.
+
+        Args:
+            outcome (MoveOutcome): The outcome of the completed study move.
+
+        Returns:
+            MoveLevel | None: The level at which the study should be re-submitted, or None if no retry is required.
+        """
+        self._log_outcome(outcome)
+
+        if not self.adaptive:
+            return None
+
+        with self._lock:
+            reason = self._adapt(outcome)
+            return self._fallback_level(outcome, reason) if reason else None
+
+    def record_batch(self, outcomes: list[MoveOutcome]) -> list[MoveLevel | None]:
+        """
+        Record the outcomes of a batch of studies moved with a single C-MOVE request.
+        Concurrency is adapted once for the batch as a whole, level fallback is determined per study.
+
+        Args:
+            outcomes (list[MoveOutcome]): The outcome of each study in the batch, the duration is that of the whole batch.
+
+        Returns:
+            list[MoveLevel | None]: For each study, the level at which it should be re-submitted, or None.
+        """
+        for outcome in outcomes:
+            self._log_outcome(outcome)
+
+        if not self.adaptive or not outcomes:
+            return [None] * len(outcomes)
+
+        # One outcome for the C-MOVE request: the first back-off error of any study or the total instances moved:
+        backoff_types = [MoveOutcomeType.TIMEOUT, MoveOutcomeType.FAILURE_STATUS, MoveOutcomeType.CONNECTION_ERROR]
+        backoff_errors = [outcome.error_msg for outcome in outcomes if outcome.outcome_type() in backoff_types]
+        if backoff_errors:
+            error_msg = backoff_errors[0]
+        elif any(outcome.outcome_type() == MoveOutcomeType.SUCCESS for outcome in outcomes):
+            error_msg = None
+        else:
+            error_msg = outcomes[0].error_msg
+        batch_outcome = MoveOutcome(
+            f"batch of {len(outcomes)}",
+            MoveLevel.STUDY,
+            max(outcome.duration for outcome in outcomes),
+            sum(outcome.instances_moved for outcome in outcomes),
+            error_msg,
+        )
+
+        with self._lock:
+            self._adapt(batch_outcome)
+            next_levels = []
+            for outcome in outcomes:
+                outcome_type = outcome.outcome_type()
+                if outcome_type in backoff_types:
+                    next_levels.append(self._fallback_level(outcome, f"{outcome_type.value}: {outcome.error_msg}"))
+                else:
+                    next_levels.append(None)
+            return next_levels
+
+    def _log_outcome(self, outcome: MoveOutcome) -> None:
+        logger.info(
+            f"Study[{outcome.study_uid}] move {outcome.outcome_type().value} at {outcome.level.value} level: "
+            f"{outcome.instances_moved} instances in {outcome.duration:.1f}s ({outcome.throughput():.2f} instances/s)"
+        )
+
+    def _adapt(self, outcome: MoveOutcome) -> str | None:
+        """
+        Adapt concurrency to the outcome of a move, must be called with the lock held.
+
+        Returns:
+            str | None: The reason for a move level fallback, or None if no fallback is required.
+        """
+        outcome_type = outcome.outcome_type()
+        throughput = outcome.throughput()
+
+        if outcome_type == MoveOutcomeType.SUCCESS:
+            if outcome.instances_moved == 0:
+                return None
+            if self._avg_throughput is None:
+                self._avg_throughput = throughput
+                self._increase(f"first study moved at {throughput:.2f} instances/s")
+                return None
+            reason = f"throughput {throughput:.2f} vs average {self._avg_throughput:.2f} instances/s"
+            if throughput < self.degraded_throughput_ratio * self._avg_throughput:
+                self._decrease("degraded " + reason)
+            else:
+                self._increase(reason)
+            self._avg_throughput = (
+                self.throughput_smoothing * throughput + (1 - self.throughput_smoothing) * self._avg_throughput
+            )
+            return None
+
+        if outcome_type in [MoveOutcomeType.SKIPPED, MoveOutcomeType.ABORTED]:
+            return None
+
+        reason = f"{outcome_type.value}: {outcome.error_msg}"
+
+        if outcome_type == MoveOutcomeType.PERMANENT_ERROR:
+            logger.warning(f"Study[{outcome.study_uid}] move FAILED, no fallback for {reason}")
+            return None
+
+        # TIMEOUT, FAILURE_STATUS, CONNECTION_ERROR: back-off and fallback to lower move level
+        self._decrease(reason)
+        return reason
@@ -27,13 +27,30 @@ from queue import Queue
 from shutil import copyfile
 
 import torch
-from easyocr import Reader
+from cv2 import setNumThreads
 from pydicom import DataElement, Dataset, Sequence, dcmread
 from pydicom.errors import InvalidDicomError
 
-from anonymizer.controller.remove_pixel_phi import remove_pixel_phi
+from anonymizer.controller.ocr_service import OCRService, get_ocr_service
+from anonymizer.controller.remove_pixel_phi import (
+    TextPrefilter,
+    UserRectangle,
+    remove_pixel_phi,
+    remove_pixel_phi_from_dataset,
+    select_pixel_phi_rule,
+    split_thread_budget,
+)
 from anonymizer.model.anonymizer import AnonymizerModel
-from anonymizer.model.project import DICOMNode, ProjectModel
+from anonymizer.model.project import (
+    PIXEL_PHI_BLACKOUT,
+    PIXEL_PHI_DETECT,
+    PIXEL_PHI_IN_MEMORY_HOLD,
+    PIXEL_PHI_IN_MEMORY_PROVISIONAL,
+    PIXEL_PHI_SKIP,
+    DICOMNode,
+    PixelPHIRule,
+    ProjectModel,
+)
 from anonymizer.utils.storage import DICOM_FILE_SUFFIX
 from anonymizer.utils.translate import _
 
@@ -47,6 +64,7 @@ class QuarantineDirectories(Enum):
     INVALID_STORAGE_CLASS = _("Invalid_Storage_Class")
     CAPTURE_PHI_ERROR = _("Capture_PHI_Error")
     STORAGE_ERROR = _("Storage_Error")
+    PIXEL_PHI_ERROR = _("Pixel_PHI_Error")
 
 
 class AnonymizerController:
@@ -104,7 +122,14 @@ class AnonymizerController:
         logger.info(f"Anonymizer Model initialised from script: {project_model.anonymizer_script_path}")
 
         self._anon_ds_Q: Queue = Queue()  # queue for dataset workers
-        self._anon_px_Q: Queue = Queue()  # queue for pixel phi workers
+        # queue for pixel phi workers, bounded if datasets are held in memory:
+        px_Q_maxsize = 0
+        if self.project_model.pixel_phi_settings.in_memory:
+            px_Q_maxsize = max(self.project_model.pixel_phi_settings.in_memory_max_queued, 1)
+        self._anon_px_Q: Queue = Queue(maxsize=px_Q_maxsize)
+        # phi SOPInstanceUIDs held in memory for the pixel PHI workers, not yet recorded as received:
+        self._held_instances: set[str] = set()
+        self._held_lock = threading.Lock()
         self._worker_threads = []
 
         # Spawn Anonymizer DATASET worker threads:
@@ -117,15 +142,30 @@ class AnonymizerController:
             ds_worker.start()
             self._worker_threads.append(ds_worker)
 
-        # Spawn Remove Pixel PHI Thread:
+        # Spawn Remove Pixel PHI worker threads, sharing the process wide OCR service, loaded on first use:
+        self._ocr_service = get_ocr_service()
+        self._ocr_service.configure(
+            languages=self.project_model.pixel_phi_settings.ocr_languages,
+            idle_timeout=self.project_model.pixel_phi_settings.ocr_idle_timeout,
+            max_concurrency=self.project_model.pixel_phi_settings.ocr_concurrency,
+            backend=self.project_model.pixel_phi_settings.ocr_backend,
+        )
+
+        self._pixel_phi_workers = 0
+        self._text_prefilter: TextPrefilter | None = None
+        if self.project_model.pixel_phi_settings.text_prefilter:
+            self._text_prefilter = TextPrefilter()
         if self.project_model.remove_pixel_phi:
-            px_worker = threading.Thread(
-                target=self._anonymizer_pixel_phi_worker,
-                name="AnonPixelWorker_1",
-                args=(self._anon_px_Q,),
-            )
-            px_worker.start()
-            self._worker_threads.append(px_worker)
+            self._pixel_phi_workers = max(self.project_model.pixel_phi_settings.workers, 1)
+            self._set_pixel_phi_thread_budget()
+            for i in range(self._pixel_phi_workers):
+                px_worker = threading.Thread(
+                    target=self._anonymizer_pixel_phi_worker,
+                    name=f"AnonPixelWorker_{i + 1}",
+                    args=(self._anon_px_Q,),
+                )
+                px_worker.start()
+                self._worker_threads.append(px_worker)
 
         self._active = True
         logger.info("Anonymizer Controller initialised")
@@ -143,6 +183,14 @@ class AnonymizerController:
     def queued(self) -> tuple[int, int]:
         return (self._anon_ds_Q.qsize(), self._anon_px_Q.qsize())
 
+    def text_prefilter_metrics(self) -> tuple[int, int]:
+        """
+        Returns the number of frames checked and rejected (skipped OCR) by the pixel PHI text prefilter.
+        """
+        if not self._text_prefilter:
+            return (0, 0)
+        return (self._text_prefilter.frames_checked, self._text_prefilter.frames_rejected)
+
     def _stop_worker_threads(self):
         logger.info("Stopping Anonymizer Worker Threads")
 
@@ -157,14 +205,23 @@ class AnonymizerController:
         # Wait for all sentinal values to be processed
         self._anon_ds_Q.join()
 
-        if self.project_model.remove_pixel_phi:
+        for __ in range(self._pixel_phi_workers):
             self._anon_px_Q.put(None)
-            self._anon_px_Q.join()
+        self._anon_px_Q.join()
 
         # Wait for all worker threads to finish
         for worker in self._worker_threads:
             worker.join()
 
+        self._ocr_service.unload()
+
+        if self._pixel_phi_workers and self._text_prefilter:
+            checked, rejected = self.text_prefilter_metrics()
+            logger.info(
+                f"Pixel PHI text prefilter rejected {rejected} of {checked} frames "
+                f"({self._text_prefilter.rejection_rate():.0%})"
+            )
+
         self._active = False
 
     def __del__(self):
@@ -179,6 +236,19 @@ class AnonymizerController:
             attr_name for attr_name in self.required_attributes if attr_name not in ds or getattr(ds, attr_name) == ""
         ]
 
+    def instance_received(self, sop_instance_uid: str) -> bool:
+        """
+        Returns True if the instance is stored or held in memory for pixel PHI removal before it is written.
+        """
+        with self._held_lock:
+            if sop_instance_uid in self._held_instances:
+                return True
+        return self.model.instance_received(sop_instance_uid)
+
+    def _release_held_instance(self, sop_instance_uid: str) -> None:
+        with self._held_lock:
+            self._held_instances.discard(sop_instance_uid)
+
     def local_storage_path(self, base_dir: Path, ds: Dataset) -> Path:
         """
         Generate the local storage path in the anonymizer store for a given anonymized dataset.
@@ -434,15 +504,34 @@ class AnonymizerController:
         if hasattr(ds, "StudyDate") and hasattr(ds, "PatientID"):
             date_delta, _ = self._hash_date(ds.StudyDate, ds.PatientID)
 
+        # Route pixel PHI removal using the source header, before anonymization removes attributes like Manufacturer:
+        pixel_phi_rule = None
+        if self.project_model.remove_pixel_phi and "PixelData" in ds:
+            pixel_phi_rule = self.pixel_phi_rule(ds)
+        queue_pixel_phi = pixel_phi_rule is not None and pixel_phi_rule.action != PIXEL_PHI_SKIP
+        in_memory = self.project_model.pixel_phi_settings.in_memory
+        # A held dataset is only recorded as received once the pixel PHI worker has written it:
+        hold = queue_pixel_phi and in_memory == PIXEL_PHI_IN_MEMORY_HOLD
+
         # Verify valid DICOM format then CAPTURE PHI and source into DATABASE:
         try:
-            phi_ptid, anon_ptid, anon_acc_no = self.model.capture_phi(str(source), ds, date_delta)
+            phi_ptid, anon_ptid, anon_acc_no = self.model.capture_phi(
+                str(source), ds, date_delta, record_instance=not hold
+            )
         except ValueError as e:
             return self._write_dataset_to_quarantine(e, ds, QuarantineDirectories.INVALID_DICOM)
         except Exception as e:
             return self._write_dataset_to_quarantine(e, ds, QuarantineDirectories.CAPTURE_PHI_ERROR)
 
         phi_instance_uid = ds.SOPInstanceUID  # if exception, remove this instance from uid_lookup
+        phi_series_uid = ds.SeriesInstanceUID
+        if hold:
+            # Duplicates of a held instance (eg. C-STORE retry) are dropped until it is written:
+            with self._held_lock:
+                if phi_instance_uid in self._held_instances:
+                    logger.info(f"Instance already held for pixel PHI removal: {phi_instance_uid}")
+                    return None
+                self._held_instances.add(phi_instance_uid)
         try:
             # To minimize memory/computation overhead DO NOT MAKE COPY of source dataset
             # Anonymize dataset (overwrite phi dataset) (prevents dataset copy)
@@ -484,22 +573,43 @@ class AnonymizerController:
             filename = self.local_storage_path(self.project_model.images_dir(), ds)
             logger.debug(f"ANON STORE: {source} => {filename}")
 
+            # If enabled for project, and this file contains pixeldata, queue this file for pixel PHI removal
+            # as routed by the project's pixel PHI rules:
+            if hold:
+                # Single write of the dataset by the pixel PHI worker after pixel PHI removal in memory:
+                self._anon_px_Q.put((filename, pixel_phi_rule, ds, (phi_series_uid, phi_instance_uid)))
+                return None
+
             # TODO: Optimize / Transcoding / DICOM Compliance File Verification - as per extra project options
             # see options for write_like_original=True
             ds.save_as(filename, write_like_original=False)
 
-            # If enabled for project, and this file contains pixeldata, queue this file for pixel PHI scanning and removal:
-            # TODO: implement modality specific, via project settings, pixel phi removal
-            if self.project_model.remove_pixel_phi and "PixelData" in ds:
-                self._anon_px_Q.put(filename)
+            if queue_pixel_phi:
+                # Provisional file written, pixel PHI worker removes pixel PHI from the dataset in memory:
+                provisional_ds = ds if in_memory == PIXEL_PHI_IN_MEMORY_PROVISIONAL else None
+                self._anon_px_Q.put((filename, pixel_phi_rule, provisional_ds, None))
             return None
 
         except Exception as e:
             # Remove this phi instance UID from lookup if anonymization or storage fails
             # Leave other PHI intact for this patient
             self.model.remove_uid(phi_instance_uid)
+            if hold:
+                self._release_held_instance(phi_instance_uid)
             return self._write_dataset_to_quarantine(e, ds, QuarantineDirectories.STORAGE_ERROR)
 
+    def pixel_phi_rule(self, ds: Dataset) -> PixelPHIRule:
+        """
+        Returns the pixel PHI rule for a source dataset: the first matching rule of ProjectModel.pixel_phi_settings.rules
+        or a rule with the default action if none match.
+        """
+        settings = self.project_model.pixel_phi_settings
+        rule = select_pixel_phi_rule(settings.rules, ds)
+        if rule is None:
+            return PixelPHIRule(settings.default_action)
+        logger.debug(f"Pixel PHI rule: {rule}")
+        return rule
+
     def anonymize_file(self, file: Path) -> tuple[str | None, Dataset | None]:
         """
         Anonymizes a DICOM file.
@@ -540,7 +650,7 @@ class AnonymizerController:
             return _("Missing Attributes") + f": {missing_attributes}" + " -> " + _("Quarantined"), ds
 
         # Skip instance if already stored:
-        if self.model.instance_received(ds.SOPInstanceUID):
+        if self.instance_received(ds.SOPInstanceUID):
             logger.info(
                 f"Instance already stored:{ds.PatientID}/{ds.StudyInstanceUID}/{ds.SeriesInstanceUID}/{ds.SOPInstanceUID}"
             )
@@ -590,53 +700,104 @@ class AnonymizerController:
 
         logger.info(f"thread={threading.current_thread().name} end")
 
-    def _anonymizer_pixel_phi_worker(self, px_Q: Queue) -> None:
-        logger.info(f"thread={threading.current_thread().name} start")
-
-        # Once-off initialisation of easyocr.Reader (and underlying pytorch model):
-        # if pytorch models not downloaded yet, they will be when Reader initializes
-        model_dir = Path("assets") / "ocr" / "model"  # Default is: Path("~/.EasyOCR/model").expanduser()
-        if not model_dir.exists():
-            logger.warning(
-                f"EasyOCR model directory: {model_dir}, does not exist, EasyOCR will create it, models still to be downloaded..."
-            )
-        else:
-            logger.info(f"EasyOCR downloaded models: {os.listdir(model_dir)}")
-
-        # Initialize the EasyOCR reader with the desired language(s), if models are not in model_dir, they will be downloaded
-        ocr_reader = Reader(
-            lang_list=["en", "de", "fr", "es"],
-            model_storage_directory=model_dir,
-            verbose=False,
+    def _set_pixel_phi_thread_budget(self) -> None:
+        """
+        Split the CPU thread budget of ProjectModel.pixel_phi_settings across the pixel PHI workers:
+        pytorch (or ONNX Runtime) intra-op threads per concurrent OCR inference and OpenCV threads per worker.
+        """
+        settings = self.project_model.pixel_phi_settings
+        ocr_concurrency = min(max(settings.ocr_concurrency, 1), self._pixel_phi_workers)
+        torch_threads = split_thread_budget(settings.cpu_threads, ocr_concurrency)
+        opencv_threads = split_thread_budget(settings.cpu_threads, self._pixel_phi_workers)
+        torch.set_num_threads(torch_threads)
+        self._ocr_service.configure(threads=torch_threads)
+        setNumThreads(opencv_threads)
+        logger.info(
+            f"Pixel PHI workers={self._pixel_phi_workers} ocr_concurrency={ocr_concurrency} "
+            f"torch_threads={torch_threads} opencv_threads={opencv_threads}"
         )
 
-        logging.info("OCR Reader initialised successfully")
+    def _remove_pixel_phi_args(self, rule: PixelPHIRule) -> tuple[OCRService | None, dict]:
+        """
+        Returns the ocr_reader & options of remove_pixel_phi for a pixel PHI rule.
+        """
+        settings = self.project_model.pixel_phi_settings
+        reencode_options = {"reencode": settings.reencode, "reencode_threads": settings.reencode_threads}
+        if rule.action == PIXEL_PHI_BLACKOUT:
+            areas = [UserRectangle((x1, y1), (x2, y2)) for x1, y1, x2, y2 in rule.blackout_areas]
+            return None, {"blackout_areas": areas, **reencode_options}
+
+        return self._ocr_service, {
+            **reencode_options,
+            "ocr_batch_size": settings.ocr_batch_size,
+            "detect_only": rule.action == PIXEL_PHI_DETECT,
+            "temporal_mask": settings.temporal_mask,
+            "temporal_change_threshold": settings.temporal_change_threshold,
+            "text_prefilter": self._text_prefilter,
+            "tiled_ocr": settings.tiled_ocr,
+            "tile_size": settings.tile_size,
+            "tile_threads": settings.tile_threads,
+        }
+
+    def _remove_pixel_phi_in_memory(
+        self, path: Path, ds: Dataset, rule: PixelPHIRule, phi_uids: tuple[str, str] | None
+    ) -> None:
+        """
+        Remove pixel PHI from the anonymized dataset in memory then write it to path, replacing any provisional file.
+        A held dataset, phi_uids = (phi SeriesInstanceUID, phi SOPInstanceUID), is quarantined if pixel PHI removal
+        or the write fails, its instance is recorded only once written.
+        """
+        ocr_reader, options = self._remove_pixel_phi_args(rule)
+        if phi_uids is None:
+            if remove_pixel_phi_from_dataset(ds, ocr_reader, **options):
+                self._replace_file(path, ds)
+            return
 
-        # Check if GPU available
-        logger.info(f"Apple MPS (Metal) GPU Available: {torch.backends.mps.is_available()}")
-        logger.info(f"CUDA GPU Available: {torch.cuda.is_available()}")
+        phi_series_uid, phi_instance_uid = phi_uids
+        try:
+            try:
+                remove_pixel_phi_from_dataset(ds, ocr_reader, **options)
+            except Exception as e:
+                self.model.remove_uid(phi_instance_uid)
+                self._write_dataset_to_quarantine(e, ds, QuarantineDirectories.PIXEL_PHI_ERROR)
+                return
+            try:
+                self._replace_file(path, ds)
+            except Exception as e:
+                self.model.remove_uid(phi_instance_uid)
+                self._write_dataset_to_quarantine(e, ds, QuarantineDirectories.STORAGE_ERROR)
+                return
+            self.model.capture_instance(phi_series_uid, phi_instance_uid)
+        finally:
+            self._release_held_instance(phi_instance_uid)
+
+    def _replace_file(self, path: Path, ds: Dataset) -> None:
+        # Temporary file unique per worker thread, the same file may be written by two workers (eg. duplicates):
+        partial_path = path.with_name(f"{path.name}.{threading.get_ident()}.partial")
+        ds.save_as(partial_path, write_like_original=False)
+        os.replace(partial_path, path)
+
+    def _anonymizer_pixel_phi_worker(self, px_Q: Queue) -> None:
+        logger.info(f"thread={threading.current_thread().name} start")
 
         while True:
             time.sleep(self.WORKER_THREAD_SLEEP_SECS)
 
-            path = px_Q.get()  # Blocks by default
-            if path is None:  # sentinel value set by _stop_worker_threads
+            item = px_Q.get()  # Blocks by default
+            if item is None:  # sentinel value set by _stop_worker_threads
                 px_Q.task_done()
                 break
 
+            path, rule, ds, phi_uids = item
             try:
-                remove_pixel_phi(path, ocr_reader)
+                if ds is None:
+                    ocr_reader, options = self._remove_pixel_phi_args(rule)
+                    remove_pixel_phi(path, ocr_reader, **options)
+                else:
+                    self._remove_pixel_phi_in_memory(path, ds, rule, phi_uids)
             except Exception as e:
                 logger.error(repr(e))
 
             px_Q.task_done()
 
-        # Cleanup resources used for Pixel PHI Neural back-end
-        if ocr_reader:
-            del ocr_reader
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()  # Clear GPU memory cache
-        if torch.backends.mps.is_available():
-            torch.mps.empty_cache()
-
         logger.info(f"thread={threading.current_thread().name} end")
@@ -0,0 +1,252 @@
+"""
+Streaming export of anonymized patients to archive files in a local or mounted directory.
+
+This module provides the functions used by ProjectController._manage_archive_export to write the files of the
+selected patients to ZIP or tar.zst archives for bulk handoff of a project without a network destination:
+- the files to export are split in order into archive parts of at most max_size bytes of file data
+- each part is written by one export worker, parts are written concurrently
+- files are streamed into the archive in chunks from disk, memory use is bounded by the chunk size
+- tar.zst parts are compressed by multi-threaded zstd, requires the optional zstandard package
+- each part contains an INDEX.json, a DICOMDIR style Patient / Study / Series / Instance index of the part's files
+- a part is written to a .partial file which is renamed on completion and deleted on error or abort
+"""
+
+import json
+import logging
+import os
+import tarfile
+import time
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = ["zip", "tar.zst"]
+INDEX_FILENAME = "INDEX.json"
+PARTIAL_SUFFIX = ".partial"
+
+# Header attributes of the index by level, values read via the header_reader of write_archive_part:
+STUDY_ATTRIBUTES = ["StudyDate", "StudyDescription", "AccessionNumber"]
+SERIES_ATTRIBUTES = ["Modality", "SeriesNumber", "SeriesDescription"]
+INSTANCE_ATTRIBUTES = ["SOPClassUID", "InstanceNumber"]
+INDEX_ATTRIBUTES = STUDY_ATTRIBUTES + SERIES_ATTRIBUTES + INSTANCE_ATTRIBUTES
+
+
+def zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+@dataclass
+class ArchiveFile:
+    path: str  # file path in local storage
+    arcname: str  # member name in archive, path relative to images directory: PatientID/StudyUID/SeriesUID/SOPUID.dcm
+    size: int  # bytes
+
+    @property
+    def patient_id(self) -> str:
+        return Path(self.arcname).parts[0]
+
+
+@dataclass
+class ArchivePart:
+    path: Path  # archive file path
+    number: int  # 1 based
+    files: list[ArchiveFile] = field(default_factory=list)
+
+    def patient_ids(self) -> list[str]:
+        return list(dict.fromkeys(file.patient_id for file in self.files))
+
+
+def plan_archive_parts(
+    files: list[ArchiveFile], dest_dir: Path, base_name: str, archive_format: str, max_size: int
+) -> list[ArchivePart]:
+    """
+    Split the files in order into archive parts of at most max_size bytes of (uncompressed) file data.
+    A file larger than max_size is written to a part of its own.
+
+    Args:
+        files (list[ArchiveFile]): The files to export, in order of export.
+        dest_dir (Path): The directory to write the archives to.
+        base_name (str): The archive name, parts are named base_name_001.<archive_format>, ...
+        archive_format (str): One of ARCHIVE_FORMATS.
+        max_size (int): Maximum bytes of file data per part, 0 = no split.
+
+    Returns:
+        list[ArchivePart]: The archive parts, empty if there are no files.
+
+    Raises:
+        ValueError: If archive_format is not supported.
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unsupported archive format: {archive_format}")
+
+    parts: list[ArchivePart] = []
+    part_size = 0
+    for file in files:
+        if not parts or (max_size > 0 and part_size + file.size > max_size and parts[-1].files):
+            number = len(parts) + 1
+            parts.append(ArchivePart(Path(dest_dir, f"{base_name}_{number:03d}.{archive_format}"), number))
+            part_size = 0
+        parts[-1].files.append(file)
+        part_size += file.size
+    return parts
+
+
+def build_index(part: ArchivePart, parts: int, headers: dict[str, dict[str, Any]]) -> dict:
+    """
+    Returns the DICOMDIR style index of the files in the archive part.
+
+    Args:
+        part (ArchivePart): The archive part.
+        parts (int): The total number of parts of the archive.
+        headers (dict[str, dict[str, Any]]): arcname => header attributes of the file, see INDEX_ATTRIBUTES.
+
+    Returns:
+        dict: {"archive", "part", "parts", "created", "patients": [{"PatientID", "studies": [{"StudyInstanceUID",
+            "series": [{"SeriesInstanceUID", "instances": [{"SOPInstanceUID", "file", "size"}]}]}]}]}
+    """
+    patients: dict[str, dict] = {}
+    for file in part.files:
+        patient_id, study_uid, series_uid, filename = Path(file.arcname).parts
+        header = headers.get(file.arcname, {})
+
+        patient = patients.setdefault(patient_id, {"PatientID": patient_id, "studies": {}})
+        study = patient["studies"].setdefault(study_uid, {"StudyInstanceUID": study_uid, "series": {}})
+        series = study["series"].setdefault(series_uid, {"SeriesInstanceUID": series_uid, "instances": []})
+        for attribute in STUDY_ATTRIBUTES:
+            if attribute in header:
+                study.setdefault(attribute, header[attribute])
+        for attribute in SERIES_ATTRIBUTES:
+            if attribute in header:
+                series.setdefault(attribute, header[attribute])
+        instance = {"SOPInstanceUID": Path(filename).stem, "file": file.arcname, "size": file.size}
+        instance.update({attribute: header[attribute] for attribute in INSTANCE_ATTRIBUTES if attribute in header})
+        series["instances"].append(instance)
+
+    # Convert uid keyed dicts to lists:
+    for patient in patients.values():
+        for study in patient["studies"].values():
+            study["series"] = list(study["series"].values())
+        patient["studies"] = list(patient["studies"].values())
+
+    return {
+        "archive": part.path.name,
+        "part": part.number,
+        "parts": parts,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "patients": list(patients.values()),
+    }
+
+
+class _ZipArchiveWriter:
+    def __init__(self, path: Path, compression_level: int):
+        self._zip = zipfile.ZipFile(  # noqa: SIM115
+            path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compression_level, allowZip64=True
+        )
+
+    def add_file(self, file_path: str, arcname: str) -> None:
+        self._zip.write(file_path, arcname)  # streamed from file in chunks
+
+    def add_bytes(self, arcname: str, data: bytes) -> None:
+        self._zip.writestr(arcname, data)
+
+    def close(self) -> None:
+        self._zip.close()
+
+
+class _TarZstdArchiveWriter:
+    def __init__(self, path: Path, compression_level: int, threads: int):
+        import zstandard
+
+        self._fh = open(path, "wb")  # noqa: SIM115
+        compressor = zstandard.ZstdCompressor(level=compression_level, threads=threads)
+        self._zstd = compressor.stream_writer(self._fh, closefd=False)
+        self._tar = tarfile.open(fileobj=self._zstd, mode="w|", format=tarfile.PAX_FORMAT)  # noqa: SIM115
+
+    def add_file(self, file_path: str, arcname: str) -> None:
+        self._tar.add(file_path, arcname, recursive=False)  # streamed from file in chunks
+
+    def add_bytes(self, arcname: str, data: bytes) -> None:
+        tarinfo = tarfile.TarInfo(arcname)
+        tarinfo.size = len(data)
+        tarinfo.mtime = int(time.time())
+        self._tar.addfile(tarinfo, BytesIO(data))
+
+    def close(self) -> None:
+        try:
+            self._tar.close()
+            self._zstd.close()
+        finally:
+            self._fh.close()
+
+
+def write_archive_part(
+    part: ArchivePart,
+    parts: int,
+    compression_level: int,
+    zstd_threads: int = 0,
+    header_reader: Callable[[str], dict[str, Any]] | None = None,
+    abort: Callable[[], bool] | None = None,
+    on_file_written: Callable[[ArchiveFile], None] | None = None,
+) -> bool:
+    """
+    Blocking: Write the files of an archive part followed by its index.
+
+    Args:
+        part (ArchivePart): The archive part to write, the format is taken from the file extension of part.path.
+        parts (int): The total number of parts of the archive, recorded in the index.
+        compression_level (int): zlib level (0-9) for zip, zstd level (1-22) for tar.zst.
+        zstd_threads (int): zstd compression threads for tar.zst, 0 = single threaded, -1 = number of CPUs.
+        header_reader (Callable[[str], dict[str, Any]], optional): Returns the INDEX_ATTRIBUTES of a file path.
+        abort (Callable[[], bool], optional): Polled before each file, stop writing if it returns True.
+        on_file_written (Callable[[ArchiveFile], None], optional): Called as each file is written to the archive.
+
+    Returns:
+        bool: True if the part was written, False if aborted, the incomplete part is deleted.
+
+    Raises:
+        Any exception raised reading the files or writing the archive, the incomplete part is deleted.
+    """
+    partial_path = part.path.with_name(part.path.name + PARTIAL_SUFFIX)
+    part.path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Write archive part {part.path} with {len(part.files)} files")
+
+    if part.path.name.endswith(".zip"):
+        writer: _ZipArchiveWriter | _TarZstdArchiveWriter = _ZipArchiveWriter(partial_path, compression_level)
+    else:
+        writer = _TarZstdArchiveWriter(partial_path, compression_level, zstd_threads)
+
+    complete = False
+    try:
+        headers: dict[str, dict[str, Any]] = {}
+        for file in part.files:
+            if abort and abort():
+                logger.info(f"Archive part {part.path} aborted")
+                return False
+            writer.add_file(file.path, file.arcname)
+            if header_reader:
+                headers[file.arcname] = header_reader(file.path)
+            if on_file_written:
+                on_file_written(file)
+
+        writer.add_bytes(INDEX_FILENAME, json.dumps(build_index(part, parts, headers), indent=2).encode("utf-8"))
+        complete = True
+    finally:
+        try:
+            writer.close()
+        finally:
+            if complete:
+                os.replace(partial_path, part.path)
+                logger.info(f"Archive part {part.path} complete, size: {os.path.getsize(part.path)} bytes")
+            elif partial_path.exists():
+                os.remove(partial_path)
+    return True
@@ -0,0 +1,173 @@
+"""
+Bandwidth limiting of exports.
+
+This module provides the ExportBandwidthLimiter class used by ProjectController._export_files to limit the
+bandwidth used by all export workers sending to a destination with one token bucket per destination.
+The limit of each destination is taken from ProjectModel.export_settings.bandwidth_limits and may be overridden
+by time of day windows of ProjectModel.export_settings.bandwidth_schedule (eg. limit export during working hours).
+"""
+
+import logging
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Callable
+
+from anonymizer.model.project import BandwidthWindow
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+_TIME_OF_DAY = re.compile(r"^([01]\d|2[0-3]):[0-5]\d$")  # zero padded "HH:MM"
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket, one token per byte, refilled at rate bytes/sec up to capacity of 1 second of tokens.
+
+    consume() reserves tokens, the bucket may go into debt so transfers larger than capacity are delayed
+    in proportion to their size and concurrent consumers are served in order of reservation.
+    """
+
+    def __init__(self, rate: float):
+        self._lock = threading.Lock()
+        self._rate = 0.0
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self.set_rate(rate)
+        self._tokens = self._rate  # start full
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self._rate > 0:
+            self._tokens = min(self._tokens + (now - self._last_refill) * self._rate, self._rate)
+        self._last_refill = now
+
+    def set_rate(self, rate: float) -> None:
+        """Set the rate in bytes/sec, 0 = unlimited"""
+        with self._lock:
+            self._refill()
+            self._rate = max(rate, 0.0)
+            self._tokens = min(self._tokens, self._rate)  # capacity is 1 second at new rate, any debt is kept
+
+    def consume(self, nbytes: int, abort: Callable[[], bool] | None = None, poll_interval: float = 0.1) -> bool:
+        """
+        Blocking: Wait until nbytes may be sent.
+
+        Args:
+            nbytes (int): The number of bytes to be sent.
+            abort (Callable[[], bool], optional): Polled while waiting, stop waiting if it returns True.
+            poll_interval (float): seconds between abort polls.
+
+        Returns:
+            bool: False if aborted while waiting, True otherwise.
+        """
+        with self._lock:
+            if self._rate <= 0:
+                return True
+            self._refill()
+            self._tokens -= nbytes
+            delay = -self._tokens / self._rate if self._tokens < 0 else 0.0
+
+        deadline = time.monotonic() + delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return True
+            if abort and abort():
+                return False
+            time.sleep(min(remaining, poll_interval))
+
+
+def _time_in_window(now: str, start: str, end: str) -> bool:
+    """
+    Returns True if time of day now is in [start, end), the window wraps past midnight if end < start.
+    All times are zero padded "HH:MM" strings which compare in time order.
+    """
+    if start <= end:
+        return start <= now < end
+    return now >= start or now < end
+
+
+class ExportBandwidthLimiter:
+    """
+    Token bucket bandwidth limit per export destination, shared by all export workers.
+
+    The rate of a destination's bucket is set from the first bandwidth_schedule window containing the current
+    local time of day which has a limit for the destination, otherwise from bandwidth_limits.
+    Windows whose start or end is not a zero padded "HH:MM" time are logged and ignored.
+    """
+
+    def __init__(self, limits: dict[str, float], schedule: list[BandwidthWindow]):
+        self._limits = dict(limits)
+        self._schedule = [window for window in schedule if self._valid_window(window)]
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _valid_window(window: BandwidthWindow) -> bool:
+        for value in (window.start, window.end):
+            if not isinstance(value, str) or not _TIME_OF_DAY.match(value):
+                logger.error(f"Bandwidth schedule window ignored, invalid time of day: {value!r}, expected 'HH:MM'")
+                return False
+        return True
+
+    def current_limit(self, dest_name: str, now: datetime | None = None) -> float:
+        """
+        Returns the current limit in MB/s for the destination, 0 = unlimited.
+        """
+        time_of_day = (now or datetime.now()).strftime("%H:%M")
+        for window in self._schedule:
+            if dest_name in window.limits and _time_in_window(time_of_day, window.start, window.end):
+                return window.limits[dest_name]
+        return self._limits.get(dest_name, 0)
+
+    def _bucket(self, dest_name: str) -> TokenBucket | None:
+        """
+        Returns the destination's bucket with its rate set to the current limit, None if unlimited.
+        """
+        rate = self.current_limit(dest_name) * MB
+        with self._lock:
+            bucket = self._buckets.get(dest_name)
+            if bucket is None:
+                if rate <= 0:
+                    return None
+                bucket = self._buckets[dest_name] = TokenBucket(rate)
+                logger.info(f"Export bandwidth limit for {dest_name}: {rate / MB:.1f} MB/s")
+            elif bucket.rate != rate:
+                logger.info(
+                    f"Export bandwidth limit for {dest_name} changed: {bucket.rate / MB:.1f} => {rate / MB:.1f} MB/s"
+                )
+                bucket.set_rate(rate)
+        return bucket if rate > 0 else None
+
+    def throttle(self, dest_name: str, nbytes: int, abort: Callable[[], bool] | None = None) -> bool:
+        """
+        Blocking: Wait until nbytes may be sent to the destination.
+
+        Tokens are reserved in chunks of at most 1 second at the current rate so a large file does not
+        hold a long reservation ahead of other export workers and a schedule change applies to the rest of it.
+
+        Args:
+            dest_name (str): The name of the export destination, a remote_scps key or "AWS".
+            nbytes (int): The number of bytes to be sent.
+            abort (Callable[[], bool], optional): Polled while waiting, stop waiting if it returns True.
+
+        Returns:
+            bool: False if aborted while waiting, True otherwise.
+        """
+        while nbytes > 0:
+            bucket = self._bucket(dest_name)
+            if bucket is None:
+                return True
+            chunk = min(nbytes, max(int(bucket.rate), 1))
+            if not bucket.consume(chunk, abort):
+                return False
+            nbytes -= chunk
+        return True
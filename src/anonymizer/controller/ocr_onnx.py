@@ -0,0 +1,447 @@
+"""
+ONNX Runtime CPU backend for pixel PHI OCR.
+
+This module provides ONNXOCRReader, a drop in replacement for the easyocr Reader used by the OCRService,
+see controller/ocr_service.py, which runs the easyocr CRAFT text detector and CRNN text recognizer models
+exported to ONNX on the ONNX Runtime CPU execution provider:
+- requires the optional onnxruntime package, see onnxruntime_available()
+- the models are exported once from the downloaded easyocr models by export_onnx_models(), requires pytorch
+- the exported models can optionally be quantized to int8 (dynamic quantization) for faster CPU inference
+- pre & post-processing (resize, normalisation, box extraction & grouping, crops) re-use the easyocr numpy helpers,
+  so detections match the pytorch backend to within model numeric precision
+- readtext, readtext_batched and detect support the easyocr arguments used by remove_pixel_phi & detect_text,
+  paragraph output and beam search decoding are not supported
+compare_ocr_readers() measures the throughput and agreement of a candidate OCR reader against a reference reader.
+"""
+
+import json
+import logging
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from cv2 import COLOR_GRAY2RGB, COLOR_RGB2GRAY, INTER_CUBIC, INTER_LINEAR, cvtColor, resize
+from easyocr.craft_utils import adjustResultCoordinates, getDetBoxes
+from easyocr.imgproc import normalizeMeanVariance, resize_aspect_ratio
+from easyocr.utils import get_image_list, group_text_box
+from numpy.typing import NDArray
+
+logger = logging.getLogger(__name__)
+
+ONNX_MODEL_DIR = Path("assets") / "ocr" / "onnx"
+ONNX_METADATA_FILENAME = "ocr_onnx.json"
+DETECTOR_MODEL = "craft.onnx"
+RECOGNIZER_MODEL = "recognizer.onnx"
+INT8_SUFFIX = "_int8"
+
+# easyocr Reader.readtext defaults:
+READTEXT_DEFAULTS: dict[str, Any] = {
+    "min_size": 20,
+    "text_threshold": 0.7,
+    "low_text": 0.4,
+    "link_threshold": 0.4,
+    "canvas_size": 2560,
+    "mag_ratio": 1.0,
+    "slope_ths": 0.1,
+    "ycenter_ths": 0.5,
+    "height_ths": 0.5,
+    "width_ths": 0.5,
+    "add_margin": 0.1,
+    "rotation_info": None,
+}
+
+
+def onnxruntime_available() -> bool:
+    try:
+        import onnxruntime  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def onnx_model_dir(languages: list[str]) -> Path:
+    # The recognition model and character set depend on the language set:
+    return ONNX_MODEL_DIR / "_".join(languages)
+
+
+def onnx_models_exported(languages: list[str], quantized: bool = False) -> bool:
+    model_dir = onnx_model_dir(languages)
+    suffix = INT8_SUFFIX if quantized else ""
+    return all(
+        Path(model_dir, name).exists()
+        for name in [
+            ONNX_METADATA_FILENAME,
+            Path(DETECTOR_MODEL).stem + suffix + ".onnx",
+            Path(RECOGNIZER_MODEL).stem + suffix + ".onnx",
+        ]
+    )
+
+
+def export_onnx_models(reader: Any, languages: list[str], quantize: bool = False) -> Path:
+    """
+    Blocking: Export the detection & recognition models of an easyocr Reader to ONNX, optionally with int8 quantized copies.
+
+    Args:
+        reader (easyocr.Reader): Reader loaded on CPU with quantize=False, torch quantized models cannot be exported.
+        languages (list[str]): The language codes the Reader was loaded with.
+        quantize (bool): Also write int8 dynamically quantized copies of the models, requires the onnx package.
+
+    Returns:
+        Path: The directory the models were written to, see onnx_model_dir().
+    """
+    import torch
+
+    model_dir = onnx_model_dir(languages)
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    class _CTCRecognizer(torch.nn.Module):
+        # easyocr CTC recognizers take an unused text argument:
+        def __init__(self, model: torch.nn.Module):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image: torch.Tensor) -> torch.Tensor:
+            return self.model(image, None)
+
+    detector = getattr(reader.detector, "module", reader.detector).cpu().eval()  # unwrap DataParallel
+    recognizer = _CTCRecognizer(getattr(reader.recognizer, "module", reader.recognizer).cpu().eval())
+
+    logger.info(f"Export OCR models of {languages} to ONNX in {model_dir}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            detector,
+            (torch.randn(1, 3, 640, 640),),
+            str(model_dir / DETECTOR_MODEL),
+            input_names=["image"],
+            output_names=["score", "feature"],
+            dynamic_axes={
+                "image": {0: "batch", 2: "height", 3: "width"},
+                "score": {0: "batch", 1: "height", 2: "width"},
+                "feature": {0: "batch", 2: "height", 3: "width"},
+            },
+            opset_version=17,
+        )
+        torch.onnx.export(
+            recognizer,
+            (torch.randn(1, 1, reader.imgH, 256),),
+            str(model_dir / RECOGNIZER_MODEL),
+            input_names=["image"],
+            output_names=["logits"],
+            dynamic_axes={"image": {0: "batch", 3: "width"}, "logits": {0: "batch", 1: "sequence"}},
+            opset_version=17,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        for name in [DETECTOR_MODEL, RECOGNIZER_MODEL]:
+            quantized_path = model_dir / (Path(name).stem + INT8_SUFFIX + ".onnx")
+            quantize_dynamic(model_dir / name, quantized_path, weight_type=QuantType.QInt8)
+
+    metadata = {
+        "languages": languages,
+        "characters": reader.character,
+        "ignore_characters": "".join(sorted(set(reader.character) - set(reader.lang_char))),
+        "model_height": reader.imgH,
+    }
+    with open(model_dir / ONNX_METADATA_FILENAME, "w") as f:
+        json.dump(metadata, f)
+    logger.info(f"ONNX OCR models exported to {model_dir}")
+    return model_dir
+
+
+def ctc_greedy_decode(
+    probabilities: NDArray[np.float32], characters: str, ignore_indices: list[int] | None = None
+) -> list[tuple[str, float]]:
+    """
+    Greedy CTC decoding of recognizer output, as easyocr decoder="greedy".
+
+    Args:
+        probabilities (NDArray[np.float32]): Softmax output of the recognizer: batch x sequence x (1 + len(characters)),
+            class 0 is the CTC blank.
+        characters (str): The characters of classes 1...
+        ignore_indices (list[int], optional): Classes of characters not in the configured languages, never decoded.
+
+    Returns:
+        list[tuple[str, float]]: (text, confidence) of each item of the batch.
+    """
+    if ignore_indices:
+        probabilities = probabilities.copy()
+        probabilities[:, :, ignore_indices] = 0
+        probabilities /= np.maximum(probabilities.sum(axis=2, keepdims=True), 1e-12)
+
+    results = []
+    for item in probabilities:
+        indices = item.argmax(axis=1)
+        max_probabilities = item.max(axis=1)
+        keep = (indices != 0) & np.append(True, indices[1:] != indices[:-1])  # drop blanks & repeats
+        text = "".join(characters[index - 1] for index in indices[keep])
+        # easyocr custom_mean confidence:
+        confidence = float(max_probabilities[keep].prod() ** (2.0 / math.sqrt(keep.sum()))) if keep.any() else 0.0
+        results.append((text, confidence))
+    return results
+
+
+class ONNXOCRReader:
+    """
+    easyocr Reader compatible OCR on the ONNX Runtime CPU execution provider, see module docstring.
+    """
+
+    def __init__(self, languages: list[str], quantized: bool = False, threads: int = 0):
+        """
+        Load the ONNX models exported for the languages, see export_onnx_models().
+
+        Args:
+            languages (list[str]): easyocr language codes.
+            quantized (bool): Load the int8 quantized models.
+            threads (int): ONNX Runtime intra-op threads per inference, 0 = ONNX Runtime default (physical cores).
+
+        Raises:
+            ImportError: If onnxruntime is not installed.
+            FileNotFoundError: If the models have not been exported.
+        """
+        import onnxruntime
+
+        model_dir = onnx_model_dir(languages)
+        if not onnx_models_exported(languages, quantized):
+            raise FileNotFoundError(f"ONNX OCR models not exported to {model_dir}")
+
+        with open(model_dir / ONNX_METADATA_FILENAME) as f:
+            metadata = json.load(f)
+        self.characters: str = metadata["characters"]
+        self.model_height: int = metadata["model_height"]
+        self.ignore_indices = [
+            self.characters.index(char) + 1 for char in metadata["ignore_characters"] if char in self.characters
+        ]
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+
+        suffix = INT8_SUFFIX if quantized else ""
+        self._detector = onnxruntime.InferenceSession(
+            str(model_dir / (Path(DETECTOR_MODEL).stem + suffix + ".onnx")),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._recognizer = onnxruntime.InferenceSession(
+            str(model_dir / (Path(RECOGNIZER_MODEL).stem + suffix + ".onnx")),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        logger.info(f"ONNX OCR models loaded from {model_dir}, quantized={quantized}, threads={threads}")
+
+    @staticmethod
+    def _reformat(img: NDArray[np.uint8]) -> tuple[NDArray[np.uint8], NDArray[np.uint8]]:
+        # Returns the RGB & grayscale versions of a grayscale, RGB or RGBA image:
+        if img.ndim == 2:
+            return cvtColor(img, COLOR_GRAY2RGB), img
+        img = img[:, :, :3]
+        return img, cvtColor(img, COLOR_RGB2GRAY)
+
+    def _text_boxes(self, rgb_images: list[NDArray[np.uint8]], options: dict[str, Any]) -> list[list]:
+        # CRAFT text detection of images of the same dimensions as one batch, returns the text polygons of each image:
+        resized = [
+            resize_aspect_ratio(img, options["canvas_size"], interpolation=INTER_LINEAR, mag_ratio=options["mag_ratio"])
+            for img in rgb_images
+        ]
+        ratio = 1 / resized[0][1]
+        batch = np.stack([np.transpose(normalizeMeanVariance(img), (2, 0, 1)) for img, __, __ in resized])
+        scores = self._detector.run(["score"], {"image": batch.astype(np.float32)})[0]
+
+        text_boxes = []
+        for score in scores:
+            boxes, polys = getDetBoxes(
+                score[:, :, 0],
+                score[:, :, 1],
+                options["text_threshold"],
+                options["link_threshold"],
+                options["low_text"],
+            )[:2]
+            boxes = adjustResultCoordinates(boxes, ratio, ratio)
+            polys = adjustResultCoordinates(polys, ratio, ratio)
+            polys = [box if poly is None else poly for box, poly in zip(boxes, polys, strict=True)]
+            text_boxes.append([np.array(poly).astype(np.int32).reshape(-1) for poly in polys])
+        return text_boxes
+
+    def _group(self, text_boxes: list, options: dict[str, Any]) -> tuple[list, list]:
+        # As easyocr Reader.detect, group text boxes into horizontal & free (rotated) boxes and drop small boxes:
+        horizontal_list, free_list = group_text_box(
+            text_boxes,
+            options["slope_ths"],
+            options["ycenter_ths"],
+            options["height_ths"],
+            options["width_ths"],
+            options["add_margin"],
+            True,
+        )
+        min_size = options["min_size"]
+        if min_size:
+            horizontal_list = [box for box in horizontal_list if max(box[1] - box[0], box[3] - box[2]) > min_size]
+            free_list = [
+                box
+                for box in free_list
+                if max(np.ptp([point[0] for point in box]), np.ptp([point[1] for point in box])) > min_size
+            ]
+        return horizontal_list, free_list
+
+    def _recognize(
+        self, gray: NDArray[np.uint8], horizontal_list: list, free_list: list, options: dict[str, Any]
+    ) -> list[tuple]:
+        # CRNN recognition of the text boxes of an image, returns easyocr readtext results (box, text, confidence):
+        image_list, __ = get_image_list(horizontal_list, free_list, gray, model_height=self.model_height)
+        if not image_list:
+            return []
+
+        angles = [0] + [angle for angle in (options["rotation_info"] or []) if angle % 90 == 0 and angle % 360]
+        crops = [np.rot90(crop, k=angle // 90) for angle in angles for __, crop in image_list]
+        widths = [min(max(1, math.ceil(self.model_height * crop.shape[1] / crop.shape[0])), 2048) for crop in crops]
+        batch_width = max(widths)
+        batch = np.empty((len(crops), 1, self.model_height, batch_width), dtype=np.float32)
+        for i, (crop, width) in enumerate(zip(crops, widths, strict=True)):
+            crop = resize(crop, (width, self.model_height), interpolation=INTER_CUBIC).astype(np.float32)
+            crop = (crop / 255.0 - 0.5) / 0.5
+            batch[i, 0, :, :width] = crop
+            batch[i, 0, :, width:] = crop[:, -1:]  # pad by repeating the last column, as easyocr NormalizePAD
+
+        logits = self._recognizer.run(["logits"], {"image": batch})[0]
+        exp = np.exp(logits - logits.max(axis=2, keepdims=True))
+        decoded = ctc_greedy_decode(exp / exp.sum(axis=2, keepdims=True), self.characters, self.ignore_indices)
+
+        # Keep the rotation with the highest confidence for each box:
+        results = []
+        for i, (box, __) in enumerate(image_list):
+            text, confidence = max(decoded[i :: len(image_list)], key=lambda result: result[1])
+            results.append((box, text, confidence))
+        return results
+
+    def detect(self, img: NDArray[np.uint8], reformat: bool = True, **kwargs) -> tuple[list, list]:
+        """
+        Text detection only, as easyocr Reader.detect.
+
+        Args:
+            img (NDArray[np.uint8]): One image or a batch (4D) of RGB images of the same dimensions.
+            reformat (bool): Convert a grayscale image to RGB.
+            **kwargs: easyocr detection arguments, see READTEXT_DEFAULTS.
+
+        Returns:
+            tuple[list, list]: The horizontal ([x_min, x_max, y_min, y_max]) & free (4 points) boxes of each image.
+        """
+        options = READTEXT_DEFAULTS | kwargs
+        images = list(img) if img.ndim == 4 else [self._reformat(img)[0] if reformat else img]
+        horizontal_lists, free_lists = [], []
+        for text_boxes in self._text_boxes(images, options):
+            horizontal_list, free_list = self._group(text_boxes, options)
+            horizontal_lists.append(horizontal_list)
+            free_lists.append(free_list)
+        return horizontal_lists, free_lists
+
+    def readtext_batched(self, images: list[NDArray[np.uint8]], batch_size: int = 1, **kwargs) -> list[list]:
+        """
+        Text detection of images of the same dimensions as one batch followed by recognition, as easyocr
+        Reader.readtext_batched.
+
+        Returns:
+            list[list]: The (box, text, confidence) results of each image.
+        """
+        options = READTEXT_DEFAULTS | kwargs
+        reformatted = [self._reformat(image) for image in images]
+        results = []
+        text_boxes_list = self._text_boxes([rgb for rgb, __ in reformatted], options)
+        for (__, gray), text_boxes in zip(reformatted, text_boxes_list, strict=True):
+            horizontal_list, free_list = self._group(text_boxes, options)
+            results.append(self._recognize(gray, horizontal_list, free_list, options))
+        return results
+
+    def readtext(self, image: NDArray[np.uint8], **kwargs) -> list:
+        """
+        Text detection & recognition, as easyocr Reader.readtext with detail=1, paragraph=False.
+
+        Returns:
+            list: (box, text, confidence) of each text box detected.
+        """
+        return self.readtext_batched([image], **kwargs)[0]
+
+
+@dataclass
+class OCRReaderComparison:
+    frames: int
+    reference_seconds: float
+    candidate_seconds: float
+    reference_boxes: int
+    candidate_boxes: int
+    matched_boxes: int  # reference boxes overlapped by a candidate box with IoU >= iou_threshold
+    matched_text: int  # matched boxes with the same text (case insensitive)
+
+    def speedup(self) -> float:
+        return self.reference_seconds / self.candidate_seconds if self.candidate_seconds else 0.0
+
+    def box_recall(self) -> float:
+        return self.matched_boxes / self.reference_boxes if self.reference_boxes else 1.0
+
+    def text_agreement(self) -> float:
+        return self.matched_text / self.matched_boxes if self.matched_boxes else 1.0
+
+
+def _box_iou(box1: list, box2: list) -> float:
+    # IoU of the axis aligned bounds of two 4 point boxes:
+    (x1, y1), (x2, y2) = np.min(box1, axis=0), np.max(box1, axis=0)
+    (u1, v1), (u2, v2) = np.min(box2, axis=0), np.max(box2, axis=0)
+    intersection = max(0, min(x2, u2) - max(x1, u1)) * max(0, min(y2, v2) - max(y1, v1))
+    union = (x2 - x1) * (y2 - y1) + (u2 - u1) * (v2 - v1) - intersection
+    return float(intersection / union) if union > 0 else 0.0
+
+
+def compare_ocr_readers(
+    reference: Any, candidate: Any, frames: list[NDArray[np.uint8]], iou_threshold: float = 0.5, **kwargs
+) -> OCRReaderComparison:
+    """
+    Blocking: Run readtext of the reference & candidate OCR readers on the frames, compare throughput & results.
+
+    Args:
+        reference: OCR reader with easyocr Reader.readtext, eg. easyocr Reader.
+        candidate: OCR reader with easyocr Reader.readtext, eg. ONNXOCRReader.
+        frames (list[NDArray[np.uint8]]): Test frames, grayscale or RGB.
+        iou_threshold (float): Minimum IoU of a candidate box matching a reference box.
+        **kwargs: readtext arguments for both readers.
+
+    Returns:
+        OCRReaderComparison: Timing & agreement of the candidate with the reference.
+    """
+    timings = []
+    outputs = []
+    for reader in [reference, candidate]:
+        reader.readtext(frames[0], **kwargs)  # warm up
+        start = time.perf_counter()
+        outputs.append([reader.readtext(frame, **kwargs) for frame in frames])
+        timings.append(time.perf_counter() - start)
+
+    matched_boxes = matched_text = 0
+    for reference_results, candidate_results in zip(outputs[0], outputs[1], strict=True):
+        for box, text, __ in reference_results:
+            overlaps = [(_box_iou(box, c_box), c_text) for c_box, c_text, __ in candidate_results]
+            best_iou, best_text = max(overlaps, default=(0.0, ""))
+            if best_iou >= iou_threshold:
+                matched_boxes += 1
+                matched_text += best_text.strip().lower() == text.strip().lower()
+
+    comparison = OCRReaderComparison(
+        frames=len(frames),
+        reference_seconds=timings[0],
+        candidate_seconds=timings[1],
+        reference_boxes=sum(len(results) for results in outputs[0]),
+        candidate_boxes=sum(len(results) for results in outputs[1]),
+        matched_boxes=matched_boxes,
+        matched_text=matched_text,
+    )
+    logger.info(
+        f"OCR comparison frames={comparison.frames} speedup={comparison.speedup():.2f} "
+        f"box_recall={comparison.box_recall():.2f} text_agreement={comparison.text_agreement():.2f}"
+    )
+    return comparison
@@ -0,0 +1,305 @@
+"""
+Process wide OCR model service.
+
+This module provides the OCRService singleton, see get_ocr_service(), which holds the one easyocr Reader
+(and its underlying pytorch detection & recognition models) shared by the pixel PHI workers of the
+AnonymizerController and the interactive views (SeriesView):
+- the Reader is loaded lazily on first use, models not present in OCR_MODEL_DIR are downloaded when it loads
+- OCR inference is bounded to max_concurrency concurrent calls, other callers block until a slot is free
+- interactive callers (views) use interactive(), which has its own slot so they never wait behind the workers
+- the Reader is unloaded after idle_timeout seconds without use and reloaded on next use,
+  one idle check thread runs while the Reader is loaded
+- the language set is configurable, a change of languages reloads the Reader on next use
+- the inference backend is configurable, see OCR_BACKENDS: easyocr on pytorch or the easyocr models exported to ONNX
+  and run on the ONNX Runtime CPU execution provider, optionally int8 quantized, see controller/ocr_onnx.py
+Any OCR reader implementing the OCRReader protocol can be passed to remove_pixel_phi and detect_text.
+"""
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol
+
+import torch
+from easyocr import Reader
+
+from anonymizer.controller.ocr_onnx import (
+    ONNXOCRReader,
+    export_onnx_models,
+    onnx_models_exported,
+    onnxruntime_available,
+)
+from anonymizer.model.project import OCR_BACKEND_EASYOCR, OCR_BACKEND_ONNX, OCR_BACKEND_ONNX_INT8, OCR_BACKENDS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OCR_LANGUAGES = ["en", "de", "fr", "es"]
+OCR_MODEL_DIR = Path("assets") / "ocr" / "model"  # easyocr default is: Path("~/.EasyOCR/model").expanduser()
+
+
+def _load_easyocr_reader(languages: list[str]) -> Reader:
+    if not OCR_MODEL_DIR.exists():
+        logger.warning(
+            f"EasyOCR model directory: {OCR_MODEL_DIR}, does not exist, EasyOCR will create it, models still to be downloaded..."
+        )
+    else:
+        logger.info(f"EasyOCR downloaded models: {os.listdir(OCR_MODEL_DIR)}")
+
+    # Check if GPU available
+    logger.info(f"Apple MPS (Metal) GPU Available: {torch.backends.mps.is_available()}")
+    logger.info(f"CUDA GPU Available: {torch.cuda.is_available()}")
+
+    # If models are not in OCR_MODEL_DIR, they will be downloaded:
+    return Reader(lang_list=languages, model_storage_directory=OCR_MODEL_DIR, verbose=False)
+
+
+def _load_onnx_reader(languages: list[str], quantized: bool = False, threads: int = 0) -> ONNXOCRReader | Reader:
+    # Falls back to the easyocr Reader if onnxruntime is not installed or the export of the models fails:
+    if not onnxruntime_available():
+        logger.warning("onnxruntime not installed, OCR backend falls back to easyocr")
+        return _load_easyocr_reader(languages)
+
+    if not onnx_models_exported(languages, quantized):
+        try:
+            # One time export from the easyocr models, torch quantized models cannot be exported,
+            # int8 models are quantized from the exported models only for the int8 backend (requires the onnx package):
+            reader = Reader(lang_list=languages, gpu=False, quantize=False, model_storage_directory=OCR_MODEL_DIR)
+            export_onnx_models(reader, languages, quantize=quantized)
+            del reader
+            gc.collect()
+        except Exception as e:
+            logger.error(f"Export of OCR models to ONNX failed: {e}, OCR backend falls back to easyocr")
+            return _load_easyocr_reader(languages)
+
+    return ONNXOCRReader(languages, quantized=quantized, threads=threads)
+
+
+class OCRReader(Protocol):
+    """
+    The easyocr Reader methods used for pixel PHI removal, implemented by easyocr Reader, ONNXOCRReader & OCRService.
+    """
+
+    def readtext(self, image: Any, **kwargs) -> list: ...
+
+    def readtext_batched(self, images: Any, batch_size: int = 1, **kwargs) -> list[list]: ...
+
+    def detect(self, img: Any, **kwargs) -> tuple[list, list]: ...
+
+
+class OCRService:
+    """
+    Lazily loaded OCR Reader shared by all threads of the process, with bounded concurrency and idle unload.
+    The readtext, readtext_batched and detect methods have the signatures of the easyocr Reader methods.
+    """
+
+    def __init__(self, reader_factory: Callable[[list[str]], Any] | None = None):
+        self._reader_factory = reader_factory  # None = reader of the configured backend
+        self._lock = threading.Lock()  # guards Reader load, unload & configuration
+        self._reader: Any = None
+        self._reader_languages: list[str] = []
+        self._reader_backend = ""
+        self.languages: list[str] = list(DEFAULT_OCR_LANGUAGES)
+        self.backend = OCR_BACKEND_EASYOCR
+        self.threads = 0  # intra-op threads per inference of the ONNX backend, 0 = ONNX Runtime default
+        self.idle_timeout: float = 300  # seconds, 0 = never unload
+        self.max_concurrency = 1
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._interactive_semaphore = threading.BoundedSemaphore(1)  # own slot for interactive callers
+        self._in_use = 0
+        self._last_used = time.monotonic()
+        self._idle_thread: threading.Thread | None = None  # runs while the Reader is loaded
+        self._idle_wakeup = threading.Event()  # wakes the idle thread on unload or change of idle_timeout
+
+    def configure(
+        self,
+        languages: list[str] | None = None,
+        idle_timeout: float | None = None,
+        max_concurrency: int | None = None,
+        backend: str | None = None,
+        threads: int | None = None,
+    ) -> None:
+        """
+        Configure the service, a change of languages or backend takes effect when the Reader is next loaded.
+
+        Args:
+            languages (list[str], optional): easyocr language codes.
+            idle_timeout (float, optional): Seconds without use after which the Reader is unloaded, 0 = never.
+            max_concurrency (int, optional): Maximum concurrent OCR calls.
+            backend (str, optional): One of OCR_BACKENDS.
+            threads (int, optional): Intra-op threads per inference of the ONNX backend, 0 = ONNX Runtime default.
+
+        Raises:
+            ValueError: If backend is not one of OCR_BACKENDS.
+        """
+        if backend and backend not in OCR_BACKENDS:
+            raise ValueError(f"Unsupported OCR backend: {backend}")
+        with self._lock:
+            if languages:
+                self.languages = list(languages)
+            if backend:
+                self.backend = backend
+            if threads is not None:
+                self.threads = threads
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+                self._idle_wakeup.set()
+            if max_concurrency is not None and max(max_concurrency, 1) != self.max_concurrency:
+                self.max_concurrency = max(max_concurrency, 1)
+                self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        logger.info(
+            f"OCRService backend={self.backend} languages={self.languages} idle_timeout={self.idle_timeout} "
+            f"max_concurrency={self.max_concurrency} threads={self.threads}"
+        )
+
+    def loaded(self) -> bool:
+        return self._reader is not None
+
+    @contextmanager
+    def reader(self) -> Iterator[Any]:
+        """
+        Blocking context manager: Yields the Reader, loading it if not loaded or the languages or backend have changed.
+        The Reader is not unloaded while in use.
+        """
+        with self._lock:
+            if self._reader is not None and (
+                self._reader_languages != self.languages or self._reader_backend != self.backend
+            ):
+                logger.info(
+                    f"OCR languages or backend changed from {self._reader_languages} {self._reader_backend} "
+                    f"to {self.languages} {self.backend}, reload Reader"
+                )
+                self._unload()
+            if self._reader is None:
+                logger.info(f"OCR Reader loading, backend: {self.backend} languages: {self.languages}...")
+                start = time.monotonic()
+                self._reader = self._backend_reader_factory()(self.languages)
+                self._reader_languages = list(self.languages)
+                self._reader_backend = self.backend
+                logger.info(f"OCR Reader loaded in {time.monotonic() - start:.1f}s")
+            if self._idle_thread is None:
+                self._idle_wakeup.clear()
+                self._idle_thread = threading.Thread(target=self._idle_unload_loop, name="OCRIdleUnload", daemon=True)
+                self._idle_thread.start()
+            self._in_use += 1
+            reader = self._reader
+        try:
+            yield reader
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+
+    def _backend_reader_factory(self) -> Callable[[list[str]], Any]:
+        if self._reader_factory:
+            return self._reader_factory
+        if self.backend in [OCR_BACKEND_ONNX, OCR_BACKEND_ONNX_INT8]:
+            return partial(_load_onnx_reader, quantized=self.backend == OCR_BACKEND_ONNX_INT8, threads=self.threads)
+        return _load_easyocr_reader
+
+    def readtext(self, *args, **kwargs) -> list:
+        with self._semaphore, self.reader() as reader:
+            return reader.readtext(*args, **kwargs)
+
+    def readtext_batched(self, *args, **kwargs) -> list[list]:
+        with self._semaphore, self.reader() as reader:
+            return reader.readtext_batched(*args, **kwargs)
+
+    def detect(self, *args, **kwargs) -> tuple[list, list]:
+        with self._semaphore, self.reader() as reader:
+            return reader.detect(*args, **kwargs)
+
+    def interactive(self) -> "InteractiveOCR":
+        """
+        Returns an OCRReader for interactive callers (views) sharing the Reader but not the max_concurrency slots
+        of the pixel PHI workers, interactive calls are serialized on their own slot.
+        """
+        return InteractiveOCR(self, self._interactive_semaphore)
+
+    def download_models(self) -> list[str]:
+        """
+        Blocking: Download the OCR models of the configured languages to OCR_MODEL_DIR if not present.
+
+        Returns:
+            list[str]: The model files in OCR_MODEL_DIR.
+        """
+        if not OCR_MODEL_DIR.exists():
+            logger.warning("Downloading OCR models...")
+            with self.reader():
+                pass
+            self.unload()
+        return os.listdir(OCR_MODEL_DIR) if OCR_MODEL_DIR.exists() else []
+
+    def unload(self) -> None:
+        """
+        Unload the Reader if loaded and not in use, it is reloaded on next use.
+        """
+        with self._lock:
+            if self._in_use == 0:
+                self._unload()
+
+    def _unload(self) -> None:
+        if self._reader is None:
+            return
+        self._reader = None
+        self._idle_wakeup.set()
+        gc.collect()
+        # Cleanup resources used for Pixel PHI Neural back-end
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()  # Clear GPU memory cache
+        if torch.backends.mps.is_available():
+            torch.mps.empty_cache()
+        logger.info("OCR Reader unloaded")
+
+    def _idle_unload_loop(self) -> None:
+        # Sleeps until idle_timeout after the last use, exits when the Reader is unloaded:
+        while True:
+            with self._lock:
+                if self._reader is None:
+                    self._idle_thread = None
+                    return
+                wait: float | None = None  # idle_timeout 0 = never unload, wait for a wakeup
+                if self.idle_timeout > 0:
+                    wait = self.idle_timeout
+                    if self._in_use == 0:
+                        wait -= time.monotonic() - self._last_used
+                        if wait <= 0:
+                            logger.info(f"OCR Reader idle for {self.idle_timeout}s")
+                            self._unload()
+                            self._idle_thread = None
+                            return
+                self._idle_wakeup.clear()
+            self._idle_wakeup.wait(wait)
+
+
+class InteractiveOCR:
+    """
+    OCRReader of OCRService.interactive(): the shared Reader behind a slot separate from the worker slots.
+    """
+
+    def __init__(self, service: OCRService, semaphore: threading.BoundedSemaphore):
+        self._service = service
+        self._semaphore = semaphore
+
+    def readtext(self, *args, **kwargs) -> list:
+        with self._semaphore, self._service.reader() as reader:
+            return reader.readtext(*args, **kwargs)
+
+    def readtext_batched(self, *args, **kwargs) -> list[list]:
+        with self._semaphore, self._service.reader() as reader:
+            return reader.readtext_batched(*args, **kwargs)
+
+    def detect(self, *args, **kwargs) -> tuple[list, list]:
+        with self._semaphore, self._service.reader() as reader:
+            return reader.detect(*args, **kwargs)
+
+
+_ocr_service = OCRService()
+
+
+def get_ocr_service() -> OCRService:
+    return _ocr_service
@@ -7,23 +7,31 @@ The module also defines several data classes used for request and response objec
 """
 
 import csv
+import json
 import logging
 import os
 import shutil
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, as_completed, wait
+from contextlib import closing, nullcontext
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import partial
 from pathlib import Path
-from queue import Queue
-from typing import Any, Dict, List, Optional, Tuple, cast
+from queue import Empty, Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from botocore.exceptions import ClientError, HTTPClientError
+from botocore.exceptions import ConnectionError as BotoConnectionError
 from psutil import virtual_memory
 from pydicom import Dataset, dcmread
 from pydicom.dataset import FileMetaDataset
 from pydicom.uid import UID
+from pynetdicom import _config as pynetdicom_config
 from pynetdicom.ae import ApplicationEntity as AE
 from pynetdicom.association import Association
 from pynetdicom.events import (
@@ -40,7 +48,17 @@ from pynetdicom.status import (
     VERIFICATION_SERVICE_CLASS_STATUS,
 )
 
+from anonymizer.controller.adaptive_move import AdaptiveMoveController, MoveLevel, MoveOutcome, MoveOutcomeType
 from anonymizer.controller.anonymizer import AnonymizerController
+from anonymizer.controller.archive_export import (
+    INDEX_ATTRIBUTES,
+    ArchiveFile,
+    ArchivePart,
+    plan_archive_parts,
+    write_archive_part,
+    zstd_available,
+)
+from anonymizer.controller.bandwidth import ExportBandwidthLimiter
 from anonymizer.controller.dicom_C_codes import (
     C_FAILURE,
     C_PENDING_A,
@@ -50,19 +68,35 @@ from anonymizer.controller.dicom_C_codes import (
     C_SUCCESS,
     C_WARNING,
 )
+from anonymizer.controller.s3_export import S3ExportEngine
+from anonymizer.controller.transcode import (
+    TRANSCODE_TRANSFER_SYNTAXES,
+    UNCOMPRESSED_TRANSFER_SYNTAXES,
+    ExportTranscoder,
+    TranscodeResult,
+    encoder_available,
+)
 from anonymizer.model.anonymizer import PHI_IndexRecord
 from anonymizer.model.project import (
     AuthenticationError,
     DICOMNode,
     DICOMRuntimeError,
+    ExportSettings,
     NetworkTimeouts,
     ProjectModel,
 )
 from anonymizer.utils.logging import set_logging_levels
+from anonymizer.utils.storage import DICOM_FILE_SUFFIX
 from anonymizer.utils.translate import _
 
 logger = logging.getLogger(__name__)
 
+# ExportPatientsRequest.dest_name for export to archive files in ProjectModel.export_settings.archive_dir:
+ARCHIVE_EXPORT_DEST = "ARCHIVE"
+# ExportPatientsRequest.dest_name for export to the AWS S3 bucket of ProjectModel.aws_cognito,
+# the export path is routed on dest_name, not on ProjectModel.export_to_AWS, so queued exports keep their destination:
+AWS_EXPORT_DEST = "AWS"
+
 
 class InstanceUIDHierarchy:
     def __init__(self, uid: str, number: int | None = None):
@@ -72,6 +106,13 @@ class InstanceUIDHierarchy:
     def __str__(self):
         return f"{self.uid},{self.number or ''}"
 
+    def to_dict(self) -> dict:
+        return {"uid": self.uid, "number": self.number}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "InstanceUIDHierarchy":
+        return cls(uid=d["uid"], number=d.get("number"))
+
 
 class SeriesUIDHierarchy:
     def __init__(
@@ -108,6 +149,30 @@ class SeriesUIDHierarchy:
     def get_number_of_instances(self) -> int:
         return len(self.instances)
 
+    def to_dict(self) -> dict:
+        return {
+            "uid": self.uid,
+            "number": self.number,
+            "modality": self.modality,
+            "sop_class_uid": self.sop_class_uid,
+            "description": self.description,
+            "instance_count": self.instance_count,
+            "instances": [instance.to_dict() for instance in self.instances.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "SeriesUIDHierarchy":
+        instances = [InstanceUIDHierarchy.from_dict(instance) for instance in d.get("instances", [])]
+        return cls(
+            uid=d["uid"],
+            number=d.get("number"),
+            modality=d.get("modality"),
+            sop_class_uid=d.get("sop_class_uid"),
+            description=d.get("description"),
+            instance_count=d.get("instance_count", 0),
+            instances={instance.uid: instance for instance in instances},
+        )
+
     def find_instance(self, instance_uid: str) -> Optional[InstanceUIDHierarchy]:
         if instance_uid in self.instances:
             return self.instances[instance_uid]
@@ -167,6 +232,25 @@ class StudyUIDHierarchy:
             instances.extend(series_obj.instances.values())
         return instances
 
+    def to_json(self) -> str:
+        """Serializes the hierarchy for persistence of bulk move jobs in the AnonymizerModel"""
+        return json.dumps(
+            {
+                "uid": self.uid,
+                "ptid": self.ptid,
+                "last_error_msg": self.last_error_msg,
+                "series": [series.to_dict() for series in self.series.values()],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, json_str: str) -> "StudyUIDHierarchy":
+        d = json.loads(json_str)
+        series_list = [SeriesUIDHierarchy.from_dict(series) for series in d.get("series", [])]
+        study = cls(uid=d["uid"], ptid=d["ptid"], series={series.uid: series for series in series_list})
+        study.last_error_msg = d.get("last_error_msg")
+        return study
+
     def update_move_stats(self, status: Dataset):
         if hasattr(status, "NumberOfRemainingSuboperations"):
             self.remaining_sub_ops = status.NumberOfRemainingSuboperations
@@ -218,6 +302,7 @@ class MoveStudiesRequest:
     dest_scp_ae: str
     level: str
     studies: list[StudyUIDHierarchy]  # Move process updates hierarchy, no MoveStudiesResponse
+    job_id: int | None = None  # set when the request is persisted as a move job in the AnonymizerModel
 
 
 @dataclass
@@ -225,6 +310,7 @@ class ExportPatientsRequest:
     dest_name: str
     patient_ids: list[str]  # list of patient IDs to export
     ux_Q: Queue  # queue for UX updates for the full export
+    queued: bool = False  # patients already in the persistent export queue, set by _process_export_queue
 
 
 @dataclass
@@ -233,6 +319,92 @@ class ExportPatientsResponse:
     files_sent: int  # incremented for each file sent successfully
     error: str | None  # error message
     complete: bool
+    bytes_sent: int = 0  # bytes uploaded so far, updated during transfer for AWS S3 export
+    bytes_saved: int = 0  # original size - transcoded size of files sent, see ExportSettings.transcode
+    retry: bool = False  # transient error, patient remains in the persistent export queue for retry
+
+
+class _PatientExportProgress:
+    """
+    Aggregates the progress of the export work items of one patient, which may be processed concurrently
+    by different export workers, and reports it to the UX as ExportPatientsResponse.
+    on_complete is called with the patient's error and whether it is transient when all work items are done,
+    it returns True if the export will be retried.
+    """
+
+    def __init__(
+        self,
+        patient_id: str,
+        ux_Q: Queue,
+        progress_interval: float,
+        on_complete: Callable[[str, str | None, bool], bool] | None = None,
+    ):
+        self.patient_id = patient_id
+        self._ux_Q = ux_Q
+        self._progress_interval = progress_interval  # seconds, minimum interval between byte level updates
+        self._on_complete = on_complete
+        self._lock = threading.Lock()
+        self._items_pending = 0
+        self._files_sent = 0
+        self._bytes_sent = 0
+        self._bytes_saved = 0
+        self._last_progress_update = 0.0
+        self._retry = False
+        self.error: str | None = None  # first error of any work item, remaining work items are skipped
+        self.transient = False  # error is transient, see ProjectController._transient_export_error()
+        self.completed = False
+
+    def set_work_items(self, count: int) -> None:
+        with self._lock:
+            self._items_pending = count
+
+    def add_bytes(self, bytes_transferred: int) -> None:
+        with self._lock:
+            self._bytes_sent += bytes_transferred
+            if time.monotonic() - self._last_progress_update < self._progress_interval:
+                return
+            self._last_progress_update = time.monotonic()
+            self._put(complete=False)
+
+    def file_sent(self, bytes_saved: int = 0) -> None:
+        with self._lock:
+            self._files_sent += 1
+            self._bytes_saved += bytes_saved
+            self._put(complete=False)
+
+    def item_done(self, error: str | None, transient: bool = False) -> None:
+        with self._lock:
+            if error and not self.error:
+                self.error = error
+                self.transient = transient
+            self._items_pending -= 1
+            if self._items_pending == 0:
+                self._complete()
+
+    def complete(self, error: str | None, transient: bool = False) -> None:
+        with self._lock:
+            self.error = error
+            self.transient = transient
+            self._complete()
+
+    def _complete(self) -> None:
+        self.completed = True
+        if self._on_complete:
+            self._retry = self._on_complete(self.patient_id, self.error, self.transient)
+        self._put(complete=True)
+
+    def _put(self, complete: bool) -> None:
+        self._ux_Q.put(
+            ExportPatientsResponse(
+                self.patient_id,
+                self._files_sent,
+                self.error,
+                complete,
+                self._bytes_sent,
+                self._bytes_saved,
+                self._retry,
+            )
+        )
 
 
 class ProjectController(AE):
@@ -270,8 +442,18 @@ class ProjectController(AE):
     # The following parameters may become part of ProjectModel in future for advanced user configuration:
     _handle_store_time_slice_interval = 0.05  # seconds
     _export_file_time_slice_interval = 0.1  # seconds
-    _patient_export_thread_pool_size = 4  # concurrent threads
-    _study_move_thread_pool_size = 2  # concurrent threads
+    _export_progress_interval = 0.5  # seconds, minimum interval between byte level progress updates to UX
+    _export_queue_poll_interval = 10  # seconds, interval between checks of the persistent export queue
+    # S3 error codes of transient failures, see _transient_export_error():
+    _transient_S3_error_codes = {
+        "RequestTimeout",
+        "SlowDown",
+        "Throttling",
+        "ThrottlingException",
+        "InternalError",
+        "ServiceUnavailable",
+    }
+    _max_presentation_contexts = 128  # maximum number of presentation contexts per association (DICOM PS3.8)
     _memory_available_backoff_threshold = 1 << 30  # When available memory is less than 1GB, back-off in _handle_store
 
     # DICOM Data model sanity checking:
@@ -342,6 +524,8 @@ class ProjectController(AE):
         self.model.storage_dir.joinpath(self.model.PRIVATE_DIR).mkdir(parents=True, exist_ok=True)
         self.model.storage_dir.joinpath(self.model.PUBLIC_DIR).mkdir(exist_ok=True)
         self.set_dicom_timeouts(timeouts=model.network_timeouts)
+        self.set_chunked_send(model.export_settings.chunked_send)
+        self.set_export_bandwidth_limits(model.export_settings)
         self._implementation_class_uid = UID(self.model.IMPLEMENTATION_CLASS_UID)  # added to association requests
         self._implementation_version_name = self.model.IMPLEMENTATION_VERSION_NAME  # added to association requests
         self._maximum_pdu_size = 0  # 0 means no limit
@@ -359,6 +543,25 @@ class ProjectController(AE):
         self._aws_expiration_datetime: datetime | None = None
         self._aws_user_directory: str | None = None
         self._aws_last_error: str | None = None
+        self._s3_export_engine: S3ExportEngine | None = None  # created on first AWS export
+        self._s3_export_engine_lock = threading.Lock()
+        self._export_transcoder: ExportTranscoder | None = None  # created on first export if transcode enabled
+        self._export_transcoder_lock = threading.Lock()
+        self._export_queue_stop = threading.Event()
+        self._export_queue_thread: threading.Thread | None = None
+        self._export_lock = threading.Lock()  # held for the duration of a user or export queue driven export
+        self.export_queue_ux_Q: Queue | None = None  # progress of export queue driven exports, set by the ExportView
+
+        # Federated query & move routing:
+        self._study_sources: dict[str, list[str]] = {}  # study_uid => names of remote SCPs holding the study
+        self._scp_active_moves: dict[str, int] = {}  # scp_name => number of active study moves
+        self._scp_move_throughput: dict[str, float] = {}  # scp_name => moving average instances/sec
+        self._move_routing_lock = threading.Lock()
+        # Series level move associations shared by all studies of a bulk move, None outside _manage_move:
+        self._series_move_slots: threading.BoundedSemaphore | None = None
+        self._move_lock = threading.Lock()  # held for the duration of a user move or the resumption of move jobs
+        self._move_jobs_aborted = False  # set by abort_move, stops the resumption of further move jobs
+
         self.anonymizer = AnonymizerController(project_model=model)
 
     def __str__(self):
@@ -380,6 +583,10 @@ class ProjectController(AE):
             self.model: ProjectModel = new_model
             self.anonymizer.project_model = new_model
         self.set_dicom_timeouts(self.model.network_timeouts)
+        self.set_chunked_send(self.model.export_settings.chunked_send)
+        self.set_export_bandwidth_limits(self.model.export_settings)
+        self._shutdown_s3_export_engine()  # re-created with new export settings on next AWS export
+        self._shutdown_export_transcoder()  # re-created with new export settings on next export
         self.set_radiology_storage_contexts()
         self.set_verification_context()
         self.anonymizer.model.engine.echo = self.model.logging_levels.sql
@@ -402,6 +609,22 @@ class ProjectController(AE):
             logger.error(f"Fatal Error saving ProjectModel to {filepath}: {e}")
             return False
 
+    def set_chunked_send(self, enabled: bool) -> None:
+        """
+        Enable/disable sending DICOM files from disk in chunks no larger than the max PDU of the peer
+        without decoding the dataset (pixel data is never loaded into memory).
+        When enabled, files must be sent on an accepted presentation context which exactly matches
+        the SOPClassUID and TransferSyntaxUID of the file, see _group_files_by_presentation_contexts().
+        see: https://pydicom.github.io/pynetdicom/dev/reference/generated/pynetdicom._config.STORE_SEND_CHUNKED_DATASET.html
+        """
+        pynetdicom_config.STORE_SEND_CHUNKED_DATASET = enabled
+
+    def set_export_bandwidth_limits(self, settings: ExportSettings) -> None:
+        """
+        Set the per destination bandwidth limits and time of day schedule shared by all export workers.
+        """
+        self._export_bandwidth = ExportBandwidthLimiter(settings.bandwidth_limits, settings.bandwidth_schedule)
+
     # Value of None means no timeout
     def set_dicom_timeouts(self, timeouts: NetworkTimeouts):
         # The maximum amount of time (in seconds) to wait for a TCP connection to be established:
@@ -547,7 +770,7 @@ class ProjectController(AE):
             logger.error(f"\n{ds}")
             return C_STORE_DATASET_ERROR
 
-        if self.anonymizer.model.instance_received(ds.SOPInstanceUID):
+        if self.anonymizer.instance_received(ds.SOPInstanceUID):
             logger.debug(
                 f"Instance already stored:{ds.PatientID}/{ds.StudyInstanceUID}/{ds.SeriesInstanceUID}/{ds.SOPInstanceUID}"
             )
@@ -840,6 +1063,55 @@ class ProjectController(AE):
         """
         threading.Thread(target=self.AWS_authenticate).start()
 
+    def _get_s3_export_engine(self) -> S3ExportEngine:
+        """
+        Returns the S3ExportEngine shared by all patient export threads,
+        creating it from the ProjectModel export settings if required.
+        """
+        with self._s3_export_engine_lock:
+            if self._s3_export_engine is None:
+                settings = self.model.export_settings
+                self._s3_export_engine = S3ExportEngine(
+                    max_concurrency=settings.s3_max_concurrency,
+                    multipart_threshold=settings.s3_multipart_threshold,
+                    multipart_chunksize=settings.s3_multipart_chunksize,
+                )
+            return self._s3_export_engine
+
+    def _shutdown_s3_export_engine(self) -> None:
+        with self._s3_export_engine_lock:
+            if self._s3_export_engine:
+                self._s3_export_engine.shutdown(cancel=True)
+                self._s3_export_engine = None
+
+    def _get_export_transcoder(self) -> ExportTranscoder | None:
+        """
+        Returns the ExportTranscoder shared by all export workers, creating it from the ProjectModel export settings
+        if required, or None if transcoding is disabled or no encoder is available for the configured transfer syntax.
+        """
+        settings = self.model.export_settings
+        if not settings.transcode:
+            return None
+        with self._export_transcoder_lock:
+            if self._export_transcoder is None:
+                transfer_syntax = TRANSCODE_TRANSFER_SYNTAXES.get(settings.transcode)
+                if transfer_syntax is None:
+                    logger.error(f"Invalid export transcode setting: {settings.transcode}, transcoding disabled")
+                    return None
+                if not encoder_available(transfer_syntax):
+                    logger.warning(f"No encoder for {settings.transcode}, files exported with stored transfer syntax")
+                    return None
+                self._export_transcoder = ExportTranscoder(
+                    transfer_syntax, settings.transcode_workers, self.model.private_dir() / "export_tmp"
+                )
+            return self._export_transcoder
+
+    def _shutdown_export_transcoder(self) -> None:
+        with self._export_transcoder_lock:
+            if self._export_transcoder:
+                self._export_transcoder.shutdown()
+                self._export_transcoder = None
+
     def AWS_get_instances(self, anon_pt_id: str, study_uid: str | None = None) -> list[str]:
         """
         Blocking call to get list of objects in S3 bucket
@@ -893,7 +1165,7 @@ class ProjectController(AE):
             file_paths (list[str]): A list of file paths to be sent.
             scp_name (str): The name of the SCP to send the files to as defined in the model's remote_scps dictionary.
             send_contexts (Optional): The radiology storage contexts to use for sending.
-                If not provided, the default radiology storage contexts will be used.
+                If not provided, the presentation contexts exactly matching the headers of the files will be used.
 
         Returns:
             int: The number of files successfully sent.
@@ -901,27 +1173,30 @@ class ProjectController(AE):
         Raises:
             Any Exception raised by pynetdicom or the underlying transport layer.
 
-        TODO: Memory management, handling large datasets and many concurrent sends
-        Do not decode dataset, send raw chunks no larger than max PDU of peer
-        see: _config.STORE_SEND_CHUNKED_DATASET
-        https://pydicom.github.io/pynetdicom/dev/reference/generated/pynetdicom._config.STORE_SEND_CHUNKED_DATASET.html
-        * exact matching accepted presentation context required *
-
+        Files are sent from disk and, if export_settings.chunked_send is enabled, streamed in chunks no larger than
+        the max PDU of the peer without decoding the dataset, see set_chunked_send().
         """
         logger.debug(f"Send {len(file_paths)} files to {scp_name}")
         association = None
         files_sent = 0
 
         if send_contexts is None:
-            send_contexts = self.get_radiology_storage_contexts()
+            association_groups = self._group_files_by_presentation_contexts(file_paths)
+        else:
+            association_groups = [(send_contexts, file_paths)]
 
         try:
-            association = self._connect_to_scp(scp_name, send_contexts)
-            for dicom_file_path in file_paths:
-                dcm_response: Dataset = association.send_c_store(dataset=dicom_file_path)
-                if dcm_response.Status != 0:
-                    raise DICOMRuntimeError(f"DICOM Response: {STORAGE_SERVICE_CLASS_STATUS[dcm_response.Status][1]}")
-                files_sent += 1
+            for contexts, group_file_paths in association_groups:
+                association = self._connect_to_scp(scp_name, contexts)
+                for dicom_file_path in group_file_paths:
+                    dcm_response: Dataset = association.send_c_store(dataset=dicom_file_path)
+                    if dcm_response.Status != 0:
+                        raise DICOMRuntimeError(
+                            f"DICOM Response: {STORAGE_SERVICE_CLASS_STATUS[dcm_response.Status][1]}"
+                        )
+                    files_sent += 1
+                association.release()
+                association = None
         except Exception as e:
             logger.error(f"Send Error: {e}")
             raise
@@ -1046,9 +1321,11 @@ class ProjectController(AE):
         modality: str,
         ux_Q=None,
         verify_attributes=True,
+        clear_study_sources=True,
     ) -> list[Dataset] | None:
         """
         Blocking: Query remote server for studies matching the given query parameters:
+        The SCPs recorded as holding studies by a previous federated query are cleared, moves are routed to scp_name.
 
         Args:
             scp_name (str): The name of the SCP (Service Class Provider) to connect to from the ProjectModel's remote_scps dictionary.
@@ -1059,12 +1336,16 @@ class ProjectController(AE):
             modality (str): The modality of the study.
             ux_Q (Queue, optional): The queue to put the find study responses in. Defaults to None.
             verify_attributes (bool, optional): Flag to indicate whether to verify the attributes of the study results. Defaults to True.
+            clear_study_sources (bool, optional): False when called by find_studies_federated(). Defaults to True.
 
         Returns:
             list[Dataset] | None: A list of study results as Dataset objects, or None if no results are found
             On any error: the error message is captured and reflected back to the UX client via a pydicom status dataset within FindStudyResponse placed in ux_Q.
 
         """
+        if clear_study_sources:
+            with self._move_routing_lock:
+                self._study_sources.clear()
         try:
             if scp_name not in self.model.remote_scps:
                 raise ConnectionError(f"Remote SCP {scp_name} not found in ProjectModel remote_scps dictionary")
@@ -1330,9 +1611,130 @@ class ProjectController(AE):
 
         return results
 
+    def federated_scp_names(self, scp_name: str) -> list[str]:
+        """
+        Returns the names of the remote SCPs to query: scp_name followed by the ProjectModel's federated_scps
+        which are configured in remote_scps.
+
+        Args:
+            scp_name (str): The name of the primary SCP to query.
+
+        Returns:
+            list[str]: The list of SCP names, the query is federated if it has more than one element.
+        """
+        scp_names = [scp_name]
+        for name in self.model.federated_scps:
+            if name not in self.model.remote_scps:
+                logger.warning(f"Federated SCP {name} not found in ProjectModel remote_scps dictionary")
+                continue
+            if name not in scp_names:
+                scp_names.append(name)
+        return scp_names
+
+    def find_studies_federated(
+        self,
+        scp_names: list[str],
+        name: str,
+        id: str,
+        acc_no: str,
+        study_date: str,
+        modality: str,
+        ux_Q=None,
+        verify_attributes=True,
+    ) -> list[Dataset]:
+        """
+        Blocking: Query several remote servers concurrently for studies matching the given query parameters.
+        Results are deduplicated by StudyInstanceUID and the SCPs holding each study are recorded
+        for routing subsequent moves, see _select_move_source(). The recorded sources of a previous query are cleared.
+
+        Args:
+            scp_names (list[str]): The names of the SCPs to query from the ProjectModel's remote_scps dictionary.
+            name (str): The name of the patient.
+            id (str): The ID of the patient.
+            acc_no (str): The accession number of the study.
+            study_date (str): The date of the study.
+            modality (str): The modality of the study.
+            ux_Q (Queue, optional): The queue to put the find study responses in. Defaults to None.
+            verify_attributes (bool, optional): Flag to indicate whether to verify the attributes of the study results. Defaults to True.
+
+        Returns:
+            list[Dataset]: A list of unique study results as Dataset objects.
+            The final FindStudyResponse placed in ux_Q has C_FAILURE status if all SCPs failed, otherwise C_SUCCESS status,
+            the ErrorComment of either status lists the errors of the SCPs which failed.
+        """
+        logger.info(f"Federated C-FIND[study] to {scp_names}")
+        results: list[Dataset] = []
+        errors: list[str] = []
+
+        with self._move_routing_lock:
+            self._study_sources.clear()
+
+        with ThreadPoolExecutor(max_workers=len(scp_names), thread_name_prefix="FederatedFind") as executor:
+            # Each SCP reports into its own queue to capture its error status:
+            scp_queues = {scp_name: Queue() for scp_name in scp_names}
+            futures = {
+                executor.submit(
+                    self.find_studies,
+                    scp_name,
+                    name,
+                    id,
+                    acc_no,
+                    study_date,
+                    modality,
+                    scp_queues[scp_name],
+                    verify_attributes,
+                    False,  # sources of this query are recorded below
+                ): scp_name
+                for scp_name in scp_names
+            }
+            for future in as_completed(futures):
+                scp_name = futures[future]
+                scp_error = None
+                try:
+                    scp_results = future.result() or []
+                    for resp in scp_queues[scp_name].queue:
+                        if resp.status.Status == C_FAILURE:
+                            scp_error = resp.status.get("ErrorComment", "C-FIND failed")
+                except Exception as e:
+                    scp_error = str(e)
+
+                if scp_error is not None:
+                    logger.error(f"Federated C-FIND[study] to {scp_name} failed: {scp_error}")
+                    errors.append(f"{scp_name}: {scp_error}")
+                    continue
+
+                with self._move_routing_lock:
+                    for study_result in scp_results:
+                        study_uid = study_result.get("StudyInstanceUID", "")
+                        sources = self._study_sources.setdefault(study_uid, [])
+                        if scp_name not in sources:
+                            sources.append(scp_name)
+                        if len(sources) > 1:
+                            continue  # duplicate from another SCP
+
+                        results.append(study_result)
+                        if ux_Q:
+                            status = Dataset()
+                            status.Status = C_PENDING_A
+                            ux_Q.put(FindStudyResponse(status, study_result))
+
+                logger.info(f"Federated C-FIND[study] {scp_name}: {len(scp_results)} results")
+
+        logger.info(f"Federated C-FIND[study] {len(results)} unique studies found, {len(errors)} SCPs failed")
+
+        if ux_Q:
+            status = Dataset()
+            status.Status = C_FAILURE if len(errors) == len(scp_names) else C_SUCCESS
+            if errors:
+                status.ErrorComment = "; ".join(errors)
+            ux_Q.put(FindStudyResponse(status, None))
+
+        return results
+
     def find_ex(self, fr: FindStudyRequest) -> None:
         """
         Non-blocking: Find studies based on the provided search parameters or accession numbers.
+        Search parameter queries are federated across the ProjectModel's federated_scps, if configured.
 
         Args:
             fr (FindStudyRequest): The FindStudyRequest object containing the search parameters or just accession numbers in the acc_no field.
@@ -1340,6 +1742,7 @@ class ProjectController(AE):
         Returns:
             None
         """
+        scp_names = self.federated_scp_names(fr.scp_name)
         if isinstance(fr.acc_no, list):
             logger.info("Find studies from list of accession numbers...")
             # Due to client removing numbers as they are found, make a copy of the list:
@@ -1355,6 +1758,22 @@ class ProjectController(AE):
                 ),
                 daemon=True,  # daemon threads are abruptly stopped at shutdown
             ).start()
+        elif len(scp_names) > 1:
+            logger.info("Find studies from search parameters across federated SCPs...")
+            threading.Thread(
+                target=self.find_studies_federated,
+                name="FindStudiesFederated",
+                args=(
+                    scp_names,
+                    fr.name,
+                    fr.id,
+                    fr.acc_no,
+                    fr.study_date,
+                    fr.modality,
+                    fr.ux_Q,
+                ),
+                daemon=True,  # daemon threads are abruptly stopped at shutdown
+            ).start()
         else:
             logger.info("Find studies from search parameters...")
             threading.Thread(
@@ -1602,7 +2021,7 @@ class ProjectController(AE):
                 logger.info("GetStudyUIDHierarchies Aborted")
                 break
             error_msg, study_uid_hierarchy = self.get_study_uid_hierarchy(
-                scp_name, study.uid, study.ptid, instance_level
+                self._study_source(scp_name, study.uid), study.uid, study.ptid, instance_level
             )
             study.series = study_uid_hierarchy.series
             study.last_error_msg = error_msg
@@ -1781,154 +2200,139 @@ class ProjectController(AE):
                     move_association.release()
         return error_msg
 
-    def _move_study_at_series_level(self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy) -> str | None:
+    def _move_studies_at_study_level(
+        self, scp_name: str, dest_scp_ae: str, studies: list[StudyUIDHierarchy]
+    ) -> str | None:
         """
-        Blocking: Moves a study at the series level from one SCP to another.
+        Blocking: Moves a batch of studies at the study level using a single association and C-MOVE request
+        whose identifier contains the list of StudyInstanceUIDs.
+        Avoids the association setup overhead per study when moving many small studies (eg. single image CR/DX).
 
         Args:
             scp_name (str): The name of the source SCP.
             dest_scp_ae (str): The AE title of the move destination SCP.
-            study (StudyUIDHierarchy): The hierarchy of the study to be moved defined down to the Series level
+            studies (list[StudyUIDHierarchy]): The hierarchies of the studies to be moved, defined only by Study UID.
 
         Returns:
             str | None: An error message if any exception or error occurs during the move, otherwise None.
-            Status updates reflected in study_uid_hierarchy provided
+            Completion is tracked per study: pending_instances and last_error_msg of each study are updated,
+            last_error_msg is only set for studies not fully imported.
         """
-        logger.info(f"C-MOVE@Series[{study.uid}] scp:{scp_name} move to:{dest_scp_ae} ")
+        logger.info(f"C-MOVE@Studies[{len(studies)}] scp:{scp_name} move to:{dest_scp_ae}")
 
         move_association = None
         error_msg = None
 
-        if study is None or len(study.series) == 0:
-            error_msg = "No Series in Study"
-            return error_msg
+        # Exclude studies with nothing to move:
+        batch: list[StudyUIDHierarchy] = []
+        for study in studies:
+            target_count = study.get_number_of_instances()
+            if len(study.series) == 0:
+                study.last_error_msg = "No Series in Study"
+            elif target_count == 0:
+                study.last_error_msg = "No Instances in Study"
+            else:
+                study.pending_instances = self.anonymizer.model.get_pending_instance_count(study.uid, target_count)
+                if study.pending_instances == 0:
+                    study.last_error_msg = "All Instances already imported"
+                else:
+                    batch.append(study)
 
-        target_count = study.get_number_of_instances()
-        if target_count == 0:
-            error_msg = "No Instances in Study"
-            return error_msg
+        if not batch:
+            return None
 
-        study.pending_instances = self.anonymizer.model.get_pending_instance_count(study.uid, target_count)
-        if study.pending_instances == 0:
-            error_msg = "All Instances already imported"
-            return error_msg
+        def update_pending_instances() -> int:
+            for study in batch:
+                study.pending_instances = self.anonymizer.model.get_pending_instance_count(
+                    study.uid, study.get_number_of_instances()
+                )
+            return sum(study.pending_instances for study in batch)
 
         try:
-            for series in study.series.values():
-                # 0.1 Skip Series with no instances:
-                if series.instance_count == 0:
-                    logger.info(f"C-MOVE@Series Skip Series[{study.uid}/{series.uid}] InstanceCount=0")
-                    continue
-
-                # 0.2 Skip Series if instances all imported:
-                if self.anonymizer.model.series_complete(series.uid, series.instance_count):
-                    logger.info(f"C-MOVE@Series Skip Series[{study.uid}/{series.uid}] all instances imported")
-                    continue
-
-                # 1. Establish Association for Series MOVE request:
-                move_association = self._connect_to_scp(scp_name, self.get_study_root_move_contexts())
-
-                # 2. Move Request for each Series UID & wait for Move Response:
-                study_pending_instances_before_series_move = study.pending_instances
-
-                ds = Dataset()
-                ds.QueryRetrieveLevel = "SERIES"
-                ds.StudyInstanceUID = study.uid
-                ds.SeriesInstanceUID = series.uid
-                if series.number:
-                    ds.SeriesNumber = series.number
+            # 1. Establish Association for MOVE request:
+            move_association = self._connect_to_scp(scp_name, self.get_study_root_move_contexts())
 
-                logger.info(
-                    f"C-MOVE@Series[{study.uid}/{series.uid}] Request: Modality={series.modality} SOPClassUID={series.sop_class_uid} InstanceCount={series.instance_count}"
-                )
+            ds = Dataset()
+            ds.QueryRetrieveLevel = "STUDY"
+            ds.StudyInstanceUID = [study.uid for study in batch]  # multi-valued UI, list of UID matching
 
-                responses = move_association.send_c_move(
-                    dataset=ds,
-                    move_aet=dest_scp_ae,
-                    query_model=self._STUDY_ROOT_QR_CLASSES[1],  # Move
-                    priority=1,  # High priority
-                )
+            logger.info(
+                f"C-MOVE@Studies[{len(batch)}] Request: InstanceCount={sum(s.get_number_of_instances() for s in batch)}"
+            )
 
-                # Process the responses received from the remote scp:
-                # * Note * pynetdicom docs for send_c_move:
-                # If the status category is 'Pending' or 'Success' then yields None.
-                # If the status category is 'Warning', 'Failure' or 'Cancel' then yields a ~pydicom.dataset.Dataset which should contain
-                # an (0008,0058) *Failed SOP Instance UID List* element, however as this comes from the peer this is not guaranteed
-                # and may instead be an empty ~pydicom.dataset.Dataset.
-                for status, __ in responses:
-                    if self._abort_move:
-                        raise (DICOMRuntimeError(f"C-MOVE@Series[{study.uid}] study move aborted"))
+            # 2. Send Move Request for the list of Study UIDs & wait for Move Responses:
+            responses = move_association.send_c_move(
+                dataset=ds,
+                move_aet=dest_scp_ae,
+                query_model=self._STUDY_ROOT_QR_CLASSES[1],
+                priority=1,  # High priority
+            )
 
-                    if not status:
-                        raise (
-                            DICOMRuntimeError(
-                                f"C-MOVE@Series[{study.uid}] Connection Error, no status returned from scp"
-                            )
-                        )
+            for status, identifier in responses:
+                time.sleep(0.1)
+                if self._abort_move:
+                    raise (DICOMRuntimeError(f"C-MOVE@Studies[{len(batch)}] move studies aborted"))
 
-                    if status.Status not in (
-                        C_SUCCESS,
-                        C_PENDING_A,
-                        C_PENDING_B,
-                        C_WARNING,
-                    ):
-                        raise DICOMRuntimeError(
-                            f"C-MOVE@Series[{study.uid}/{series.uid}] failure, status:{hex(status.Status).upper()}: {QR_MOVE_SERVICE_CLASS_STATUS[status.Status][1]}"
-                        )
+                if not status:
+                    raise ConnectionError(_("Connection timed out or aborted moving study_uid") + f": {batch[0].uid}")
 
-                    if status.Status == C_SUCCESS:
-                        logger.info(
-                            f"C-MOVE@Series[{study.uid}/{series.uid}] Series Request SUCCESS SeriesNumber:{series.number}"
-                        )
+                if status.Status not in (
+                    C_SUCCESS,
+                    C_PENDING_A,
+                    C_PENDING_B,
+                    C_WARNING,
+                ):
+                    raise DICOMRuntimeError(
+                        f"C-MOVE@Studies[{len(batch)}] failure, status:{hex(status.Status).upper()}: {QR_MOVE_SERVICE_CLASS_STATUS[status.Status][1]}"
+                    )
 
-                    # Update Move stats from status:
-                    series.update_move_stats(status)
+                if status.Status == C_SUCCESS:
+                    logger.info(f"C-MOVE@Studies[{len(batch)}] Request SUCCESS")
 
-                    # Update Pending Instances count from AnonymizerModel, relevant for Syncrhonous Move:
-                    study.pending_instances = self.anonymizer.model.get_pending_instance_count(
-                        study.uid, study.get_number_of_instances()
-                    )
+                # Update Pending Instances count per study from AnonymizerModel:
+                update_pending_instances()
 
-                # 3. Wait for ALL instances of Series to be Imported by verifying with AnonymizerModel
-                #    Timeout if a pending instance is not received within NetworkTimeout
-                #    or abort on user signal:
-                prev_pending_instances = study.pending_instances
-                import_timer = int(self.model.network_timeouts.network)
-                while import_timer:
-                    if self._abort_move:
-                        raise DICOMRuntimeError(f"C-MOVE@Series[{study.uid}] aborted")
+                if identifier:
+                    logger.info(f"C-MOVE@Studies[{len(batch)}] Response identifier: {identifier}")
 
-                    study.pending_instances = self.anonymizer.model.get_pending_instance_count(
-                        study.uid, study.get_number_of_instances()
-                    )
+            logger.info(f"C-MOVE@Studies[{len(batch)}] Request COMPLETE")
 
-                    if study_pending_instances_before_series_move - study.pending_instances >= series.instance_count:
-                        logger.info(f"C-MOVE@Series[{study.uid}/{series.uid}] ALL Instances IMPORTED for Series")
-                        break
+            # 3. Wait for ALL instances of ALL Studies to be Imported by verifying with AnonymizerModel
+            #    Timeout if a pending instance is not received within NetworkTimeout
+            #    or abort on user signal:
+            prev_pending_instances = update_pending_instances()
+            import_timer = int(self.model.network_timeouts.network)
+            while import_timer:
+                if self._abort_move:
+                    raise DICOMRuntimeError(f"C-MOVE@Studies[{len(batch)}] aborted")
 
-                    # Reset timer if pending instances count changes:
-                    if study.pending_instances != prev_pending_instances:
-                        prev_pending_instances = study.pending_instances
-                        import_timer = int(self.model.network_timeouts.network)
+                pending_instances = update_pending_instances()
 
-                    import_timer -= 1
-                    time.sleep(1)
+                if pending_instances == 0:
+                    logger.info(f"C-MOVE@Studies[{len(batch)}] ALL Instances IMPORTED")
+                    break
 
-                # 4. Raise Error if Timeout
-                if import_timer == 0:
-                    raise TimeoutError(f"C-MOVE@Series[{study.uid}/{series.uid}] Import Timeout")
+                # Reset timer if pending instances count changes:
+                if pending_instances != prev_pending_instances:
+                    prev_pending_instances = pending_instances
+                    import_timer = int(self.model.network_timeouts.network)
 
-                move_association.release()
+                import_timer -= 1
+                time.sleep(1)
 
-            logger.info(f"C-MOVE@Series ALL Series Requests for Study COMPLETE: StudyUIDHierachy:\n{study}")
+            # 4. Raise Error if Timeout
+            if import_timer == 0:
+                raise TimeoutError(f"C-MOVE@Studies[{len(batch)}] Import Timeout")
 
         except Exception as e:
             error_msg = str(e)  # latch exception error msg
-            study.last_error_msg = error_msg
             logger.error(error_msg)
+            for study in batch:
+                if study.pending_instances:
+                    study.last_error_msg = error_msg
 
         finally:
-            # Release the association:
+            # Release the association
             if move_association:
                 if self._abort_move:
                     move_association.abort()
@@ -1936,66 +2340,307 @@ class ProjectController(AE):
                     move_association.release()
         return error_msg
 
-    def _move_study_at_instance_level(self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy) -> str | None:
+    def _move_series(
+        self, move_association: Association, dest_scp_ae: str, study: StudyUIDHierarchy, series: SeriesUIDHierarchy
+    ) -> None:
         """
-        Blocking: Moves a study at the instance level from one SCP to another.
+        Blocking: Moves a single series of a study using the association provided
+        and waits for all its instances to be imported.
 
         Args:
-            scp_name (str): The name of the source SCP.
-            dest_scp_ae (str): The AE title of the destination SCP.
-            study (StudyUIDHierarchy): The study to be moved with the hierarchy defined down to instance level.
+            move_association (Association): The established association with the source SCP.
+            dest_scp_ae (str): The AE title of the move destination SCP.
+            study (StudyUIDHierarchy): The hierarchy of the study of the series, study.pending_instances is updated.
+            series (SeriesUIDHierarchy): The hierarchy of the series to be moved.
 
-        Returns:
-            str | None: An error message if any exception or error occurs during the move, otherwise None.
-            Status updates are reflected in the provided study_uid_hierarchy
+        Raises:
+            DICOMRuntimeError: If the move is aborted, a connection error or a C-MOVE failure status occurs.
+            TimeoutError: If a pending instance is not received within the network timeout.
         """
-        logger.info(f"C-MOVE@Instance[{study.uid}] scp:{scp_name} move to: {dest_scp_ae} ")
+        ds = Dataset()
+        ds.QueryRetrieveLevel = "SERIES"
+        ds.StudyInstanceUID = study.uid
+        ds.SeriesInstanceUID = series.uid
+        if series.number:
+            ds.SeriesNumber = series.number
 
-        move_association = None
-        error_msg = None
+        logger.info(
+            f"C-MOVE@Series[{study.uid}/{series.uid}] Request: Modality={series.modality} SOPClassUID={series.sop_class_uid} InstanceCount={series.instance_count}"
+        )
 
-        if study is None or len(study.series) == 0:
-            error_msg = "No Series in Study"
-            return error_msg
+        responses = move_association.send_c_move(
+            dataset=ds,
+            move_aet=dest_scp_ae,
+            query_model=self._STUDY_ROOT_QR_CLASSES[1],  # Move
+            priority=1,  # High priority
+        )
 
-        if study.get_number_of_instances() == 0:
-            error_msg = "No Instances in Study"
-            return error_msg
+        # Process the responses received from the remote scp:
+        # * Note * pynetdicom docs for send_c_move:
+        # If the status category is 'Pending' or 'Success' then yields None.
+        # If the status category is 'Warning', 'Failure' or 'Cancel' then yields a ~pydicom.dataset.Dataset which should contain
+        # an (0008,0058) *Failed SOP Instance UID List* element, however as this comes from the peer this is not guaranteed
+        # and may instead be an empty ~pydicom.dataset.Dataset.
+        for status, __ in responses:
+            if self._abort_move:
+                raise (DICOMRuntimeError(f"C-MOVE@Series[{study.uid}] study move aborted"))
 
-        try:
-            # 1. Establish Association for MOVE request:
-            move_association = self._connect_to_scp(scp_name, self.get_study_root_move_contexts())
+            if not status:
+                raise (DICOMRuntimeError(f"C-MOVE@Series[{study.uid}] Connection Error, no status returned from scp"))
+
+            if status.Status not in (
+                C_SUCCESS,
+                C_PENDING_A,
+                C_PENDING_B,
+                C_WARNING,
+            ):
+                raise DICOMRuntimeError(
+                    f"C-MOVE@Series[{study.uid}/{series.uid}] failure, status:{hex(status.Status).upper()}: {QR_MOVE_SERVICE_CLASS_STATUS[status.Status][1]}"
+                )
 
-            # 2. Move Request for each Instance UID & wait for Move Response:
-            for series in study.series.values():
-                if len(series.instances) == 0:
-                    logger.error(f"No instances in Series: {series.uid} skipping")
-                    continue
+            if status.Status == C_SUCCESS:
+                logger.info(
+                    f"C-MOVE@Series[{study.uid}/{series.uid}] Series Request SUCCESS SeriesNumber:{series.number}"
+                )
 
-                for instance in series.instances.values():
-                    # Skip already imported instances
-                    if self.anonymizer.model.instance_received(instance.uid):
-                        logger.debug(f"Instance already imported: {instance.uid}, skipping")
-                        continue
+            # Update Move stats from status:
+            series.update_move_stats(status)
 
-                    ds = Dataset()
-                    ds.QueryRetrieveLevel = "IMAGE"
-                    ds.StudyInstanceUID = study.uid
-                    ds.SeriesInstanceUID = series.uid
-                    ds.SOPInstanceUID = instance.uid
-                    if instance.number:
-                        ds.InstanceNumber = instance.number
+            # Update Pending Instances count from AnonymizerModel, relevant for Syncrhonous Move:
+            study.pending_instances = self.anonymizer.model.get_pending_instance_count(
+                study.uid, study.get_number_of_instances()
+            )
 
-                    logger.info(
-                        f"C-MOVE@Instance[{study.uid}] request SeriesUID:{series.uid} InstanceUID:{instance.uid}"
-                    )
-                    logger.debug(ds)
+        # Wait for ALL instances of Series to be Imported by verifying with AnonymizerModel
+        # Series completion is checked per series since other series of the study may be moved concurrently.
+        # Timeout if a pending instance of the study is not received within NetworkTimeout
+        # or abort on user signal:
+        prev_pending_instances = study.pending_instances
+        import_timer = int(self.model.network_timeouts.network)
+        while import_timer:
+            if self._abort_move:
+                raise DICOMRuntimeError(f"C-MOVE@Series[{study.uid}] aborted")
+
+            study.pending_instances = self.anonymizer.model.get_pending_instance_count(
+                study.uid, study.get_number_of_instances()
+            )
 
-                    responses = move_association.send_c_move(
-                        dataset=ds,
-                        move_aet=dest_scp_ae,
-                        query_model=self._STUDY_ROOT_QR_CLASSES[1],  # Move
-                        priority=1,  # High priority
+            if self.anonymizer.model.series_complete(series.uid, series.instance_count):
+                logger.info(f"C-MOVE@Series[{study.uid}/{series.uid}] ALL Instances IMPORTED for Series")
+                break
+
+            # Reset timer if pending instances count changes:
+            if study.pending_instances != prev_pending_instances:
+                prev_pending_instances = study.pending_instances
+                import_timer = int(self.model.network_timeouts.network)
+
+            import_timer -= 1
+            time.sleep(1)
+
+        # Raise Error if Timeout
+        if import_timer == 0:
+            raise TimeoutError(f"C-MOVE@Series[{study.uid}/{series.uid}] Import Timeout")
+
+    def _move_series_worker(
+        self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy, series_q: Queue, stop: threading.Event
+    ) -> None:
+        """
+        Blocking: Moves series of a study taken from series_q, one at a time, on a single association
+        until the queue is empty, stop is set or the move is aborted.
+        During a bulk move, the worker first waits for one of the series move slots shared by all studies of the move.
+
+        Args:
+            scp_name (str): The name of the source SCP.
+            dest_scp_ae (str): The AE title of the move destination SCP.
+            study (StudyUIDHierarchy): The hierarchy of the study of the series.
+            series_q (Queue): The queue of SeriesUIDHierarchy to move, shared with the other workers of the study.
+            stop (threading.Event): Set when another worker of the study has failed.
+
+        Raises:
+            Exception: Any exception raised while establishing the association or moving a series.
+        """
+        slots = self._series_move_slots
+        if slots is not None and not self._acquire_series_move_slot(slots, series_q, stop):
+            return
+
+        move_association = None
+        try:
+            while not stop.is_set() and not self._abort_move:
+                try:
+                    series: SeriesUIDHierarchy = series_q.get_nowait()
+                except Empty:
+                    break
+
+                # Establish Association for Series MOVE requests, re-used for all series moved by this worker:
+                if move_association is None or not move_association.is_established:
+                    move_association = self._connect_to_scp(scp_name, self.get_study_root_move_contexts())
+
+                self._move_series(move_association, dest_scp_ae, study, series)
+        finally:
+            # Release the association:
+            if move_association:
+                if self._abort_move:
+                    move_association.abort()
+                else:
+                    move_association.release()
+            if slots is not None:
+                slots.release()
+
+    def _acquire_series_move_slot(
+        self, slots: threading.BoundedSemaphore, series_q: Queue, stop: threading.Event
+    ) -> bool:
+        """
+        Blocking: Waits for a series move slot until one is free, the series queue is empty, stop is set
+        or the move is aborted.
+
+        Returns:
+            bool: True if a slot was acquired and must be released by the caller, otherwise False.
+        """
+        while not stop.is_set() and not self._abort_move and not series_q.empty():
+            if slots.acquire(timeout=1):
+                return True
+        return False
+
+    def _move_study_at_series_level(self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy) -> str | None:
+        """
+        Blocking: Moves a study at the series level from one SCP to another.
+        Series are spread across a pool of up to move_settings.concurrent_series_moves associations.
+        During a bulk move this limit applies across all studies of the move, see _manage_move.
+
+        Args:
+            scp_name (str): The name of the source SCP.
+            dest_scp_ae (str): The AE title of the move destination SCP.
+            study (StudyUIDHierarchy): The hierarchy of the study to be moved defined down to the Series level
+
+        Returns:
+            str | None: An error message if any exception or error occurs during the move, otherwise None.
+            Status updates reflected in study_uid_hierarchy provided
+        """
+        logger.info(f"C-MOVE@Series[{study.uid}] scp:{scp_name} move to:{dest_scp_ae} ")
+
+        error_msg = None
+
+        if study is None or len(study.series) == 0:
+            error_msg = "No Series in Study"
+            return error_msg
+
+        target_count = study.get_number_of_instances()
+        if target_count == 0:
+            error_msg = "No Instances in Study"
+            return error_msg
+
+        study.pending_instances = self.anonymizer.model.get_pending_instance_count(study.uid, target_count)
+        if study.pending_instances == 0:
+            error_msg = "All Instances already imported"
+            return error_msg
+
+        try:
+            series_q: Queue = Queue()
+            for series in study.series.values():
+                # Skip Series with no instances:
+                if series.instance_count == 0:
+                    logger.info(f"C-MOVE@Series Skip Series[{study.uid}/{series.uid}] InstanceCount=0")
+                    continue
+
+                # Skip Series if instances all imported:
+                if self.anonymizer.model.series_complete(series.uid, series.instance_count):
+                    logger.info(f"C-MOVE@Series Skip Series[{study.uid}/{series.uid}] all instances imported")
+                    continue
+
+                series_q.put(series)
+
+            stop = threading.Event()
+            workers = max(1, min(self.model.move_settings.concurrent_series_moves, series_q.qsize()))
+
+            if workers == 1:
+                self._move_series_worker(scp_name, dest_scp_ae, study, series_q, stop)
+            else:
+                logger.info(f"C-MOVE@Series[{study.uid}] {series_q.qsize()} series on {workers} associations")
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="MoveSeries") as executor:
+                    futures = [
+                        executor.submit(self._move_series_worker, scp_name, dest_scp_ae, study, series_q, stop)
+                        for __ in range(workers)
+                    ]
+                    first_exception = None
+                    for future in as_completed(futures):
+                        try:
+                            future.result()
+                        except Exception as e:
+                            stop.set()  # remaining workers stop after their current series
+                            if first_exception is None:
+                                first_exception = e
+                if first_exception:
+                    raise first_exception
+
+            logger.info(f"C-MOVE@Series ALL Series Requests for Study COMPLETE: StudyUIDHierachy:\n{study}")
+
+        except Exception as e:
+            error_msg = str(e)  # latch exception error msg
+            study.last_error_msg = error_msg
+            logger.error(error_msg)
+
+        return error_msg
+
+    def _move_study_at_instance_level(self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy) -> str | None:
+        """
+        Blocking: Moves a study at the instance level from one SCP to another.
+
+        Args:
+            scp_name (str): The name of the source SCP.
+            dest_scp_ae (str): The AE title of the destination SCP.
+            study (StudyUIDHierarchy): The study to be moved with the hierarchy defined down to instance level.
+
+        Returns:
+            str | None: An error message if any exception or error occurs during the move, otherwise None.
+            Status updates are reflected in the provided study_uid_hierarchy
+        """
+        logger.info(f"C-MOVE@Instance[{study.uid}] scp:{scp_name} move to: {dest_scp_ae} ")
+
+        move_association = None
+        error_msg = None
+
+        if study is None or len(study.series) == 0:
+            error_msg = "No Series in Study"
+            return error_msg
+
+        if study.get_number_of_instances() == 0:
+            error_msg = "No Instances in Study"
+            return error_msg
+
+        try:
+            # 1. Establish Association for MOVE request:
+            move_association = self._connect_to_scp(scp_name, self.get_study_root_move_contexts())
+
+            # 2. Move Request for each Instance UID & wait for Move Response:
+            for series in study.series.values():
+                if len(series.instances) == 0:
+                    logger.error(f"No instances in Series: {series.uid} skipping")
+                    continue
+
+                for instance in series.instances.values():
+                    # Skip already imported instances
+                    if self.anonymizer.instance_received(instance.uid):
+                        logger.debug(f"Instance already imported: {instance.uid}, skipping")
+                        continue
+
+                    ds = Dataset()
+                    ds.QueryRetrieveLevel = "IMAGE"
+                    ds.StudyInstanceUID = study.uid
+                    ds.SeriesInstanceUID = series.uid
+                    ds.SOPInstanceUID = instance.uid
+                    if instance.number:
+                        ds.InstanceNumber = instance.number
+
+                    logger.info(
+                        f"C-MOVE@Instance[{study.uid}] request SeriesUID:{series.uid} InstanceUID:{instance.uid}"
+                    )
+                    logger.debug(ds)
+
+                    responses = move_association.send_c_move(
+                        dataset=ds,
+                        move_aet=dest_scp_ae,
+                        query_model=self._STUDY_ROOT_QR_CLASSES[1],  # Move
+                        priority=1,  # High priority
                     )
 
                     # Process the responses received from the remote scp:
@@ -2087,18 +2732,169 @@ class ProjectController(AE):
 
         return error_msg
 
+    def _move_op(self, level: MoveLevel):
+        """
+        Returns the move operation for the specified move level.
+        """
+        if level == MoveLevel.STUDY:
+            return self._move_study_at_study_level
+        if level == MoveLevel.INSTANCE:
+            return self._move_study_at_instance_level
+        return self._move_study_at_series_level
+
+    def _study_source(self, scp_name: str, study_uid: str) -> str:
+        """
+        Returns scp_name if it holds the study according to the last federated query (or no record exists),
+        otherwise the first SCP found to hold the study.
+        """
+        with self._move_routing_lock:
+            sources = self._study_sources.get(study_uid)
+        if not sources or scp_name in sources:
+            return scp_name
+        return sources[0]
+
+    def _select_move_source(self, scp_name: str, study_uid: str) -> str:
+        """
+        Selects the SCP to move a study from, amongst the SCPs found to hold the study by a federated query.
+        The least-loaded SCP (fewest active study moves) is selected, ties are broken by highest measured throughput.
+        The active move count of the selected SCP is incremented, see _release_move_source().
+
+        Args:
+            scp_name (str): The name of the SCP specified in the MoveStudiesRequest, used if no sources are recorded.
+            study_uid (str): The StudyInstanceUID of the study to move.
+
+        Returns:
+            str: The name of the selected SCP.
+        """
+        with self._move_routing_lock:
+            sources = self._study_sources.get(study_uid) or [scp_name]
+            selected = min(
+                sources,
+                key=lambda name: (self._scp_active_moves.get(name, 0), -self._scp_move_throughput.get(name, 0.0)),
+            )
+            self._scp_active_moves[selected] = self._scp_active_moves.get(selected, 0) + 1
+        if len(sources) > 1:
+            logger.info(f"Study[{study_uid}] move routed to {selected} from sources: {sources}")
+        return selected
+
+    def _release_move_source(self, scp_name: str, outcome: MoveOutcome | None = None, smoothing: float = 0.3) -> None:
+        """
+        Decrements the active move count of the SCP and updates its moving average throughput from the outcome.
+        """
+        with self._move_routing_lock:
+            self._scp_active_moves[scp_name] = max(self._scp_active_moves.get(scp_name, 0) - 1, 0)
+            if outcome and outcome.error_msg is None and outcome.instances_moved:
+                throughput = outcome.throughput()
+                avg = self._scp_move_throughput.get(scp_name)
+                self._scp_move_throughput[scp_name] = (
+                    throughput if avg is None else smoothing * throughput + (1 - smoothing) * avg
+                )
+
+    def _move_study(self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy, level: MoveLevel) -> MoveOutcome:
+        """
+        Blocking: Moves a study from the SCP selected by _select_move_source(), see _move_study_from_source().
+        """
+        source = self._select_move_source(scp_name, study.uid)
+        outcome = None
+        try:
+            outcome = self._move_study_from_source(source, dest_scp_ae, study, level)
+            return outcome
+        finally:
+            self._release_move_source(source, outcome)
+
+    def _move_study_from_source(
+        self, scp_name: str, dest_scp_ae: str, study: StudyUIDHierarchy, level: MoveLevel
+    ) -> MoveOutcome:
+        """
+        Blocking: Moves a study at the specified level and measures the outcome for the AdaptiveMoveController.
+        If the instance level hierarchy of the study has not been retrieved, it is retrieved before an INSTANCE level move.
+
+        Args:
+            scp_name (str): The name of the source SCP.
+            dest_scp_ae (str): The AE title of the move destination SCP.
+            study (StudyUIDHierarchy): The hierarchy of the study to be moved.
+            level (MoveLevel): The level at which to move the study.
+
+        Returns:
+            MoveOutcome: The duration, number of instances moved and error message (if any) of the move operation.
+        """
+        start_time = time.monotonic()
+        stored_before = self.anonymizer.model.get_stored_instance_count(study_uid=study.uid)
+
+        if level == MoveLevel.INSTANCE and study.series and not study.get_instances():
+            logger.info(f"Study[{study.uid}] retrieve instance level hierarchy for INSTANCE level move")
+            error_msg, study_uid_hierarchy = self.get_study_uid_hierarchy(scp_name, study.uid, study.ptid, True)
+            if error_msg:
+                study.last_error_msg = error_msg
+                return MoveOutcome(study.uid, level, time.monotonic() - start_time, 0, error_msg)
+            study.series = study_uid_hierarchy.series
+
+        error_msg = self._move_op(level)(scp_name, dest_scp_ae, study)
+        instances_moved = self.anonymizer.model.get_stored_instance_count(study_uid=study.uid) - stored_before
+        if error_msg is None:
+            study.last_error_msg = None  # clear any error from a previous level move
+        return MoveOutcome(study.uid, level, time.monotonic() - start_time, max(instances_moved, 0), error_msg)
+
+    def _move_study_batch(self, scp_name: str, dest_scp_ae: str, studies: list[StudyUIDHierarchy]) -> list[MoveOutcome]:
+        """
+        Blocking: Moves a batch of studies with a single study level C-MOVE request and measures the outcome of each study
+        for the AdaptiveMoveController.
+
+        Args:
+            scp_name (str): The name of the source SCP.
+            dest_scp_ae (str): The AE title of the move destination SCP.
+            studies (list[StudyUIDHierarchy]): The hierarchies of the studies to be moved.
+
+        Returns:
+            list[MoveOutcome]: The outcome of each study in the batch, the duration is that of the whole batch.
+        """
+        start_time = time.monotonic()
+        stored_before = {
+            study.uid: self.anonymizer.model.get_stored_instance_count(study_uid=study.uid) for study in studies
+        }
+        for study in studies:
+            study.last_error_msg = None
+
+        # Group studies of the batch by the source SCP selected for each study:
+        studies_by_source: dict[str, list[StudyUIDHierarchy]] = {}
+        for study in studies:
+            source = self._select_move_source(scp_name, study.uid)
+            studies_by_source.setdefault(source, []).append(study)
+
+        for source, source_studies in studies_by_source.items():
+            try:
+                self._move_studies_at_study_level(source, dest_scp_ae, source_studies)
+            finally:
+                for __ in source_studies:
+                    self._release_move_source(source)
+
+        duration = time.monotonic() - start_time
+        outcomes = []
+        for study in studies:
+            instances_moved = (
+                self.anonymizer.model.get_stored_instance_count(study_uid=study.uid) - stored_before[study.uid]
+            )
+            outcomes.append(
+                MoveOutcome(study.uid, MoveLevel.STUDY, duration, max(instances_moved, 0), study.last_error_msg)
+            )
+        return outcomes
+
     def bulk_move_active(self) -> bool:
         """
-        Check if there are any active move futures.
+        Check if a move is active: a user move or the resumption of move jobs, see resume_move_jobs().
 
         Returns:
-            bool: True if there are active move futures, False otherwise.
+            bool: True if a move is active, False otherwise.
         """
-        return self._move_futures is not None
+        return self._move_lock.locked() or self._move_futures is not None
 
     def _manage_move(self, req: MoveStudiesRequest) -> None:
         """
-        Blocking: Manages a bulk move operation for a list of studies using a thread pool (self._study_move_thread_pool_size).
+        Blocking: Manages a bulk move operation for a list of studies using a thread pool.
+        The number of concurrent study moves and per study move level fallback is managed by an AdaptiveMoveController
+        configured from the ProjectModel's move_settings.
+        At STUDY level, studies are moved in batches of move_settings.study_batch_size studies per C-MOVE request.
+        At SERIES level, move_settings.concurrent_series_moves limits the associations of all studies of the move.
 
         Args:
             req (MoveStudiesRequest): The request dataclass object containing the details of the move operation.
@@ -2109,79 +2905,193 @@ class ProjectController(AE):
                     dest_scp_ae: str # move destination
                     level: str  # STUDY, SERIES, IMAGE OR INSTANCE
                     studies: list[StudyUIDHierarchy]
+                    job_id: int | None = None
 
         Returns:
             None
         """
-        self._move_futures = []
-
-        self._move_executor = ThreadPoolExecutor(
-            max_workers=self._study_move_thread_pool_size,
-            thread_name_prefix="MoveStudy",
+        settings = self.model.move_settings
+        move_controller = AdaptiveMoveController(
+            initial_concurrency=settings.concurrent_moves,
+            max_concurrency=settings.max_concurrent_moves if settings.adaptive else settings.concurrent_moves,
+            lowest_level=MoveLevel.from_str(settings.lowest_move_level, default=MoveLevel.INSTANCE),
+            adaptive=settings.adaptive,
         )
 
         # By DEFAULT Move Level is SERIES
-        move_op = self._move_study_at_series_level
-        if req.level:
-            if "STUDY" in req.level.upper():
-                move_op = self._move_study_at_study_level
-            elif req.level.upper() in [_("IMAGE"), _("INSTANCE")]:
-                move_op = self._move_study_at_instance_level
-
-        logger.info(f"Move Operation: {move_op.__name__}")
+        initial_level = MoveLevel.from_str(req.level, default=MoveLevel.SERIES)
+        logger.info(f"Move Operation: {self._move_op(initial_level).__name__}")
 
-        with self._move_executor as executor:
-            for study in req.studies:
-                future = executor.submit(
-                    move_op,
+        # Persist the request as a move job in the AnonymizerModel so it can be resumed after a restart:
+        if req.job_id is None:
+            try:
+                req.job_id = self.anonymizer.model.create_move_job(
                     req.scp_name,
                     req.dest_scp_ae,
-                    study,
+                    req.level,
+                    [(study.uid, study.ptid, study.to_json()) for study in req.studies],
                 )
-                self._move_futures.append((future, move_op, study))
+            except Exception as e:
+                logger.error(f"Failed to persist move job, move will not be resumable: {e}")
 
-            logger.info(f"Move Futures: {len(self._move_futures)}")
+        move_futures = []
+        self._move_futures = move_futures
+        self._series_move_slots = threading.BoundedSemaphore(max(settings.concurrent_series_moves, 1))
 
-            for future, __, study in self._move_futures:
+        self._move_executor = ThreadPoolExecutor(
+            max_workers=move_controller.max_concurrency,
+            thread_name_prefix="MoveStudy",
+        )
+
+        # Studies are submitted to the executor only while the number of active moves is below the current concurrency.
+        # At STUDY level, studies are grouped into batches of study_batch_size studies per C-MOVE request:
+        batch_size = max(settings.study_batch_size, 1) if initial_level == MoveLevel.STUDY else 1
+        pending_moves: deque[tuple[list[StudyUIDHierarchy], MoveLevel]] = deque(
+            (req.studies[i : i + batch_size], initial_level) for i in range(0, len(req.studies), batch_size)
+        )
+        active_moves: dict[Future, list[StudyUIDHierarchy]] = {}
+
+        with self._move_executor as executor:
+            while (pending_moves or active_moves) and not self._abort_move:
                 try:
-                    error_msg = future.result()  # This will raise any exceptions that _move_study did not catch
-                    if error_msg:
-                        logger.warning(f"Study[{study.uid}] Move Future Error: {error_msg}")
-
-                    # Auto DOWN LEVEL Study Move operation on Timeout:
-                    # This algorithm was removed after testing with Hyland VNA indicated that it does not support instance move
-                    # User level selection for Import process then implemented
-                    # if error_msg and "Timeout" in error_msg:
-                    #     logger.warning(f"Study[{study.uid}] Move Future Error: {error_msg}")
-                    #     next_move_op = None
-
-                    #     if move_op == self._move_study_at_study_level:
-                    #         next_move_op = self._move_study_at_series_level
-                    #     elif move_op == self._move_study_at_series_level:
-                    #         next_move_op = self._move_study_at_instance_level
-
-                    #     if next_move_op:
-                    #         new_future = executor.submit(
-                    #             next_move_op,
-                    #             req.scp_name,
-                    #             req.dest_scp_ae,
-                    #             study,
-                    #         )
-                    #         self._move_futures.append((new_future, next_move_op, study))
-                    #         logger.warning(f"Study[{study.uid}] Move Operation DOWN LEVEL to: {next_move_op.__name__}")
+                    while pending_moves and len(active_moves) < move_controller.concurrency:
+                        studies, level = pending_moves.popleft()
+                        if len(studies) > 1:
+                            future = executor.submit(self._move_study_batch, req.scp_name, req.dest_scp_ae, studies)
+                            move_op = self._move_studies_at_study_level
+                        else:
+                            future = executor.submit(self._move_study, req.scp_name, req.dest_scp_ae, studies[0], level)
+                            move_op = self._move_op(level)
+                        active_moves[future] = studies
+                        move_futures.extend((future, move_op, study) for study in studies)
+                except RuntimeError:  # executor shutdown by abort_move
+                    break
 
-                except Exception as e:
-                    # Handle specific exceptions if needed
-                    if not self._abort_move:
-                        logger.error(f"Exception caught in _manage_move: {e}")
+                done, __ = wait(active_moves, timeout=1, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    studies = active_moves.pop(future)
+                    try:
+                        # This will raise any exceptions that _move_study or _move_study_batch did not catch:
+                        result: MoveOutcome | list[MoveOutcome] = future.result()
+                        if isinstance(result, list):
+                            # One C-MOVE request for the batch, concurrency is adapted once for the batch:
+                            outcomes = result
+                            next_levels = move_controller.record_batch(outcomes)
+                        else:
+                            outcomes = [result]
+                            next_levels = [move_controller.record(result)]
+
+                        # Completion is tracked per study, studies of a batch fallback individually:
+                        for study, outcome, next_level in zip(studies, outcomes, next_levels, strict=True):
+                            if outcome.error_msg:
+                                logger.warning(f"Study[{study.uid}] Move Future Error: {outcome.error_msg}")
+
+                            if next_level and not self._abort_move:
+                                pending_moves.append(([study], next_level))
+                            else:
+                                self._update_move_job_study(req.job_id, study, outcome)
+
+                    except CancelledError:
+                        pass
+                    except Exception as e:
+                        # Handle specific exceptions if needed
+                        if not self._abort_move:
+                            logger.error(f"Exception caught in _manage_move: {e}")
+
+        logger.info(f"_manage_move complete, final concurrency: {move_controller.concurrency}")
+        # Completed or cancelled by user, only a restart/crash leaves a move job incomplete for resumption:
+        if req.job_id is not None:
+            try:
+                self.anonymizer.model.complete_move_job(req.job_id)
+            except Exception as e:
+                logger.error(f"Failed to complete MoveJob[{req.job_id}]: {e}")
+        self._series_move_slots = None
+        if self._move_futures is move_futures:  # not already reset by abort_move
+            self._move_futures = None
+            self._move_executor = None
 
-        logger.info("_manage_move complete")
-        self._move_futures = None
-        self._move_executor = None
+    def _update_move_job_study(self, job_id: int | None, study: StudyUIDHierarchy, outcome: MoveOutcome) -> None:
+        """
+        Persists the state of a study whose move has finished to its move job in the AnonymizerModel.
+        """
+        if job_id is None:
+            return
+        complete = outcome.outcome_type() in [MoveOutcomeType.SUCCESS, MoveOutcomeType.SKIPPED]
+        try:
+            self.anonymizer.model.update_move_job_study(
+                job_id, study.uid, study.to_json(), complete, study.last_error_msg
+            )
+        except Exception as e:
+            logger.error(f"Failed to update MoveJob[{job_id}] Study[{study.uid}]: {e}")
+
+    def resume_move_jobs(self) -> None:
+        """
+        Blocking: Resumes all bulk move jobs persisted in the AnonymizerModel which did not complete,
+        eg. due to an application restart or crash midway through the move.
+        Studies already imported according to the AnonymizerModel are skipped.
+        Jobs are resumed sequentially using _manage_move, holding the move lock so no user move starts meanwhile,
+        after waiting for an active user move to finish.
+        If the user aborts the move, the remaining jobs are not resumed until the next restart.
+
+        Returns:
+            None
+        """
+        with self._move_lock:
+            self._move_jobs_aborted = False
+            self._resume_move_jobs()
+
+    def _resume_move_jobs(self) -> None:
+        try:
+            move_jobs = self.anonymizer.model.get_incomplete_move_jobs()
+        except Exception as e:
+            logger.error(f"Failed to load move jobs: {e}")
+            return
+
+        for job in move_jobs:
+            if self._move_jobs_aborted:
+                logger.info("Resumption of move jobs aborted")
+                return
+            if job.scp_name not in self.model.remote_scps:
+                logger.error(f"MoveJob[{job.job_id}] source scp: {job.scp_name} no longer configured, job not resumed")
+                self.anonymizer.model.complete_move_job(job.job_id)
+                continue
+
+            studies: list[StudyUIDHierarchy] = []
+            for job_study in job.studies:
+                if job_study.complete:
+                    continue
+                study = StudyUIDHierarchy.from_json(job_study.hierarchy)
+                if self.anonymizer.model.study_imported(study.uid):
+                    logger.info(f"MoveJob[{job.job_id}] Study[{study.uid}] already imported, skipped")
+                    self.anonymizer.model.update_move_job_study(job.job_id, study.uid, job_study.hierarchy, True, None)
+                    continue
+                study.pending_instances = self.get_number_of_pending_instances(study)
+                studies.append(study)
+
+            if not studies:
+                self.anonymizer.model.complete_move_job(job.job_id)
+                continue
+
+            logger.info(
+                f"Resuming MoveJob[{job.job_id}] created: {job.created}, {len(studies)} of {len(job.studies)} studies pending"
+            )
+            self._manage_move(MoveStudiesRequest(job.scp_name, job.dest_scp_ae, job.level, studies, job.job_id))
 
-    def move_studies_ex(self, mr: MoveStudiesRequest) -> None:
+    def resume_move_jobs_ex(self) -> None:
+        """
+        Non-blocking: Resume incomplete bulk move jobs, see resume_move_jobs()
+        """
+        threading.Thread(
+            target=self.resume_move_jobs,
+            name="ResumeMoveJobs",
+            daemon=True,  # daemon threads are abruptly stopped at shutdown
+        ).start()
+
+    def move_studies_ex(self, mr: MoveStudiesRequest) -> bool:
         """
         Move studies asynchronously.
+        The move is not started if another move is active, eg. the resumption of move jobs, see bulk_move_active().
 
         Args:
             mr (MoveStudiesRequest): The request object containing the details of the studies to be moved.
@@ -2192,13 +3102,28 @@ class ProjectController(AE):
                     dest_scp_ae: str
                     level: str
                     studies: list[StudyUIDHierarchy]
+                    job_id: int | None = None
+
+        Returns:
+            bool: True if the move was started, False if another move is active.
         """
+        if not self._move_lock.acquire(blocking=False):
+            logger.error("Move already active, eg. resumption of move jobs")
+            return False
         threading.Thread(
-            target=self._manage_move,
+            target=self._run_move,
             name="ManageMove",
             args=(mr,),
             daemon=True,  # daemon threads are abruptly stopped at shutdown
         ).start()
+        return True
+
+    def _run_move(self, mr: MoveStudiesRequest) -> None:
+        # Blocking: _manage_move holding the move lock acquired by move_studies_ex:
+        try:
+            self._manage_move(mr)
+        finally:
+            self._move_lock.release()
 
     def abort_move(self):
         """
@@ -2206,12 +3131,13 @@ class ProjectController(AE):
 
         This method sets a flag to indicate that the move operation should be aborted.
         If a move executor is active, it cancels all pending move futures and shuts down the executor.
-        After the move operation is aborted, the flag is reset.
+        After the move operation is aborted, the flag is reset, the resumption of further move jobs is stopped.
 
         Returns:
             None
         """
         logger.info("Abort Move")
+        self._move_jobs_aborted = True
         self._abort_move = True
         if self._move_executor:
             self._move_executor.shutdown(wait=True, cancel_futures=True)
@@ -2221,140 +3147,449 @@ class ProjectController(AE):
         logger.info("Move abort complete")
         self._abort_move = False
 
-    def _export_patient(self, dest_name: str, patient_id: str, ux_Q: Queue) -> None:
+    def _read_file_header(self, file_path: str) -> tuple[str, str]:
         """
-        Blocking: Export the anonymized patient's DICOM files to the specified destination (DICOM server or AWS S3 bucket).
+        Reads the SOPClassUID and TransferSyntaxUID of a DICOM file without reading the pixel data.
 
         Args:
-            dest_name (str): The name of the destination.
-            patient_id (str): The anonymized Patient ID.
-            ux_Q (Queue): The UX queue to send ExportPatientsResponse to.
+            file_path (str): The path to the DICOM file.
+
+        Returns:
+            tuple[str, str]: The SOPClassUID and TransferSyntaxUID of the file.
 
-                Any exceptions & errors are reflected via the error field of ExportPatientsResponse
+        Raises:
+            ValueError: If the file is not a valid DICOM file with file meta information and SOPClassUID.
+        """
+        ds = dcmread(os.fspath(file_path), stop_before_pixels=True, specific_tags=["SOPClassUID"])
+        if not hasattr(ds, "SOPClassUID") or not hasattr(ds, "file_meta") or "TransferSyntaxUID" not in ds.file_meta:
+            raise ValueError(f"Invalid DICOM file: {file_path}")
+        return ds.SOPClassUID, ds.file_meta.TransferSyntaxUID
+
+    def _group_files_by_presentation_contexts(
+        self, file_paths: list[str], transcode_syntax: str | None = None
+    ) -> list[tuple[List[PresentationContext], list[str]]]:
+        """
+        Scans the headers of the files to be sent and groups them into as few associations as possible,
+        each negotiating up to _max_presentation_contexts contexts, one per (SOPClassUID, TransferSyntaxUID).
 
-                @dataclass
-                class ExportPatientsResponse:
-                    patient_id: str
-                    files_sent: int  # incremented for each file sent successfully
-                    error: str | None  # error message
-                    complete: bool  # True if all files sent successfully
+        Args:
+            file_paths (list[str]): The paths to the DICOM files to be sent.
+            transcode_syntax (str, optional): Lossless Transfer Syntax UID files with an uncompressed transfer syntax
+                may be transcoded to, an additional context (SOPClassUID, transcode_syntax) is proposed for them
+                so the files can be sent with their stored transfer syntax if the destination rejects it.
 
         Returns:
-            None
+            list[tuple[List[PresentationContext], list[str]]]: For each association, the presentation contexts
+            to negotiate and the file paths to send over it.
         """
-        logger.info(f"_export_patient {patient_id} start, export to :{dest_name}")
+        files_by_context: dict[tuple[str, str], list[str]] = {}
+        for file_path in file_paths:
+            files_by_context.setdefault(self._read_file_header(file_path), []).append(file_path)
+
+        def contexts_for(sop_class_uid: str, transfer_syntax: str) -> list[PresentationContext]:
+            contexts = [build_context(sop_class_uid, transfer_syntax)]
+            if transcode_syntax and transfer_syntax in UNCOMPRESSED_TRANSFER_SYNTAXES:
+                contexts.append(build_context(sop_class_uid, transcode_syntax))
+            return contexts
+
+        context_keys = sorted(files_by_context.keys())
+        groups = []
+        keys: list[tuple[str, str]] = []
+        contexts: list[PresentationContext] = []
+        for key in context_keys:
+            key_contexts = contexts_for(*key)
+            if keys and len(contexts) + len(key_contexts) > self._max_presentation_contexts:
+                groups.append((contexts, [file_path for k in keys for file_path in files_by_context[k]]))
+                keys, contexts = [], []
+            keys.append(key)
+            contexts += key_contexts
+        if keys:
+            groups.append((contexts, [file_path for k in keys for file_path in files_by_context[k]]))
 
-        export_association: Association | None = None
-        files_sent = 0
+        logger.info(
+            f"{len(file_paths)} files require {sum(len(group[0]) for group in groups)} presentation contexts "
+            f"on {len(groups)} associations"
+        )
+        return groups
+
+    def _export_destination_key(self, dest_name: str) -> str:
+        """
+        Returns the key identifying an export destination in the export manifest,
+        derived from its address so the manifest is not re-used if the destination is re-configured.
+        """
+        if dest_name == AWS_EXPORT_DEST:
+            aws = self.model.aws_cognito
+            return f"s3://{aws.s3_bucket}/{aws.s3_prefix}/{aws.username}/{self.model.project_name}"
+        node = self.model.remote_scps.get(dest_name)
+        return f"{node.aet}@{node.ip}:{node.port}" if node else dest_name
+
+    def _export_reconciliation_due(self, dest_key: str, patient_id: str) -> bool:
+        """
+        Returns True if the export manifest of the patient must be reconciled with the export destination:
+        the patient has never been reconciled with this destination or,
+        if export_settings.manifest_reconcile_interval is set, the interval has elapsed since the last reconciliation.
+        """
+        reconciled = self.anonymizer.model.get_export_reconciled(dest_key, patient_id)
+        if reconciled is None:
+            return True
+        interval = self.model.export_settings.manifest_reconcile_interval
+        return interval > 0 and datetime.now() - reconciled > timedelta(hours=interval)
+
+    def _get_study_instance_counts(self, scp_name: str, study_uids: list[str]) -> dict[str, int | None] | None:
+        """
+        Blocking: Query remote DICOM server for the number of instances of each study using STUDY level C-FINDs
+        on one association.
+
+        Args:
+            scp_name (str): The name of the remote SCP.
+            study_uids (list[str]): The Study UIDs to query.
+
+        Returns:
+            dict[str, int | None] | None: Study UID => NumberOfStudyRelatedInstances, None if the remote server
+            did not return the count, studies not found on the remote server are not included, None if export aborted.
+
+        Raises:
+            ConnectionError: If the connection times out, is aborted, or receives an invalid response.
+            DICOMRuntimeError: If the C-FIND operation fails with status not pending or success.
+            Any Exception raised by _connect_to_scp
+        """
+        study_counts: dict[str, int | None] = {}
+        if not study_uids:
+            return study_counts
+
+        query_association = self._connect_to_scp(scp_name, self.get_study_root_find_contexts())
         try:
-            # Load DICOM files to send from active local storage directory for this patient:
-            patient_dir = Path(self.model.images_dir(), patient_id)
+            for study_uid in study_uids:
+                if self._abort_export:
+                    return None
 
-            if not patient_dir.exists():
-                raise ValueError(f"Selected directory {patient_dir} does not exist")
-
-            # Get all the DICOM files for this patient:
-            file_paths = []
-            for root, _, files in os.walk(patient_dir):
-                file_paths.extend(os.path.join(root, file) for file in files if file.endswith(".dcm"))
-
-            # Convert to dictionary with instance UIDs as keys:
-            export_instance_paths = {Path(file_path).stem: file_path for file_path in file_paths}
-
-            # Remove all instances which are already on destination from the export list:
-            # For AWS get all instances for this patient id:
-            if self.model.export_to_AWS:
-                for instance_uid in self.AWS_get_instances(patient_id):
-                    if instance_uid in export_instance_paths:
-                        del export_instance_paths[instance_uid]
-            else:
-                # For DICOM Servers iterate through Study sub-directories for this patient
-                # If a study instance is on the remote server (DICOM or AWS), remove from export_instance_paths dict
-                self._abort_query = False
-                for study_uid in os.listdir(patient_dir):
-                    time.sleep(self._export_file_time_slice_interval)
-                    if self._abort_export:
-                        logger.error(f"_export_patient patient_id: {patient_id} aborted")
-                        return
+                ds = Dataset()
+                ds.QueryRetrieveLevel = "STUDY"
+                ds.StudyInstanceUID = study_uid
+                ds.NumberOfStudyRelatedInstances = ""
 
-                    study_path = os.path.join(patient_dir, study_uid)
-                    if not os.path.isdir(study_path):
-                        continue
+                for status, identifier in query_association.send_c_find(
+                    ds,
+                    query_model=self._STUDY_ROOT_QR_CLASSES[0],  # Find
+                ):
+                    if not status:
+                        raise ConnectionError("Connection timed out, was aborted, or received an invalid response")
+                    if status.Status not in (C_SUCCESS, C_PENDING_A, C_PENDING_B):
+                        logger.error(f"C-FIND[study] failure, status: {hex(status.Status)}")
+                        raise DICOMRuntimeError(f"C-FIND[study] Failed: {QR_FIND_SERVICE_CLASS_STATUS[status.Status]}")
+                    if identifier and identifier.get("StudyInstanceUID", None) == study_uid:
+                        count = identifier.get("NumberOfStudyRelatedInstances", None)
+                        study_counts[study_uid] = None if count in (None, "") else int(count)
+        finally:
+            query_association.release()
 
-                    # Get Study UID Hierarchy:
-                    _, study_hierarchy = self.get_study_uid_hierarchy(dest_name, study_uid, patient_id, True)
-                    for instance in study_hierarchy.get_instances():
-                        if instance.uid in export_instance_paths:
-                            del export_instance_paths[instance.uid]
+        return study_counts
 
-            # If NO files to export for this patient, indicate successful export to UX:
-            if len(export_instance_paths) == 0:
-                logger.info(f"All studies already exported to {dest_name} for patient: {patient_id}")
-                ux_Q.put(ExportPatientsResponse(patient_id, 0, None, True))
-                return
+    def _get_instances_on_destination(self, dest_name: str, patient_id: str, patient_dir: Path) -> set[str] | None:
+        """
+        Blocking: Query the export destination for the anonymized instances of the patient it holds.
+
+        For DICOM destinations, a STUDY level query per study compares NumberOfStudyRelatedInstances with the
+        number of local files, all local instances of a study are assumed present if the destination holds at least
+        as many. The instance level hierarchy is only queried for studies which are partially present or whose
+        count the destination does not return. If the STUDY level queries fail, the instance level hierarchy of
+        every study is queried, errors of which are logged and the study's files sent.
+
+        Args:
+            dest_name (str): The name of the export destination.
+            patient_id (str): The anonymized Patient ID.
+            patient_dir (Path): The local storage directory of the patient.
+
+        Returns:
+            set[str] | None: The SOPInstanceUIDs of the patient's instances on the destination, None if export aborted.
+
+        Raises:
+            AuthenticationError: If AWS authentication fails.
+        """
+        # For AWS get all instances for this patient id:
+        if dest_name == AWS_EXPORT_DEST:
+            return set(self.AWS_get_instances(patient_id))
+
+        # For DICOM Servers iterate through Study sub-directories for this patient:
+        local_study_instances: dict[str, list[str]] = {}
+        for study_uid in os.listdir(patient_dir):
+            study_path = os.path.join(patient_dir, study_uid)
+            if not os.path.isdir(study_path):
+                continue
+            local_study_instances[study_uid] = [
+                Path(file).stem for _, _, files in os.walk(study_path) for file in files if file.endswith(".dcm")
+            ]
+
+        # Fast path: compare the number of instances of each study on the remote server with local storage
+        # using one STUDY level query per study:
+        try:
+            remote_study_counts = self._get_study_instance_counts(dest_name, list(local_study_instances))
+        except Exception as e:
+            # eg. storage only destination without Q/R, query the instance level hierarchy of each study:
+            logger.warning(f"Study instance counts from {dest_name} failed: {repr(e)}, query instances of each study")
+            remote_study_counts = dict.fromkeys(local_study_instances)
+        if remote_study_counts is None:
+            return None
+
+        instance_uids: set[str] = set()
+        self._abort_query = False
+        for study_uid, local_instance_uids in local_study_instances.items():
+            if study_uid not in remote_study_counts or remote_study_counts[study_uid] == 0:
+                logger.info(f"Study[{study_uid}] not on {dest_name}")
+                continue
+            remote_count = remote_study_counts[study_uid]
+            if remote_count is not None and remote_count >= len(local_instance_uids):
+                logger.info(f"Study[{study_uid}] fully present on {dest_name}: {remote_count} instances")
+                instance_uids.update(local_instance_uids)
+                continue
+
+            # Study partially present or count unknown, get instances of the study on the remote server:
+            time.sleep(self._export_file_time_slice_interval)
+            if self._abort_export:
+                return None
+            logger.info(
+                f"Study[{study_uid}] on {dest_name}: {remote_count} of {len(local_instance_uids)} instances, query instances"
+            )
+            error_msg, study_hierarchy = self.get_study_uid_hierarchy(dest_name, study_uid, patient_id, True)
+            if error_msg:
+                logger.warning(f"Study[{study_uid}] instances on {dest_name} unknown: {error_msg}, send all files")
+            instance_uids.update(instance.uid for instance in study_hierarchy.get_instances())
+
+        return instance_uids
+
+    def _plan_patient_export(self, dest_name: str, patient_id: str) -> list[list[str]] | None:
+        """
+        Blocking: Determine which of the anonymized patient's DICOM files must be exported to the destination
+        and split them into export work items.
+
+        Args:
+            dest_name (str): The name of the destination.
+            patient_id (str): The anonymized Patient ID.
+
+        Returns:
+            list[list[str]] | None: The file paths of each work item, all files of a work item belong to the same study,
+            studies with more than export_settings.export_work_item_max_files files are split into multiple work items.
+            An empty list if all files are already on the destination, None if export aborted.
 
-            # EXPORT Files:
-            if self.model.export_to_AWS:
+        Raises:
+            ValueError: If the patient's storage directory does not exist.
+            Any exception raised querying the destination.
+        """
+        logger.info(f"_plan_patient_export {patient_id} start, export to :{dest_name}")
+
+        # Load DICOM files to send from active local storage directory for this patient:
+        patient_dir = Path(self.model.images_dir(), patient_id)
+
+        if not patient_dir.exists():
+            raise ValueError(f"Selected directory {patient_dir} does not exist")
+
+        # Get all the DICOM files for this patient:
+        file_paths = []
+        for root, __, files in os.walk(patient_dir):
+            file_paths.extend(os.path.join(root, file) for file in files if file.endswith(".dcm"))
+
+        # Convert to dictionary with instance UIDs as keys:
+        export_instance_paths = {Path(file_path).stem: file_path for file_path in file_paths}
+
+        # Remove all instances which are already on destination from the export list,
+        # as per the local export manifest or, if reconciliation is due, by querying the destination:
+        export_settings = self.model.export_settings
+        dest_key = self._export_destination_key(dest_name)
+        if export_settings.export_manifest and not self._export_reconciliation_due(dest_key, patient_id):
+            exported_instance_uids = self.anonymizer.model.get_exported_instances(dest_key, patient_id)
+            logger.info(
+                f"Export manifest: {len(exported_instance_uids)} instances of {patient_id} already on {dest_key}"
+            )
+        else:
+            exported_instance_uids = self._get_instances_on_destination(dest_name, patient_id, patient_dir)
+            if exported_instance_uids is None:
+                return None
+            if export_settings.export_manifest:
+                self.anonymizer.model.reconcile_exported_instances(dest_key, patient_id, exported_instance_uids)
+
+        for instance_uid in exported_instance_uids:
+            export_instance_paths.pop(instance_uid, None)
+
+        if len(export_instance_paths) == 0:
+            logger.info(f"All studies already exported to {dest_name} for patient: {patient_id}")
+            return []
+
+        # Split into work items per study, file paths: <patient_dir>/<study_uid>/<series_uid>/<instance_uid>.dcm
+        study_file_paths: dict[str, list[str]] = {}
+        for file_path in export_instance_paths.values():
+            study_file_paths.setdefault(Path(file_path).parent.parent.name, []).append(file_path)
+
+        max_files = max(export_settings.export_work_item_max_files, 1)
+        work_items = [
+            study_paths[i : i + max_files]
+            for study_paths in study_file_paths.values()
+            for i in range(0, len(study_paths), max_files)
+        ]
+        logger.info(
+            f"Export {len(export_instance_paths)} files of {patient_id} in {len(work_items)} work items to {dest_name}"
+        )
+        return work_items
+
+    def _export_aborted(self) -> bool:
+        return self._abort_export
+
+    def _export_files(
+        self, dest_name: str, patient_id: str, file_paths: list[str], progress: _PatientExportProgress
+    ) -> None:
+        """
+        Blocking: Export anonymized DICOM files of a patient to the specified destination (DICOM server or AWS S3 bucket).
+        Sending is throttled to the destination's bandwidth limit, see set_export_bandwidth_limits().
+        Uncompressed files are losslessly transcoded ahead of the send if enabled, see _get_export_transcoder().
+        Files confirmed sent are recorded in the export manifest.
+
+        Args:
+            dest_name (str): The name of the destination.
+            patient_id (str): The anonymized Patient ID.
+            file_paths (list[str]): The paths of the DICOM files to export.
+            progress (_PatientExportProgress): The progress of the patient's export, updated for each file sent.
+
+        Raises:
+            Any exception raised connecting or sending to the destination, returns without exception if export aborted.
+        """
+        export_association: Association | None = None
+        sent_instance_uids: list[str] = []  # recorded in export manifest
+        transcoder = self._get_export_transcoder()
+        transcode_results: list[TranscodeResult] = []
+        try:
+            if dest_name == AWS_EXPORT_DEST:
                 s3 = self.AWS_authenticate()  # Raise AuthenticationError on error
                 if not s3 or self._aws_user_directory is None:
                     raise ValueError("AWS Cognito authentication failed")
 
-                for dicom_file_path in export_instance_paths.values():
-                    time.sleep(self._export_file_time_slice_interval)
-                    if self._abort_export:
-                        logger.error(f"_export_patient patient_id: {patient_id} aborted")
-                        return
+                # Transfer threads report byte level progress, throttled to the AWS bandwidth limit:
+                def on_progress(bytes_transferred: int) -> None:
+                    self._export_bandwidth.throttle(AWS_EXPORT_DEST, bytes_transferred, self._export_aborted)
+                    progress.add_bytes(bytes_transferred)
+
+                if self._abort_export:
+                    logger.error(f"_export_files patient_id: {patient_id} aborted")
+                    return
+
+                # Files are uploaded concurrently, so the work item's files are transcoded in parallel before upload:
+                with (
+                    transcoder.transcode_all(file_paths)
+                    if transcoder
+                    else nullcontext([TranscodeResult(path, path, False, 0, 0) for path in file_paths])
+                ) as results:
+                    transcode_results += results
+                    results_by_send_path = {result.send_path: result for result in results}
+
+                    def on_file_uploaded(send_path: str) -> None:
+                        result = results_by_send_path[send_path]
+                        sent_instance_uids.append(Path(result.src_path).stem)
+                        progress.file_sent(result.original_size - result.send_size)
+
+                    uploads = [
+                        (
+                            result.send_path,
+                            Path(
+                                self.model.aws_cognito.s3_prefix,
+                                self._aws_user_directory,
+                                self.model.project_name,
+                                Path(result.src_path).relative_to(self.model.images_dir()),
+                            ).as_posix(),
+                        )
+                        for result in results
+                    ]
+
+                    logger.info(f"Upload {len(uploads)} files to S3 for patient: {patient_id}")
+                    try:
+                        # Concurrent (multipart) uploads via TransferManager shared by all patient export threads:
+                        self._get_s3_export_engine().upload_files(
+                            s3, self.model.aws_cognito.s3_bucket, uploads, on_progress, on_file_uploaded
+                        )
+                    except CancelledError:
+                        if self._abort_export:
+                            logger.error(f"_export_files patient_id: {patient_id} aborted")
+                            return
+                        raise
+
+            elif self.model.export_settings.multi_context_association:  # DICOM Export, multi-context association:
+                # Scan headers of all files to be sent & negotiate all required presentation contexts up front,
+                # files are sent with their stored transfer syntax unless transcoding is enabled and
+                # the destination accepts the transcode transfer syntax for the file's storage class
+                transcode_syntax = transcoder.transfer_syntax if transcoder else None
+                for contexts, group_file_paths in self._group_files_by_presentation_contexts(
+                    file_paths, transcode_syntax
+                ):
+                    export_association = self._connect_to_scp(dest_name, contexts)
+
+                    if transcoder:
+                        accepted = {
+                            (cx.abstract_syntax, cx.transfer_syntax[0]) for cx in export_association.accepted_contexts
+                        }
+                        results = transcoder.transcode(
+                            group_file_paths,
+                            lambda sop_class_uid, accepted=accepted: (sop_class_uid, transcode_syntax) in accepted,
+                        )
+                    else:
+                        results = (TranscodeResult(path, path, False, 0, 0) for path in group_file_paths)
 
-                    logger.info(f"Upload to S3: {dicom_file_path}")
+                    with closing(results):  # deletes transcoded files not yet sent on error or abort
+                        for result in results:
+                            time.sleep(self._export_file_time_slice_interval)
+                            self._export_bandwidth.throttle(
+                                dest_name, os.path.getsize(result.send_path), self._export_aborted
+                            )
+                            if self._abort_export:
+                                logger.error(f"_export_files patient_id: {patient_id} aborted")
+                                export_association.abort()
+                                export_association = None
+                                return
 
-                    object_key = Path(
-                        self.model.aws_cognito.s3_prefix,
-                        self._aws_user_directory,
-                        self.model.project_name,
-                        Path(dicom_file_path).relative_to(self.model.images_dir()),
-                    ).as_posix()
+                            # Sent from file, streamed without decoding if chunked_send enabled:
+                            dcm_response: Dataset = export_association.send_c_store(dataset=result.send_path)
 
-                    # TODO: use multi-part upload_part method for large files
-                    # which can be aborted via s3.abort_multipart_upload
-                    # or use thread for s3.upload_file and use callback of transferred bytes
-                    s3.upload_file(dicom_file_path, self.model.aws_cognito.s3_bucket, object_key)
-                    logger.info(f"Uploaded to S3: {object_key}")
+                            if not hasattr(dcm_response, "Status"):
+                                raise TimeoutError("send_c_store timeout")
 
-                    files_sent += 1
-                    ux_Q.put(ExportPatientsResponse(patient_id, files_sent, None, False))
+                            if dcm_response.Status != 0:
+                                raise DICOMRuntimeError(f"{STORAGE_SERVICE_CLASS_STATUS[dcm_response.Status][1]}")
+
+                            sent_instance_uids.append(Path(result.src_path).stem)
+                            transcode_results.append(result)
+                            progress.file_sent(result.original_size - result.send_size)
+
+                    export_association.release()
+                    export_association = None
 
             else:  # DICOM Export:
                 # Connect to remote SCP and establish association based on the storage class and transfer syntax of file
-                # Always export using the same storage class and transfer syntax as the original file
-                # TODO: Implement Transcoding here
+                # Always export using the same storage class and transfer syntax as the original file,
+                # transcoding requires the multi-context association to propose the transcode transfer syntax
                 last_sop_class_uid = None
                 last_transfer_synax = None
-                for dicom_file_path in export_instance_paths.values():
+                for dicom_file_path in file_paths:
                     time.sleep(self._export_file_time_slice_interval)
+                    self._export_bandwidth.throttle(dest_name, os.path.getsize(dicom_file_path), self._export_aborted)
                     if self._abort_export:
-                        logger.error(f"_export_patient patient_id: {patient_id} aborted")
+                        logger.error(f"_export_files patient_id: {patient_id} aborted")
                         if export_association:
                             export_association.abort()
                         return
 
-                    # Load dataset from file:
-                    ds = dcmread(os.fspath(dicom_file_path))
-                    if not hasattr(ds, "SOPClassUID") or not hasattr(ds, "file_meta"):
-                        raise ValueError(f"Invalid DICOM file: {dicom_file_path}")
+                    # Read header only from file:
+                    sop_class_uid, transfer_syntax = self._read_file_header(dicom_file_path)
                     # Establish a new association if there is a change of SOPClassUID or TransferSyntaxUID:
-                    if last_sop_class_uid != ds.SOPClassUID or last_transfer_synax != ds.file_meta.TransferSyntaxUID:
+                    if last_sop_class_uid != sop_class_uid or last_transfer_synax != transfer_syntax:
                         logger.info(
-                            f"Connect to SCP: {dest_name} for SOPClassUID: {ds.SOPClassUID}, TransferSyntaxUID: {ds.file_meta.TransferSyntaxUID}"
+                            f"Connect to SCP: {dest_name} for SOPClassUID: {sop_class_uid}, TransferSyntaxUID: {transfer_syntax}"
                         )
                         if export_association:
                             export_association = export_association.release()
-                        send_context = build_context(ds.SOPClassUID, ds.file_meta.TransferSyntaxUID)
+                        send_context = build_context(sop_class_uid, transfer_syntax)
                         export_association = self._connect_to_scp(dest_name, [send_context])
-                        last_sop_class_uid = ds.SOPClassUID
-                        last_transfer_synax = ds.file_meta.TransferSyntaxUID
+                        last_sop_class_uid = sop_class_uid
+                        last_transfer_synax = transfer_syntax
 
                     if export_association:
-                        dcm_response: Dataset = export_association.send_c_store(dataset=ds)
+                        # Sent from file, streamed without decoding if chunked_send enabled:
+                        dcm_response: Dataset = export_association.send_c_store(dataset=dicom_file_path)
                     else:
                         logging.error(
                             "Internal error, _connect_to_scp did not establish association and did not raise corrresponding exception"
@@ -2366,22 +3601,46 @@ class ProjectController(AE):
                     if dcm_response.Status != 0:
                         raise DICOMRuntimeError(f"{STORAGE_SERVICE_CLASS_STATUS[dcm_response.Status][1]}")
 
-                    files_sent += 1
-                    ux_Q.put(ExportPatientsResponse(patient_id, files_sent, None, False))
-
-            # Successful export:
-            ux_Q.put(ExportPatientsResponse(patient_id, files_sent, None, True))
-
-        except Exception as e:
-            if not self._abort_export:
-                logger.error(f"Export Patient {patient_id} Error: {e}")
-            ux_Q.put(ExportPatientsResponse(patient_id, files_sent, f"{e}", True))
+                    sent_instance_uids.append(Path(dicom_file_path).stem)
+                    progress.file_sent()
 
         finally:
             if export_association:
                 export_association.release()
+            if transcoder and transcode_results:
+                transcoded = [result for result in transcode_results if result.transcoded]
+                logger.info(
+                    f"Patient {patient_id}: transcoded {len(transcoded)}/{len(transcode_results)} files to "
+                    f"{self.model.export_settings.transcode}, "
+                    f"{sum(result.original_size for result in transcoded)} => "
+                    f"{sum(result.send_size for result in transcoded)} bytes"
+                )
+            if sent_instance_uids and self.model.export_settings.export_manifest:
+                self.anonymizer.model.add_exported_instances(
+                    self._export_destination_key(dest_name), patient_id, sent_instance_uids
+                )
 
-        return
+    def _export_work_item(self, dest_name: str, file_paths: list[str], progress: _PatientExportProgress) -> None:
+        """
+        Blocking: Export worker task, export the files of one work item of a patient's export.
+        Work items of a patient which has already failed are skipped.
+        Any exceptions & errors are reflected via the error field of the patient's ExportPatientsResponse.
+        """
+        if self._abort_export:
+            return
+        error = progress.error
+        transient = False
+        if not error:
+            try:
+                self._export_files(dest_name, progress.patient_id, file_paths, progress)
+            except Exception as e:
+                if not self._abort_export:
+                    logger.error(f"Export Patient {progress.patient_id} Error: {e}")
+                error = f"{e}"
+                transient = self._transient_export_error(e)
+        if self._abort_export:
+            return
+        progress.item_done(error, transient)
 
     def bulk_export_active(self) -> bool:
         """
@@ -2390,11 +3649,18 @@ class ProjectController(AE):
         Returns:
             bool: True if bulk export is active, False otherwise.
         """
-        return self._export_futures is not None
+        return self._export_lock.locked() or self._export_futures is not None
 
     def _manage_export(self, req: ExportPatientsRequest) -> None:
         """
-        Blocking: Manage bulk patient export using a thread pool
+        Blocking: Manage bulk patient export using a work item scheduler on a pool of export workers,
+        export to archive files (dest_name ARCHIVE_EXPORT_DEST) is handled by _manage_archive_export
+
+        Each patient's export is first planned by _plan_patient_export, which splits the files to be sent
+        into study level work items. The work items of all patients are queued on the shared pool of
+        export_settings.export_workers threads, idle workers take the next queued work item,
+        so a large patient is spread across all workers instead of holding one worker for the whole export.
+        Patients are planned as required to keep up to 2 queued or active tasks per worker.
 
         Args:
             req (ExportPatientsRequest): The export request containing destination name, patient IDs, and UX_Q.
@@ -2405,38 +3671,230 @@ class ProjectController(AE):
                     patient_ids: list[str]  # list of patient IDs to export
                     ux_Q: Queue  # queue for UX updates for the full export
 
+                The progress of each patient is reported via ux_Q,
+                any exceptions & errors are reflected via the error field of ExportPatientsResponse
+
+                @dataclass
+                class ExportPatientsResponse:
+                    patient_id: str
+                    files_sent: int  # incremented for each file sent successfully
+                    error: str | None  # error message
+                    complete: bool  # True when all work items of the patient are processed
+                    bytes_sent: int = 0  # bytes uploaded so far, updated during transfer for AWS S3 export
+                    bytes_saved: int = 0  # original size - transcoded size of files sent
+                    retry: bool = False  # transient error, patient remains in the export queue for retry
+
         Returns:
             None
         """
+        if req.dest_name == ARCHIVE_EXPORT_DEST:
+            self._export_futures = []  # bulk_export_active() while archive export active
+            try:
+                self._manage_archive_export(req)
+            finally:
+                self._export_futures = None
+            return
+
         self._export_futures = []
+        export_futures = self._export_futures
+        workers = max(self.model.export_settings.export_workers, 1)
+
+        on_complete = None
+        if self.model.export_settings.export_queue:
+            # Persist the export so it is retried after a transient error or resumed after a restart:
+            if not req.queued:
+                self.anonymizer.model.enqueue_exports(req.dest_name, req.patient_ids)
+            on_complete = partial(self._export_patient_complete, req.dest_name)
 
         self._export_executor = ThreadPoolExecutor(
-            max_workers=self._patient_export_thread_pool_size,
-            thread_name_prefix="ExportPatient",
+            max_workers=workers,
+            thread_name_prefix="ExportWorker",
         )
+        logger.info(f"_manage_export {len(req.patient_ids)} patients to {req.dest_name} with {workers} workers")
 
-        with self._export_executor as executor:
-            for i in range(len(req.patient_ids)):
-                future = executor.submit(self._export_patient, req.dest_name, req.patient_ids[i], req.ux_Q)
-                self._export_futures.append(future)
+        patients_progress = {
+            patient_id: _PatientExportProgress(patient_id, req.ux_Q, self._export_progress_interval, on_complete)
+            for patient_id in req.patient_ids
+        }
+        patients_to_plan = deque(req.patient_ids)
+        # future => patient_id for planning tasks, None for work items:
+        pending: dict[Future, str | None] = {}
 
-            logger.info(f"Export Futures: {len(self._export_futures)}")
+        try:
+            with self._export_executor as executor:
+                while pending or patients_to_plan:
+                    # Plan patients as required to keep the queue of work items of all workers filled:
+                    while patients_to_plan and len(pending) < 2 * workers and not self._abort_export:
+                        patient_id = patients_to_plan.popleft()
+                        future = executor.submit(self._plan_patient_export, req.dest_name, patient_id)
+                        pending[future] = patient_id
+                        export_futures.append(future)
+
+                    if not pending:  # aborted
+                        break
 
-            # Check for exceptions in the completed futures
-            for future in self._export_futures:
-                try:
-                    # This will raise any exceptions that _export_patient might have raised.
-                    future.result()
-                except Exception as e:
-                    # Handle specific exceptions if needed
-                    if not self._abort_export:
-                        logger.error(f"Exception caught in _manage_export: {e}")
+                    done = wait(pending, return_when=FIRST_COMPLETED).done
+                    for future in done:
+                        patient_id = pending.pop(future)
+                        if patient_id is None:  # work item, progress reported by _export_work_item
+                            continue
+
+                        progress = patients_progress[patient_id]
+                        try:
+                            work_items = future.result()
+                        except CancelledError:
+                            continue
+                        except Exception as e:
+                            if not self._abort_export:
+                                logger.error(f"Export Patient {patient_id} Error: {e}")
+                                progress.complete(f"{e}", self._transient_export_error(e))
+                            continue
+
+                        if work_items is None or self._abort_export:
+                            logger.error(f"Export patient_id: {patient_id} aborted")
+                            continue
+
+                        if not work_items:
+                            progress.complete(None)
+                            continue
+
+                        progress.set_work_items(len(work_items))
+                        for work_item in work_items:
+                            future = executor.submit(self._export_work_item, req.dest_name, work_item, progress)
+                            pending[future] = None
+                            export_futures.append(future)
+
+        except RuntimeError as e:  # executor shutdown by abort_export
+            if not self._abort_export:
+                logger.error(f"Exception caught in _manage_export: {e}")
+
+        finally:
+            if self._export_futures is export_futures:
+                self._export_futures = None
+
+        if self._abort_export and on_complete:
+            # Export cancelled by user, not resumed or retried:
+            self.anonymizer.model.dequeue_exports(
+                req.dest_name,
+                [patient_id for patient_id, progress in patients_progress.items() if not progress.completed],
+            )
 
         logger.info("_manage_export complete")
 
-    def export_patients_ex(self, er: ExportPatientsRequest) -> None:
+    def _read_archive_index_header(self, file_path: str) -> dict[str, Any]:
+        """
+        Reads the header attributes recorded in the archive index from a DICOM file without reading the pixel data.
+        """
+        ds = dcmread(file_path, stop_before_pixels=True, specific_tags=INDEX_ATTRIBUTES)
+        return {attribute: str(ds.get(attribute)) for attribute in INDEX_ATTRIBUTES if ds.get(attribute) is not None}
+
+    def _manage_archive_export(self, req: ExportPatientsRequest) -> None:
+        """
+        Blocking: Export the patients' files to ZIP or tar.zst archives in export_settings.archive_dir.
+
+        The files of all patients are split in order into archive parts of at most export_settings.archive_max_size
+        bytes of file data, the parts are written concurrently by export_settings.archive_workers export workers,
+        see archive_export.write_archive_part(). A patient is complete when all parts containing its files are written.
+
+        Args:
+            req (ExportPatientsRequest): The export request with dest_name ARCHIVE_EXPORT_DEST,
+                the progress of each patient is reported via req.ux_Q as for _manage_export.
+
+        Returns:
+            None
+        """
+        settings = self.model.export_settings
+        patients_progress = {
+            patient_id: _PatientExportProgress(patient_id, req.ux_Q, self._export_progress_interval)
+            for patient_id in req.patient_ids
+        }
+
+        def fail_all(error: str) -> None:
+            logger.error(f"Archive export error: {error}")
+            for progress in patients_progress.values():
+                progress.complete(error)
+
+        if not settings.archive_dir:
+            fail_all(_("Archive export directory not set"))
+            return
+        if settings.archive_format == "tar.zst" and not zstd_available():
+            fail_all(_("Archive format tar.zst requires the zstandard package"))
+            return
+
+        # Files in order of patient, study, series, sorted for reproducible archive parts:
+        images_dir = self.model.images_dir()
+        files: list[ArchiveFile] = []
+        for patient_id in req.patient_ids:
+            patient_dir = Path(images_dir, patient_id)
+            if not patient_dir.exists():
+                patients_progress[patient_id].complete(f"Selected directory {patient_dir} does not exist")
+                continue
+            for file_path in sorted(patient_dir.rglob("*" + DICOM_FILE_SUFFIX)):
+                files.append(
+                    ArchiveFile(str(file_path), file_path.relative_to(images_dir).as_posix(), file_path.stat().st_size)
+                )
+
+        try:
+            base_name = f"{self.model.project_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            parts = plan_archive_parts(
+                files, Path(settings.archive_dir), base_name, settings.archive_format, settings.archive_max_size
+            )
+        except ValueError as e:
+            fail_all(f"{e}")
+            return
+
+        patient_parts: dict[str, int] = {}
+        for part in parts:
+            for patient_id in part.patient_ids():
+                patient_parts[patient_id] = patient_parts.get(patient_id, 0) + 1
+        for patient_id, progress in patients_progress.items():
+            if patient_id in patient_parts:
+                progress.set_work_items(patient_parts[patient_id])
+            elif Path(images_dir, patient_id).exists():
+                progress.complete(None)  # no files
+
+        workers = max(settings.archive_workers, 1)
+        logger.info(
+            f"_manage_archive_export {len(req.patient_ids)} patients, {len(files)} files "
+            f"in {len(parts)} {settings.archive_format} parts to {settings.archive_dir} with {workers} workers"
+        )
+
+        def write_part(part: ArchivePart) -> None:
+            error = None
+            try:
+                if not write_archive_part(
+                    part,
+                    len(parts),
+                    settings.archive_compression_level,
+                    settings.archive_zstd_threads,
+                    self._read_archive_index_header,
+                    self._export_aborted,
+                    lambda file: patients_progress[file.patient_id].file_sent(),
+                ):
+                    return
+            except Exception as e:
+                if self._abort_export:
+                    return
+                logger.error(f"Archive part {part.path} error: {e}")
+                error = f"{e}"
+            for patient_id in part.patient_ids():
+                patients_progress[patient_id].item_done(error)
+
+        self._export_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ArchiveExportWorker")
+        try:
+            with self._export_executor as executor:
+                for part in parts:
+                    executor.submit(write_part, part)
+        except RuntimeError as e:  # executor shutdown by abort_export
+            if not self._abort_export:
+                logger.error(f"Exception caught in _manage_archive_export: {e}")
+
+        logger.info("_manage_archive_export complete")
+
+    def export_patients_ex(self, er: ExportPatientsRequest) -> bool:
         """
         Non-blocking: Export patients based on the given ExportPatientsRequest.
+        The export is not started if another export is active, eg. an export queue retry, see bulk_export_active().
 
         Args:
             er (ExportPatientsRequest): The ExportPatientsRequest object containing the export parameters.
@@ -2448,15 +3906,147 @@ class ProjectController(AE):
                     ux_Q: Queue  # queue for UX updates for the full export
 
         Returns:
-            None
+            bool: True if the export was started, False if another export is active.
         """
+        if not self._export_lock.acquire(blocking=False):
+            logger.error("Export already active, eg. queued export retry")
+            return False
         self._abort_export = False
         threading.Thread(
-            target=self._manage_export,
+            target=self._run_export,
             name="ManageExport",
             args=(er,),
             daemon=True,  # daemon threads are abruptly stopped at shutdown
         ).start()
+        return True
+
+    def _run_export(self, er: ExportPatientsRequest) -> None:
+        # Blocking: _manage_export holding the export lock acquired by export_patients_ex:
+        try:
+            self._manage_export(er)
+        finally:
+            self._export_lock.release()
+
+    def _transient_export_error(self, e: Exception) -> bool:
+        """
+        Returns True if the export error is transient and the export should be retried:
+        network errors & timeouts connecting or sending to the DICOM destination or S3,
+        S3 throttling & server errors. Errors such as C-STORE failure status, invalid files,
+        missing storage directories and authentication failures are not retried.
+        """
+        if isinstance(e, (TimeoutError, ConnectionError, BotoConnectionError, HTTPClientError, S3UploadFailedError)):
+            return True
+        if isinstance(e, ClientError):
+            error = e.response.get("Error", {})
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+            return error.get("Code") in self._transient_S3_error_codes or status >= 500
+        return False
+
+    def _export_retry_delay(self, attempts: int) -> timedelta:
+        """
+        Returns the exponential backoff delay before the next export attempt after attempts failed attempts.
+        """
+        settings = self.model.export_settings
+        return timedelta(
+            seconds=min(settings.export_retry_backoff * 2 ** (attempts - 1), settings.export_retry_backoff_max)
+        )
+
+    def _export_patient_complete(self, dest_name: str, patient_id: str, error: str | None, transient: bool) -> bool:
+        """
+        Updates the persistent export queue when all work items of a patient's export are done.
+        The patient is removed from the queue if exported, otherwise if the error is transient the next attempt
+        is scheduled with exponential backoff until export_settings.export_retry_max_attempts is reached.
+
+        Returns:
+            bool: True if the patient's export will be retried.
+        """
+        try:
+            if error and transient and not self._abort_export:
+                attempts = self.anonymizer.model.record_export_failure(dest_name, patient_id, error)
+                if attempts and attempts < self.model.export_settings.export_retry_max_attempts:
+                    next_attempt = datetime.now() + self._export_retry_delay(attempts)
+                    self.anonymizer.model.schedule_export(dest_name, patient_id, next_attempt)
+                    logger.warning(
+                        f"Export Patient {patient_id} to {dest_name} attempt {attempts} failed, "
+                        f"retry at {next_attempt.isoformat(timespec='seconds')}: {error}"
+                    )
+                    return True
+                if attempts:
+                    logger.error(f"Export Patient {patient_id} to {dest_name} failed after {attempts} attempts")
+            self.anonymizer.model.dequeue_exports(dest_name, [patient_id])
+        except Exception as e:
+            logger.error(f"Failed to update export queue of {dest_name} for {patient_id}: {e}")
+        return False
+
+    def _process_export_queue(self) -> None:
+        """
+        Blocking: Export the patients of the persistent export queues which are due for an export attempt,
+        one destination at a time using _manage_export, holding the export lock so no user export starts meanwhile.
+        Skipped while another export is active or after the user aborted an export, until the user starts
+        the next export (export_patients_ex clears the abort).
+        Progress is reported to export_queue_ux_Q if set by the ExportView.
+        """
+        if self._abort_export or not self._export_lock.acquire(blocking=False):
+            return
+        try:
+            entries = self.anonymizer.model.get_export_queue(due_before=datetime.now())
+            patients_by_dest: dict[str, list[str]] = {}
+            for entry in entries:
+                patients_by_dest.setdefault(entry.dest_name, []).append(entry.patient_id)
+
+            for dest_name, patient_ids in patients_by_dest.items():
+                if self._export_queue_stop.is_set() or self._abort_export:
+                    return
+                if (dest_name == AWS_EXPORT_DEST and not self.model.export_to_AWS) or (
+                    dest_name != AWS_EXPORT_DEST and dest_name not in self.model.remote_scps
+                ):
+                    logger.error(f"Export queue destination: {dest_name} no longer configured, {patient_ids} removed")
+                    self.anonymizer.model.dequeue_exports(dest_name, patient_ids)
+                    continue
+
+                logger.info(f"Export queue: export {len(patient_ids)} patients to {dest_name}")
+                ux_Q = self.export_queue_ux_Q or Queue()
+                self._manage_export(ExportPatientsRequest(dest_name, patient_ids, ux_Q, queued=True))
+        finally:
+            self._export_lock.release()
+
+    def run_export_queue(self) -> None:
+        """
+        Blocking: Process the persistent export queues every _export_queue_poll_interval seconds
+        until stop_export_queue() is called, resumes exports interrupted by a restart or crash
+        and retries exports which failed with a transient error once their backoff delay has elapsed.
+        """
+        logger.info("Export queue started")
+        while not self._export_queue_stop.is_set():
+            try:
+                self._process_export_queue()
+            except Exception as e:
+                logger.error(f"Export queue error: {e}")
+            self._export_queue_stop.wait(self._export_queue_poll_interval)
+        logger.info("Export queue stopped")
+
+    def start_export_queue_ex(self) -> None:
+        """
+        Non-blocking: Start processing the persistent export queues in a background thread, see run_export_queue()
+        """
+        if not self.model.export_settings.export_queue:
+            return
+        if self._export_queue_thread and self._export_queue_thread.is_alive():
+            return
+        self._export_queue_stop.clear()
+        self._export_queue_thread = threading.Thread(
+            target=self.run_export_queue,
+            name="ExportQueue",
+            daemon=True,  # daemon threads are abruptly stopped at shutdown
+        )
+        self._export_queue_thread.start()
+
+    def stop_export_queue(self) -> None:
+        """
+        Non-blocking: Stop processing the persistent export queues, queued exports are resumed on next start.
+        An export in progress is not aborted, see abort_export().
+        """
+        self._export_queue_stop.set()
 
     def abort_export(self):
         """
@@ -2464,13 +4054,18 @@ class ProjectController(AE):
 
         This method sets a flag to indicate that the export process should be aborted.
         It also cancels any pending move futures and shuts down the export executor.
+        Export queue retries are paused until the next export is started with export_patients_ex.
 
-        Note: If the export is being done to AWS, the executor will be shut down with wait=False,
-        allowing any pending move futures to complete before shutting down.
+        Note: If the export is being done to AWS, all S3 uploads in flight are cancelled,
+        aborting incomplete multipart uploads, and the executor will be shut down with wait=False.
 
         """
         logger.info("Abort Export")
         self._abort_export = True
+        # Cancel S3 uploads in flight, incomplete multipart uploads are aborted:
+        s3_export_engine = self._s3_export_engine
+        if s3_export_engine:
+            s3_export_engine.cancel()
         # logger.info("Cancel Futures")
         # for future in self._move_futures:
         #     future.cancel()
@@ -2533,7 +4128,9 @@ class ProjectController(AE):
 
         # Remove PHI data from anonymizer model:
         if not self.anonymizer.model.remove_phi(anon_pt_id, anon_study_uid):
-            logger.error(f"Critical Error removing phi data for AnonStudyUID: {anon_study_uid} AnonPatientID: {anon_pt_id}")
+            logger.error(
+                f"Critical Error removing phi data for AnonStudyUID: {anon_study_uid} AnonPatientID: {anon_pt_id}"
+            )
             return False
 
         logger.info(f"PHI data removed for StudyUID: {anon_study_uid} PatientID: {anon_pt_id} successfully")
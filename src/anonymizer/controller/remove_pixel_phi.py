@@ -1,5 +1,8 @@
 # For Burnt-IN Pixel PHI Removal:
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
@@ -8,26 +11,35 @@ import numpy as np
 from cv2 import (
     BORDER_CONSTANT,
     CHAIN_APPROX_SIMPLE,
+    COLOR_GRAY2RGB,
     COLOR_RGB2GRAY,
     FONT_HERSHEY_SIMPLEX,
     INPAINT_TELEA,
+    INTER_AREA,
     INTER_LINEAR,
+    MORPH_CLOSE,
+    MORPH_GRADIENT,
     NORM_MINMAX,
+    RETR_EXTERNAL,
     RETR_TREE,
+    THRESH_BINARY,
     THRESH_OTSU,
+    absdiff,
+    bitwise_or,
+    boundingRect,
     copyMakeBorder,
     cvtColor,
     dilate,
     drawContours,
     findContours,
     inpaint,
+    morphologyEx,
     normalize,
     putText,
     rectangle,
     resize,
     threshold,
 )
-from easyocr import Reader
 from numpy import ndarray
 from numpy.typing import NDArray
 from openjpeg.utils import encode_array  # JPEG2000Lossless
@@ -39,7 +51,11 @@ from pydicom.pixel_data_handlers.util import (
     apply_voi_lut,
     convert_color_space,
 )
-from pydicom.uid import JPEG2000Lossless
+from pydicom.uid import UID, JPEG2000Lossless
+
+from anonymizer.controller.ocr_service import OCRReader
+from anonymizer.controller.transcode import TRANSCODE_TRANSFER_SYNTAXES, encoder_available
+from anonymizer.model.project import PixelPHIRule
 
 VALID_COLOR_SPACES = [
     "MONOCHROME1",
@@ -53,10 +69,107 @@ VALID_COLOR_SPACES = [
     "PALETTE COLOR",
 ]
 
+# Tiled OCR of frames larger than the downscale threshold, see tiled_ocr_geometry():
+TILE_SIZE_MM = 100.0  # tile edge if PixelSpacing present
+TILE_MIN_PIXEL_SPACING = 0.1  # mm per pixel, finer frames are downscaled to this resolution, at most by half
+DEFAULT_TILE_SIZE = 1024  # pixels, if PixelSpacing not present
+MIN_TILE_SIZE = 512
+MAX_TILE_SIZE = 2048
+
+# Temporal mask keyframe detection, see _frame_change():
+TEMPORAL_CHANGE_BLOCK_SIZE = 32  # pixels, edge of the regions whose mean absolute difference is compared
+TEMPORAL_CHANGE_REGION_MARGIN = 16  # pixels, around the text found on the projections, change is measured inside
+
 logging.getLogger("openjpeg").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+class TextPrefilter:
+    """
+    Fast CPU text presence pre-filter run on frames prepared for OCR, frames it rules out skip OCR.
+    Conservative: a frame is only ruled out if its morphological gradient has no candidate text region at all,
+    ie. no edges of at least min_contrast gray levels forming a region of at least min_text_size pixels.
+    Text of any size, orientation or contrast above min_contrast is never ruled out, so blank and smooth frames
+    (eg. empty cine frames) skip OCR but frames with any structure are OCR'd.
+    Thread safe, counts of checked and rejected frames are kept as metrics.
+    """
+
+    def __init__(self, min_contrast: int = 16, min_text_size: int = 6):
+        self.min_contrast = min_contrast
+        self.min_text_size = min_text_size
+        self._lock = threading.Lock()
+        self.frames_checked = 0
+        self.frames_rejected = 0
+
+    def text_likely(self, ocr_frame: NDArray[np.uint8]) -> bool:
+        gray = cvtColor(ocr_frame, COLOR_RGB2GRAY) if ocr_frame.ndim == 3 else ocr_frame
+        gradient = morphologyEx(gray, MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+        # Fixed edge threshold, a frame global threshold would drop low contrast text next to strong edges:
+        __, strokes = threshold(gradient, self.min_contrast - 1, 255, THRESH_BINARY)
+        # Join the characters of a word or line of text, horizontal or vertical:
+        words = morphologyEx(strokes, MORPH_CLOSE, np.ones((5, 5), np.uint8))
+        contours, __ = findContours(words, RETR_EXTERNAL, CHAIN_APPROX_SIMPLE)
+
+        likely = False
+        for contour in contours:
+            __, __, w, h = boundingRect(contour)
+            if max(w, h) >= self.min_text_size:
+                likely = True
+                break
+
+        with self._lock:
+            self.frames_checked += 1
+            if not likely:
+                self.frames_rejected += 1
+        return likely
+
+    def rejection_rate(self) -> float:
+        with self._lock:
+            return self.frames_rejected / self.frames_checked if self.frames_checked else 0.0
+
+
+def select_pixel_phi_rule(rules: list[PixelPHIRule], ds: Dataset) -> PixelPHIRule | None:
+    """
+    Returns the first pixel PHI rule matching the header of a dataset, None if no rule matches.
+
+    Args:
+        rules (list[PixelPHIRule]): The rules in order of precedence, see ProjectModel.pixel_phi_settings.rules
+        ds (Dataset): The source dataset.
+    """
+    modality = ds.get("Modality", "")
+    sop_class_uid = ds.get("SOPClassUID", "")
+    image_type = ds.get("ImageType", [])
+    image_type = [image_type] if isinstance(image_type, str) else list(image_type)
+    burned_in_annotation = str(ds.get("BurnedInAnnotation", "")).upper()
+    manufacturer = str(ds.get("Manufacturer", "")).lower()
+
+    for rule in rules:
+        if rule.modality and rule.modality != modality:
+            continue
+        if rule.sop_class_uid and rule.sop_class_uid != sop_class_uid:
+            continue
+        if rule.image_type and rule.image_type not in image_type:
+            continue
+        if rule.burned_in_annotation and rule.burned_in_annotation.upper() != burned_in_annotation:
+            continue
+        if rule.manufacturer and rule.manufacturer.lower() not in manufacturer:
+            continue
+        return rule
+    return None
+
+
+def split_thread_budget(cpu_threads: int, ways: int) -> int:
+    """
+    Returns the CPU threads for each of ways concurrent users of a total CPU thread budget, at least 1.
+
+    Args:
+        cpu_threads (int): The total CPU thread budget, 0 = number of CPUs.
+        ways (int): The number of concurrent users of the budget.
+    """
+    total = cpu_threads if cpu_threads > 0 else (os.cpu_count() or 1)
+    return max(1, total // max(ways, 1))
+
+
 @dataclass()  # Mutable, user can edit box in ImageViewer
 class OCRText:
     text: str
@@ -176,7 +289,7 @@ def _has_voi_lut(ds: Dataset) -> bool:
 
 
 def detect_text(
-    pixels: NDArray[np.uint8], ocr_reader: Reader, draw_boxes_and_text: bool = False
+    pixels: NDArray[np.uint8], ocr_reader: OCRReader, draw_boxes_and_text: bool = False
 ) -> list[OCRText] | None:
     """
     Detect Text in pixels 2D frame, if present and indicated, draw bounding box and text in green
@@ -310,48 +423,492 @@ def blackout_rectangular_areas(pixels: ndarray, user_rects: list[UserRectangle])
             continue  # Skip to the next rectangle
 
 
+def _prepare_ocr_frame(
+    pixels: ndarray,
+    ds: Dataset,
+    grayscale: bool,
+    pi: str,
+    scale_factor: float,
+    border_size: int,
+) -> NDArray[np.uint8]:
+    """
+    Returns a copy of a source frame prepared for OCR: windowed, normalized to 8 bit MONOCHROME2 or RGB,
+    downscaled by scale_factor (if < 1) and bordered with border_size black pixels.
+    """
+    if grayscale:
+        # Apply any modality LUT then VOI LUT & Windowing indicated by metadata:
+        # do this here, on every frame to avoid potential memory issues for large number of frames:
+        pixels = apply_voi_lut(apply_modality_lut(pixels, ds), ds)
+
+    # Normalize the pixel array to the range 0-255
+    pixels = normalize(
+        src=pixels,
+        dst=None,
+        alpha=0,
+        beta=255,
+        norm_type=NORM_MINMAX,
+        dtype=-1,
+        mask=None,
+    ).astype(np.uint8)
+
+    if pi == "MONOCHROME1":  # 0 = white
+        pixels = np.invert(pixels)
+
+    # DOWNSCALE if necessary:
+    if scale_factor < 1:
+        rows, cols = pixels.shape[:2]
+        new_size = (int(cols * scale_factor), int(rows * scale_factor))
+        pixels = resize(pixels, new_size, interpolation=INTER_LINEAR)
+
+    # Add a border to the resized image
+    return copyMakeBorder(
+        pixels,
+        border_size,
+        border_size,
+        border_size,
+        border_size,
+        BORDER_CONSTANT,
+        value=[0, 0, 0],  # Black border
+    )
+
+
+def _detect_text_boxes(ocr_reader: OCRReader, ocr_frames: list[NDArray[np.uint8]]) -> list[list]:
+    """
+    Run text detection only, without recognition, on a list of frames of the same dimensions as one batch.
+
+    Returns:
+        list[list]: The detected text boxes of each frame in easyocr readtext result format with empty text.
+    """
+    rgb_frames = np.stack([cvtColor(frame, COLOR_GRAY2RGB) if frame.ndim == 2 else frame for frame in ocr_frames])
+    horizontal_lists, free_lists = ocr_reader.detect(rgb_frames, reformat=False)
+    results = []
+    for horizontal_list, free_list in zip(horizontal_lists, free_lists, strict=True):
+        boxes = [
+            [[x_min, y_min], [x_max, y_min], [x_max, y_max], [x_min, y_max]]
+            for x_min, x_max, y_min, y_max in horizontal_list
+        ]
+        results.append([(box, "", 1.0) for box in boxes + free_list])
+    return results
+
+
+def _run_ocr(
+    ocr_reader: OCRReader,
+    ocr_frames: list[NDArray[np.uint8]],
+    batch_size: int,
+    detect_only: bool = False,
+) -> list[list]:
+    """
+    Run OCR on a list of frames of the same dimensions, as one batch if batch_size > 1.
+
+    Returns:
+        list[list]: The easyocr readtext results of each frame, in order of ocr_frames.
+    """
+    if detect_only:
+        return _detect_text_boxes(ocr_reader, ocr_frames)
+    if batch_size > 1 and len(ocr_frames) > 1:
+        # Text detection runs on the stacked frames, recognition on batches of batch_size text boxes:
+        return ocr_reader.readtext_batched(ocr_frames, batch_size=batch_size)
+    return [ocr_reader.readtext(ocr_frame) for ocr_frame in ocr_frames]
+
+
+def _ocr_results_to_mask(
+    results: list,
+    ocr_frame: NDArray[np.uint8],
+    rows: int,
+    cols: int,
+    scale_factor: float,
+    border_size: int,
+) -> NDArray[np.uint8] | None:
+    """
+    Returns the dilated inpainting mask at source frame resolution of the text detected in a prepared OCR frame,
+    None if no text was detected.
+    """
+    if not results:
+        return None
+
+    # Create an 8 bit mask of pixels for in-painting
+    mask = np.zeros(ocr_frame.shape[:2], dtype=np.uint8)
+
+    # Draw bounding boxes around each detected word
+    for bbox, __, __ in results:
+        # Unpack the bounding box
+        (top_left, top_right, bottom_right, bottom_left) = bbox
+
+        top_left = tuple(map(int, top_left))
+        bottom_right = tuple(map(int, bottom_right))
+
+        # Perform full anonymization, remove all detected text from image:
+        _draw_text_contours_on_mask(ocr_frame, top_left, bottom_right, mask)
+
+    # Remove border from mask
+    mask = mask[border_size:-border_size, border_size : mask.shape[1] - border_size]
+
+    # Upscale mask if downscaling was applied to source image:
+    if scale_factor < 1:
+        mask = resize(src=mask, dsize=(cols, rows), interpolation=INTER_LINEAR)
+
+    kernel = np.ones((3, 3), np.uint8)
+    return dilate(src=mask, kernel=kernel, iterations=1)
+
+
+def _frame_change(ocr_frame: NDArray[np.uint8], keyframe: NDArray[np.uint8]) -> float:
+    """
+    Returns the change of a frame from a keyframe: the largest mean absolute difference (0-255) of any
+    TEMPORAL_CHANGE_BLOCK_SIZE region, so a small changing overlay is not averaged away over the whole frame.
+    """
+    diff = absdiff(ocr_frame, keyframe)
+    rows, cols = diff.shape[:2]
+    block_means = resize(
+        diff,
+        (max(cols // TEMPORAL_CHANGE_BLOCK_SIZE, 1), max(rows // TEMPORAL_CHANGE_BLOCK_SIZE, 1)),
+        interpolation=INTER_AREA,
+    )
+    return float(np.max(block_means))
+
+
+def _text_regions(results: list, shape: tuple[int, ...], margin: int) -> list[tuple[slice, slice]]:
+    """
+    Returns the (rows, cols) slices of the bounding rectangles of the OCR results expanded by margin pixels,
+    clipped to an OCR frame of the given shape.
+    """
+    regions = []
+    for bbox, __, __ in results:
+        xs = [int(point[0]) for point in bbox]
+        ys = [int(point[1]) for point in bbox]
+        y_min, y_max = max(min(ys) - margin, 0), min(max(ys) + margin, shape[0])
+        x_min, x_max = max(min(xs) - margin, 0), min(max(xs) + margin, shape[1])
+        if y_min < y_max and x_min < x_max:
+            regions.append((slice(y_min, y_max), slice(x_min, x_max)))
+    return regions
+
+
+def _temporal_ocr_mask(
+    ocr_reader: OCRReader,
+    pixels_stack,
+    ds: Dataset,
+    grayscale: bool,
+    pi: str,
+    rows: int,
+    cols: int,
+    scale_factor: float,
+    border_size: int,
+    batch_size: int,
+    detect_only: bool,
+    change_threshold: float,
+    text_prefilter: TextPrefilter | None = None,
+) -> tuple[NDArray[np.uint8] | None, int]:
+    """
+    Returns one inpainting mask for all frames of a multi-frame instance, for cine overlays at fixed positions.
+    OCR runs first on the max & min projections of the frames, which hold bright & dark text present in any frame.
+    Change of the frames is then only measured in the regions of the text found on the projections, expanded by
+    TEMPORAL_CHANGE_REGION_MARGIN, so moving anatomy elsewhere in the frame (eg. cine) does not trigger OCR.
+    OCR also runs on the keyframes: the first frame and every frame with a text region changed from the previous
+    keyframe by a mean absolute difference > change_threshold (0-255), see _frame_change(),
+    the masks of the projections and keyframes are merged. Frames ruled out by the text_prefilter are not OCR'd.
+    Frames are prepared for OCR twice, once per pass, to avoid holding all prepared frames in memory.
+
+    Returns:
+        tuple[NDArray[np.uint8] | None, int]: The merged mask, None if no text was detected, and the number of keyframes.
+    """
+    mask: NDArray[np.uint8] | None = None
+    projection: NDArray[np.uint8] | None = None
+    min_projection: NDArray[np.uint8] | None = None
+    last_keyframe: NDArray[np.uint8] | None = None
+    keyframes = 0
+    pending: list[NDArray[np.uint8]] = []
+    regions: list[tuple[slice, slice]] = []
+
+    def ocr_pending() -> list[list]:
+        nonlocal mask
+        if text_prefilter:
+            pending[:] = [ocr_frame for ocr_frame in pending if text_prefilter.text_likely(ocr_frame)]
+        if not pending:
+            return []
+        all_results = _run_ocr(ocr_reader, pending, batch_size, detect_only)
+        for ocr_frame, results in zip(pending, all_results, strict=True):
+            frame_mask = _ocr_results_to_mask(results, ocr_frame, rows, cols, scale_factor, border_size)
+            if frame_mask is not None:
+                mask = frame_mask if mask is None else bitwise_or(mask, frame_mask)
+        pending.clear()
+        return all_results
+
+    def prepared_frames():
+        for frame in range(len(pixels_stack)):
+            yield _prepare_ocr_frame(pixels_stack[frame], ds, grayscale, pi, scale_factor, border_size)
+
+    # Pass 1, projections:
+    for ocr_frame in prepared_frames():
+        projection = ocr_frame.copy() if projection is None else np.maximum(projection, ocr_frame, out=projection)
+        min_projection = (
+            ocr_frame.copy() if min_projection is None else np.minimum(min_projection, ocr_frame, out=min_projection)
+        )
+    if projection is None or min_projection is None:
+        return mask, keyframes
+    pending.extend([projection, min_projection])
+    for results in ocr_pending():
+        regions += _text_regions(results, projection.shape, TEMPORAL_CHANGE_REGION_MARGIN)
+
+    # Pass 2, keyframes:
+    for ocr_frame in prepared_frames():
+        if last_keyframe is None or any(
+            _frame_change(ocr_frame[region], last_keyframe[region]) > change_threshold for region in regions
+        ):
+            keyframes += 1
+            last_keyframe = ocr_frame
+            pending.append(ocr_frame)
+            if len(pending) >= batch_size:
+                ocr_pending()
+    ocr_pending()
+    return mask, keyframes
+
+
+def tiled_ocr_geometry(pixel_spacing: list | None, tile_size: int = 0) -> tuple[int, int, float]:
+    """
+    Returns the geometry of tiled OCR of a large frame: (tile size, tile overlap) in pixels of the OCR frame & scale factor.
+    With PixelSpacing, frames finer than TILE_MIN_PIXEL_SPACING are moderately downscaled (at most by half) and
+    tiles cover TILE_SIZE_MM, otherwise frames are tiled at native resolution in DEFAULT_TILE_SIZE tiles.
+    Tiles overlap by 1/8 of the tile size so text cut by one tile is whole in the next.
+
+    Args:
+        pixel_spacing (list | None): PixelSpacing (row, column spacing in mm) of the frame.
+        tile_size (int): Tile size in pixels of the OCR frame, 0 = from pixel_spacing, clamped to MIN & MAX_TILE_SIZE.
+    """
+    scale_factor = 1.0
+    spacing = min((float(value) for value in pixel_spacing), default=0.0) if pixel_spacing else 0.0
+    if spacing > 0:
+        scale_factor = min(1.0, max(0.5, spacing / TILE_MIN_PIXEL_SPACING))
+        if not tile_size:
+            tile_size = round(TILE_SIZE_MM / spacing * scale_factor)
+    tile_size = min(max(tile_size or DEFAULT_TILE_SIZE, MIN_TILE_SIZE), MAX_TILE_SIZE)
+    return tile_size, tile_size // 8, scale_factor
+
+
+def _tile_origins(length: int, tile_size: int, overlap: int) -> list[int]:
+    # Origins of overlapping tiles covering length, the last tile ends at length:
+    if length <= tile_size:
+        return [0]
+    origins = list(range(0, length - tile_size, tile_size - overlap))
+    return origins + [length - tile_size]
+
+
+def _merge_tile_results(results: list) -> list:
+    """
+    Returns the OCR results of the tiles of a frame without the duplicate boxes of text detected in overlapping tiles:
+    boxes mostly (>= 90%) inside a larger box are dropped.
+    """
+
+    def bounds(result) -> tuple[float, float, float, float]:
+        points = np.asarray(result[0], dtype=np.float32)
+        return points[:, 0].min(), points[:, 1].min(), points[:, 0].max(), points[:, 1].max()
+
+    merged: list = []
+    merged_bounds: list[tuple[float, float, float, float]] = []
+    for result in sorted(results, key=lambda result: -np.prod(np.ptp(np.asarray(result[0]), axis=0))):
+        x1, y1, x2, y2 = bounds(result)
+        area = max((x2 - x1) * (y2 - y1), 1)
+        duplicate = any(
+            max(0, min(x2, u2) - max(x1, u1)) * max(0, min(y2, v2) - max(y1, v1)) / area >= 0.9
+            for u1, v1, u2, v2 in merged_bounds
+        )
+        if not duplicate:
+            merged.append(result)
+            merged_bounds.append((x1, y1, x2, y2))
+    return merged
+
+
+def _tiled_ocr(
+    ocr_reader: OCRReader,
+    ocr_frame: NDArray[np.uint8],
+    tile_size: int,
+    overlap: int,
+    batch_size: int,
+    detect_only: bool,
+    text_prefilter: TextPrefilter | None,
+    threads: int,
+) -> list:
+    """
+    Run OCR on overlapping tiles of a large prepared OCR frame: tiles are OCR'd in batches of batch_size tiles,
+    batches run in parallel on up to threads threads, tiles ruled out by the text_prefilter are not OCR'd.
+
+    Returns:
+        list: The merged easyocr readtext results of the tiles in frame coordinates.
+    """
+    rows, cols = ocr_frame.shape[:2]
+    tiles: list[NDArray[np.uint8]] = []
+    origins: list[tuple[int, int]] = []
+    for y in _tile_origins(rows, tile_size, overlap):
+        for x in _tile_origins(cols, tile_size, overlap):
+            tile = ocr_frame[y : y + tile_size, x : x + tile_size]
+            if text_prefilter and not text_prefilter.text_likely(tile):
+                continue
+            if tile.shape[:2] != (tile_size, tile_size):
+                # Pad tiles of frames smaller than the tile size, all tiles of a batch have the same dimensions:
+                bottom, right = tile_size - tile.shape[0], tile_size - tile.shape[1]
+                tile = copyMakeBorder(tile, 0, bottom, 0, right, BORDER_CONSTANT, value=[0, 0, 0])
+            tiles.append(tile)
+            origins.append((x, y))
+
+    logger.debug(f"Tiled OCR of {len(tiles)} tiles of {tile_size} pixels, frame {ocr_frame.shape}")
+    if not tiles:
+        return []
+
+    batch_size = max(batch_size, 1)
+    batches = [tiles[start : start + batch_size] for start in range(0, len(tiles), batch_size)]
+    with ThreadPoolExecutor(max_workers=max(min(threads, len(batches)), 1), thread_name_prefix="TiledOCR") as executor:
+        tile_results = [
+            results
+            for batch_results in executor.map(
+                lambda batch: _run_ocr(ocr_reader, batch, batch_size, detect_only), batches
+            )
+            for results in batch_results
+        ]
+
+    frame_results = [
+        ([[px + x, py + y] for px, py in bbox], text, confidence)
+        for (x, y), results in zip(origins, tile_results, strict=True)
+        for bbox, text, confidence in results
+    ]
+    return _merge_tile_results(frame_results)
+
+
+def _inpaint_frame(frame_pixels: ndarray, mask: NDArray[np.uint8], bits_allocated: int, pixel_representation: int):
+    """
+    Returns the source frame inpainted using the mask and cv2.inpaint with radius = 5 & INPAINT_TELEA (Poisson PDE)
+    """
+    if bits_allocated == 16 and pixel_representation == 1:
+        # Inpaint function only supports 8-bit, 16-bit UNSIGNED or 32-bit float 1-channel and 8-bit 3-channel input/output images
+        # Mask must be 8-bit, 1 channel
+        # Up Shift and Convert to UNSIGNED 16 bit:
+        frame_pixels = (frame_pixels.astype(np.int32) + 32768).astype(np.uint16)
+        source_pixels_deid = inpaint(
+            src=frame_pixels,
+            inpaintMask=mask,
+            inpaintRadius=5,
+            flags=INPAINT_TELEA,
+        )
+        # Downshift and convert back to SIGNED 16 bit:
+        return (source_pixels_deid.astype(np.int32) - 32768).astype(np.int16)
+
+    return inpaint(
+        src=frame_pixels,
+        inpaintMask=mask,
+        inpaintRadius=5,
+        flags=INPAINT_TELEA,
+    )
+
+
+def _reencode_transfer_syntax(reencode: str) -> UID:
+    """
+    Returns the Transfer Syntax UID for re-compression of a de-identified compressed instance,
+    JPEG2000Lossless (openjpeg) if reencode is not one of TRANSCODE_TRANSFER_SYNTAXES or has no encoder available.
+    """
+    transfer_syntax = TRANSCODE_TRANSFER_SYNTAXES.get(reencode)
+    if transfer_syntax is None:
+        logger.warning(f"Invalid re-compression setting: {reencode}, use JPEG2000Lossless")
+        return JPEG2000Lossless
+    if transfer_syntax != JPEG2000Lossless and not encoder_available(transfer_syntax):
+        logger.warning(f"No encoder for {reencode} re-compression, use JPEG2000Lossless")
+        return JPEG2000Lossless
+    return transfer_syntax
+
+
+def _encode_frames(frames: list[ndarray], transfer_syntax: UID, ds: Dataset, grayscale: bool, threads: int) -> list:
+    """
+    Encode de-identified frames to the lossless transfer syntax, frames encoded in parallel on up to threads threads,
+    the encoders release the GIL.
+
+    Returns:
+        list[bytes]: The encoded frames, in order of frames.
+    """
+    if transfer_syntax == JPEG2000Lossless:
+
+        def encode(frame: ndarray) -> bytes:
+            return encode_array(arr=frame, photometric_interpretation=2 if grayscale else 1, use_mct=False)
+
+    else:
+        from pydicom.encoders import get_encoder
+
+        encoder = get_encoder(transfer_syntax)
+        frame_attributes = {
+            "rows": ds.Rows,
+            "columns": ds.Columns,
+            "samples_per_pixel": 1 if grayscale else 3,
+            "bits_allocated": ds.BitsAllocated,
+            "bits_stored": ds.BitsStored,
+            "pixel_representation": ds.PixelRepresentation,
+            "photometric_interpretation": ds.PhotometricInterpretation if grayscale else "RGB",
+            "number_of_frames": 1,
+        }
+
+        def encode(frame: ndarray) -> bytes:
+            return encoder.encode(frame, **frame_attributes)
+
+    if threads <= 1 or len(frames) == 1:
+        return [encode(frame) for frame in frames]
+    with ThreadPoolExecutor(max_workers=min(threads, len(frames)), thread_name_prefix="PixelPHIEncode") as executor:
+        return list(executor.map(encode, frames))
+
+
 # TODO: split this process up into sub-alogirthms for pluggable functional pipeline:
 # [pixel attribute validation > apply LUT > normalize > add border > downscaling > OCR > upscaling > inpainting > compression]
 # TODO: make source file immutable & keep source file? add backup parameter?
-def remove_pixel_phi(
-    dcm_path: Path,
-    ocr_reader: Reader,
+def remove_pixel_phi_from_dataset(
+    ds: Dataset,
+    ocr_reader: OCRReader | None,
     downscale_dimension_threshold: int = 800,
     border_size: int = 20,
+    ocr_batch_size: int = 1,
+    detect_only: bool = False,
+    blackout_areas: list[UserRectangle] | None = None,
+    temporal_mask: bool = False,
+    temporal_change_threshold: float = 8.0,
+    text_prefilter: TextPrefilter | None = None,
+    reencode: str = "JPEG2000",
+    reencode_threads: int = 1,
+    tiled_ocr: bool = False,
+    tile_size: int = 0,
+    tile_threads: int = 1,
 ) -> bool:
     """
     Description:
-        Removes the PHI in the pixel data of a DICOM file with 1...N frames
+        Removes the PHI in the pixel data of a DICOM dataset with 1...N frames in memory
         If the incoming pixel array was compressed, burnt-in annotation is detected and pixel_array modified
-        then the pixel_array is re-compressed with JPG2000Lossless compression and the ds transfer syntax changed accordingly
+        then the pixel_array is re-compressed with the reencode lossless compression and the ds transfer syntax changed accordingly
 
     Args:
-         dcm_path (Path): path to source DICOM file [*Mutable*]
-         ocr_reader (easyOCR.Reader): initialised OCR Reader object from easyocr
+         ds (Dataset): decoded source DICOM dataset with file_meta [*Mutable*]
+         ocr_reader (OCRReader | None): initialised OCR Reader object from easyocr, ONNXOCRReader or the OCR service,
+            None = no OCR, only blackout_areas are removed
          downscale_dimension_threshold:
             if either dimension (rows or cols) of pixel frame is larger than this threshold
             the image will be downscaled to decrease OCR speed
          border_size: size in pixels added to the pixel frame to enable text detection at the edges
+         ocr_batch_size: number of frames of a multi-frame instance prepared & run through OCR as one batch,
+            1 = OCR frame by frame
+         detect_only: run text detection only without recognition, all detected text areas are removed
+         blackout_areas: fixed areas of every frame set to black (eg. from a template for the device), no inpainting
+         temporal_mask: for multi-frame instances, OCR the max & min projections & keyframes of the frames only
+            and inpaint all frames with one merged mask, see _temporal_ocr_mask
+         temporal_change_threshold: mean absolute difference (0-255) of a text region from the last keyframe which makes a frame a keyframe
+         text_prefilter: if given, frames it rules out as containing no text skip OCR
+         reencode: lossless re-compression of compressed instances, one of TRANSCODE_TRANSFER_SYNTAXES,
+            falls back to JPEG2000 if no encoder is available for it or encoding fails
+         reencode_threads: number of frames of a multi-frame instance re-compressed in parallel
+         tiled_ocr: frames larger than downscale_dimension_threshold are OCR'd in overlapping tiles at native or
+            moderately reduced resolution instead of being downscaled, see tiled_ocr_geometry,
+            multi-frame instances with temporal_mask use the temporal mask
+         tile_size: tile size in pixels, 0 = from PixelSpacing
+         tile_threads: number of batches of tiles OCR'd in parallel
 
     Returns:
-        If text is detected and file modified with text removed, return True
-        If no text is detected, file is not modified, return False
+        If text is detected or blackout_areas given and dataset modified with text removed, return True
+        If no text is detected, dataset is not modified, return False
 
     Raises:
-        InvalidDicomError: if dcm_path not a valid DICOM file
-        TypeError: if dcm_path is none or unsupported type
-        ValueError:
-            If any essential pixel attribute is missing or invalid
-            If group 2 elements are in dataset rather than dataset.file_meta, or if a preamble is given but is not 128 bytes long, or if Transfer Syntax is a compressed type and pixel data is not compressed
-            If thrown by ds.save_as / dcmwrite
+        ValueError: If any essential pixel attribute is missing or invalid
         General Exception from OpenCV.inpaint
         Runtime Exception from OpenJPEG.encode_array
     """
-    logger.info(f"Remove burnt-in PHI from pixel data of: {dcm_path}")
-
-    # Read the DICOM image file using pydicom which will perform any decompression required
-    ds = dcmread(dcm_path)
-
     logger.debug(f"Processing Image, SOPClassUID: {ds.SOPClassUID} AnonPatientID: {ds.PatientID}")
 
     # Extract relevant attributes for pixel data processing:
@@ -492,155 +1049,154 @@ def remove_pixel_phi(
     elif rows > downscale_dimension_threshold:
         scale_factor = downscale_dimension_threshold / rows
 
-    source_pixels_deid_stack = []
-    source_pixels_changed = False
-
-    for frame in range(no_of_frames):
-        if no_of_frames > 1:
-            logging.debug(f"Processing Frame {frame}...")
-
-        pixels = pixels_stack[frame]
-
-        if grayscale:
-            # Apply any modality LUT then VOI LUT & Windowing indicated by metadata:
-            # do this here, on every frame to avoid potential memory issues for large number of frames:
-            pixels = apply_voi_lut(apply_modality_lut(pixels, ds), ds)
-
-        # Normalize the pixel array to the range 0-255
-        normalize(
-            src=pixels,
-            dst=pixels,
-            alpha=0,
-            beta=255,
-            norm_type=NORM_MINMAX,
-            dtype=-1,
-            mask=None,
-        )
-        pixels = pixels.astype(np.uint8)
-
-        if pi == "MONOCHROME1":  # 0 = white
-            logger.debug("Convert from MONOCHROME1 to MONOCHROME2 (invert pixel values)")
-            pixels = np.invert(pixels)
-
-        logger.debug(f"After normalization: pixels.value.range:[{pixels.min()}..{pixels.max()}]")
-
-        # DOWNSCALE if necessary:
-        if scale_factor < 1:
-            new_size = (int(cols * scale_factor), int(rows * scale_factor))
-            pixels = resize(pixels, new_size, interpolation=INTER_LINEAR)
-            logger.debug(f"Downscaled image with scaling factor={scale_factor:.2f}, new pixels.shape: {pixels.shape}")
-        else:
-            logger.debug(f"Max Image Dimension < {downscale_dimension_threshold}, no downscaling required.")
-
-        # Add a border to the resized image
-        pixels = copyMakeBorder(
-            pixels,
-            border_size,
-            border_size,
+    masks: list[NDArray[np.uint8] | None] = [None] * no_of_frames
+    chunk_size = max(ocr_batch_size, 1)
+
+    tiled = tiled_ocr and not (temporal_mask and no_of_frames > 1) and scale_factor < 1
+    if tiled:
+        tile_size, tile_overlap, scale_factor = tiled_ocr_geometry(pixel_spacing, tile_size)
+        logger.debug(f"Tiled OCR tile_size={tile_size} overlap={tile_overlap} scale_factor={scale_factor:.2f}")
+
+    if ocr_reader is not None and temporal_mask and no_of_frames > 1:
+        temporal_ocr_mask, keyframes = _temporal_ocr_mask(
+            ocr_reader,
+            pixels_stack,
+            ds,
+            grayscale,
+            pi,
+            rows,
+            cols,
+            scale_factor,
             border_size,
-            border_size,
-            BORDER_CONSTANT,
-            value=[0, 0, 0],  # Black border
+            chunk_size,
+            detect_only,
+            temporal_change_threshold,
+            text_prefilter,
         )
-        logger.debug(f"Black Border of {border_size}px added, new pixels.shape: {pixels.shape}")
-
-        # Perform OCR on the bordered image
-        # for word-level detection: width_ths=0.1, paragraph=False
-        # tuning params: add_margin=0.0, rotation_info=[90])  # , 180, 270]) #TODO: add to global config?
-        results = ocr_reader.readtext(pixels)
-
-        if not results:
-            logger.debug("No text found in frame")
-            continue
-
-        logger.debug(f"Text boxes detected in frame: {len(results)}")
-
-        # Create an 8 bit mask of pixels for in-painting
-        mask = np.zeros(pixels.shape[:2], dtype=np.uint8)
-
-        # Draw bounding boxes around each detected word
-        for bbox, __, __ in results:
-            # Unpack the bounding box
-            (top_left, top_right, bottom_right, bottom_left) = bbox
+        logger.debug(f"Temporal mask from max & min projections & {keyframes} keyframes of {no_of_frames} frames")
+        masks = [temporal_ocr_mask] * no_of_frames
+
+    elif ocr_reader is not None and tiled:
+        # Large frames are prepared & tiled one at a time to bound memory use:
+        for frame in range(no_of_frames):
+            ocr_frame = _prepare_ocr_frame(pixels_stack[frame], ds, grayscale, pi, scale_factor, border_size)
+            results = _tiled_ocr(
+                ocr_reader, ocr_frame, tile_size, tile_overlap, chunk_size, detect_only, text_prefilter, tile_threads
+            )
+            logger.debug(f"Text boxes detected in frame {frame}: {len(results)}")
+            masks[frame] = _ocr_results_to_mask(results, ocr_frame, rows, cols, scale_factor, border_size)
+
+    elif ocr_reader is not None:
+        # Prepare frames for OCR and run OCR chunk by chunk to bound memory use for a large number of frames:
+        for chunk_start in range(0, no_of_frames, chunk_size):
+            chunk_frames = range(chunk_start, min(chunk_start + chunk_size, no_of_frames))
+            if no_of_frames > 1:
+                logger.debug(f"Processing Frames {chunk_frames.start}..{chunk_frames.stop - 1}")
+
+            ocr_frames = [
+                _prepare_ocr_frame(pixels_stack[frame], ds, grayscale, pi, scale_factor, border_size)
+                for frame in chunk_frames
+            ]
+            logger.debug(f"OCR frame shape after scale_factor={scale_factor:.2f} & border: {ocr_frames[0].shape}")
+
+            # for word-level detection: width_ths=0.1, paragraph=False
+            # tuning params: add_margin=0.0, rotation_info=[90])  # , 180, 270]) #TODO: add to global config?
+            candidates = [
+                (frame, ocr_frame)
+                for frame, ocr_frame in zip(chunk_frames, ocr_frames, strict=True)
+                if not text_prefilter or text_prefilter.text_likely(ocr_frame)
+            ]
+            if not candidates:
+                logger.debug("No text likely in frames, skip OCR")
+                continue
+
+            ocr_results = _run_ocr(ocr_reader, [ocr_frame for __, ocr_frame in candidates], chunk_size, detect_only)
+            for (frame, ocr_frame), results in zip(candidates, ocr_results, strict=True):
+                logger.debug(f"Text boxes detected in frame: {len(results)}")
+                masks[frame] = _ocr_results_to_mask(results, ocr_frame, rows, cols, scale_factor, border_size)
+
+    if not blackout_areas and not any(mask is not None for mask in masks):
+        logging.info("No changes made to pixel data")
+        return False
 
-            top_left = tuple(map(int, top_left))
-            bottom_right = tuple(map(int, bottom_right))
+    # CHANGE SOURCE PIXELS:
+    # Apply inpainting masks to source pixel array, frames without text are kept as is:
+    logger.debug(
+        "Change source pixels array using mask from OCR and cv2.inpaint with radius = 5 & INPAINT_TELEA (Poisson PDE) algorithm"
+    )
+    source_pixels_deid_stack = []
+    for frame, mask in enumerate(masks):
+        source_pixels_deid = source_pixels_decompressed_stack[frame]
+        if mask is not None:
+            source_pixels_deid = _inpaint_frame(source_pixels_deid, mask, bits_allocated, pixel_representation)
+        if blackout_areas:
+            source_pixels_deid = source_pixels_deid.copy()
+            blackout_rectangular_areas(source_pixels_deid, blackout_areas)
+
+        if ds.file_meta.TransferSyntaxUID.is_compressed and not grayscale and pi != "RGB":
+            logger.debug("Convert source frame to RGB")
+            source_pixels_deid = convert_color_space(arr=source_pixels_deid, current=pi, desired="RGB", per_frame=True)
 
-            # Perform full anonymization, remove all detected text from image:
-            _draw_text_contours_on_mask(pixels, top_left, bottom_right, mask)
+        source_pixels_deid_stack.append(source_pixels_deid)
 
-        # Remove border from mask
-        mask = mask[border_size:-border_size, border_size : mask.shape[1] - border_size]
-        logger.debug(f"Remove Border from mask, new mask.shape: {mask.shape}")
+    # Save processed stack to PixelData:
+    if ds.file_meta.TransferSyntaxUID.is_compressed:
+        # Source pixels were compressed, re-compress losslessly:
+        transfer_syntax = _reencode_transfer_syntax(reencode)
+        logger.debug(f"Re-compress deidentified source frames to {transfer_syntax.name}")
+        try:
+            encoded_frames = _encode_frames(source_pixels_deid_stack, transfer_syntax, ds, grayscale, reencode_threads)
+        except Exception as e:
+            if transfer_syntax == JPEG2000Lossless:
+                raise
+            logger.warning(f"Re-compression to {transfer_syntax.name} failed: {e}, use JPEG2000Lossless")
+            transfer_syntax = JPEG2000Lossless
+            encoded_frames = _encode_frames(source_pixels_deid_stack, transfer_syntax, ds, grayscale, reencode_threads)
+
+        if not grayscale and pi != "RGB":
+            ds.PhotometricInterpretation = "RGB"
+        logger.debug("Encapsulate encoded frames")
+        ds.PixelData = encapsulate(encoded_frames)
+        ds["PixelData"].is_undefined_length = True
+        ds.file_meta.TransferSyntaxUID = transfer_syntax
+    else:
+        ds.PixelData = np.stack(source_pixels_deid_stack, axis=0).tobytes()
 
-        # Upscale mask if downscaling was applied to source image:
-        if scale_factor < 1:
-            mask = resize(src=mask, dsize=(cols, rows), interpolation=INTER_LINEAR)
-            logger.debug(f"Upscale mask back to original source image size, new mask.shape: {mask.shape}")
+    return True
 
-        kernel = np.ones((3, 3), np.uint8)
-        dilated_mask = dilate(src=mask, kernel=kernel, iterations=1)
 
-        # CHANGE SOURCE PIXELS:
-        source_pixels_changed = True
+def remove_pixel_phi(dcm_path: Path, ocr_reader: OCRReader | None, **kwargs) -> bool:
+    """
+    Description:
+        Removes the PHI in the pixel data of a DICOM file with 1...N frames, see remove_pixel_phi_from_dataset
+        The file is only re-written if the pixel data was modified
 
-        # Apply inpainting mask to source pixel array:
-        logger.debug(
-            "Change source pixels array using mask from OCR and cv2.inpaint with radius = 5 & INPAINT_TELEA (Poisson PDE) algorithm"
-        )
+    Args:
+         dcm_path (Path): path to source DICOM file [*Mutable*]
+         ocr_reader (OCRReader | None): see remove_pixel_phi_from_dataset
+         **kwargs: options of remove_pixel_phi_from_dataset
 
-        if bits_allocated == 16 and pixel_representation == 1:
-            frame_pixels = source_pixels_decompressed_stack[frame]
-            # Inpaint function only supports 8-bit, 16-bit UNSIGNED or 32-bit float 1-channel and 8-bit 3-channel input/output images
-            # Mask must be 8-bit, 1 channel
-            # Up Shift and Convert to UNSIGNED 16 bit:
-            frame_pixels = (frame_pixels + 32768).astype(np.uint16)
-            source_pixels_deid = inpaint(
-                src=frame_pixels,
-                inpaintMask=dilated_mask,
-                inpaintRadius=5,
-                flags=INPAINT_TELEA,
-            )
-            # Downshift and convert back to SIGNED 16 bit:
-            source_pixels_deid = (source_pixels_deid - 32768).astype(np.int16)
-        else:
-            source_pixels_deid = inpaint(
-                src=source_pixels_decompressed_stack[frame],
-                inpaintMask=dilated_mask,
-                inpaintRadius=5,
-                flags=INPAINT_TELEA,
-            )
+    Returns:
+        If text is detected or blackout_areas given and file modified with text removed, return True
+        If no text is detected, file is not modified, return False
 
-        # if source pixels were compressed then re-compress using JPEG2000Lossless:
-        if ds.file_meta.TransferSyntaxUID.is_compressed:
-            logger.debug("Re-compress deidentified source frame")
-            if not grayscale and pi != "RGB":
-                logger.debug("Convert source frame to RGB")
-                source_pixels_deid = convert_color_space(
-                    arr=source_pixels_deid, current=pi, desired="RGB", per_frame=True
-                )
-                ds.PhotometricInterpretation = "RGB"
-
-            source_pixels_deid = encode_array(
-                arr=source_pixels_deid,
-                photometric_interpretation=2 if grayscale else 1,
-                use_mct=False,
-            )
+    Raises:
+        InvalidDicomError: if dcm_path not a valid DICOM file
+        TypeError: if dcm_path is none or unsupported type
+        ValueError:
+            If any essential pixel attribute is missing or invalid
+            If group 2 elements are in dataset rather than dataset.file_meta, or if a preamble is given but is not 128 bytes long, or if Transfer Syntax is a compressed type and pixel data is not compressed
+            If thrown by ds.save_as / dcmwrite
+        General Exception from OpenCV.inpaint
+        Runtime Exception from OpenJPEG.encode_array
+    """
+    logger.info(f"Remove burnt-in PHI from pixel data of: {dcm_path}")
 
-        source_pixels_deid_stack.append(source_pixels_deid)
+    # Read the DICOM image file using pydicom which will perform any decompression required
+    ds = dcmread(dcm_path)
 
-    if not source_pixels_changed:
-        logging.info("No changes made to pixel data")
+    if not remove_pixel_phi_from_dataset(ds, ocr_reader, **kwargs):
         return False
 
-    # Save processed stack to PixelData:
-    if ds.file_meta.TransferSyntaxUID.is_compressed:
-        logger.debug("Encapsulate source_pixels_deid_stack")
-        ds.PixelData = encapsulate(source_pixels_deid_stack)
-        ds["PixelData"].is_undefined_length = True
-        ds.file_meta.TransferSyntaxUID = JPEG2000Lossless
-    else:
-        ds.PixelData = np.stack(source_pixels_deid_stack, axis=0).tobytes()
-
     ds.save_as(dcm_path)
     return True
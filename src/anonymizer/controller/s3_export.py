@@ -0,0 +1,149 @@
+"""
+Concurrent export of DICOM files to AWS S3.
+
+This module provides the S3ExportEngine class used by ProjectController._export_files to upload
+the files of all patients being exported through one shared boto3 (s3transfer) TransferManager:
+- files are uploaded concurrently, limited by max_concurrency across all patient export threads
+- files larger than multipart_threshold are uploaded in parts of multipart_chunksize bytes
+- byte level progress is reported via callbacks
+- cancel() aborts all transfers in flight, incomplete multipart uploads are aborted on S3 by s3transfer
+"""
+
+import logging
+import threading
+from typing import Any, Callable
+
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from s3transfer.subscribers import BaseSubscriber
+
+logger = logging.getLogger(__name__)
+
+
+class _UploadSubscriber(BaseSubscriber):
+    """Forwards s3transfer progress events of a single file upload"""
+
+    def __init__(self, on_progress: Callable[[int], None] | None):
+        self._on_progress = on_progress
+
+    def on_progress(self, future, bytes_transferred: int, **kwargs) -> None:
+        if self._on_progress:
+            self._on_progress(bytes_transferred)
+
+
+class S3ExportEngine:
+    """
+    Uploads files to an S3 bucket via a TransferManager shared by all export threads.
+
+    The TransferManager is bound to the S3 client returned by ProjectController.AWS_authenticate(),
+    when the AWS credentials are refreshed a new TransferManager is created for the new client
+    and the previous one is shut down once its transfers in flight are complete.
+    """
+
+    def __init__(self, max_concurrency: int, multipart_threshold: int, multipart_chunksize: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if multipart_chunksize < 5 * 1024 * 1024:
+            raise ValueError("multipart_chunksize must be at least 5MB (S3 minimum part size)")
+
+        self._config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+        self._client: Any = None
+        self._transfer_manager: Any = None
+        self._futures: set = set()
+        self._lock = threading.Lock()
+        logger.info(
+            f"S3ExportEngine max_concurrency={max_concurrency} "
+            f"multipart_threshold={multipart_threshold} multipart_chunksize={multipart_chunksize}"
+        )
+
+    def _get_transfer_manager(self, s3_client: Any) -> Any:
+        with self._lock:
+            if self._transfer_manager is None or s3_client is not self._client:
+                if self._transfer_manager:
+                    logger.info("S3 client changed, replacing TransferManager")
+                    threading.Thread(
+                        target=self._transfer_manager.shutdown, name="S3TransferShutdown", daemon=True
+                    ).start()
+                self._client = s3_client
+                self._transfer_manager = create_transfer_manager(s3_client, self._config)
+            return self._transfer_manager
+
+    def upload_files(
+        self,
+        s3_client: Any,
+        bucket: str,
+        uploads: list[tuple[str, str]],
+        on_progress: Callable[[int], None] | None = None,
+        on_file_uploaded: Callable[[str], None] | None = None,
+    ) -> None:
+        """
+        Blocking: Upload files concurrently to the S3 bucket.
+
+        Args:
+            s3_client: The boto3 S3 client to use for the uploads.
+            bucket (str): The name of the S3 bucket.
+            uploads (list[tuple[str, str]]): List of (file path, object key) to upload.
+            on_progress (Callable[[int], None], optional): Called with the number of bytes transferred,
+                from the transfer threads, as each chunk of each file is uploaded.
+            on_file_uploaded (Callable[[str], None], optional): Called with the file path
+                in the calling thread as each file upload completes.
+
+        Raises:
+            CancelledError: If cancel() is called while files are being uploaded.
+            Any exception raised by boto3 for the first failed upload, all remaining uploads are cancelled.
+        """
+        if not uploads:
+            return
+
+        transfer_manager = self._get_transfer_manager(s3_client)
+        futures = []
+        with self._lock:
+            for file_path, object_key in uploads:
+                future = transfer_manager.upload(
+                    file_path, bucket, object_key, subscribers=[_UploadSubscriber(on_progress)]
+                )
+                futures.append((file_path, future))
+                self._futures.add(future)
+
+        try:
+            for file_path, future in futures:
+                future.result()  # raises on failure or cancellation
+                logger.info(f"Uploaded to S3: {future.meta.call_args.key}")
+                if on_file_uploaded:
+                    on_file_uploaded(file_path)
+        except BaseException:
+            for _, future in futures:
+                if not future.done():
+                    future.cancel()
+            raise
+        finally:
+            with self._lock:
+                for _, future in futures:
+                    self._futures.discard(future)
+
+    def cancel(self) -> None:
+        """
+        Non-blocking: Cancel all uploads in flight.
+        s3transfer aborts the multipart upload on S3 of each cancelled multipart transfer.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        logger.info(f"Cancel {len(futures)} S3 uploads")
+        for future in futures:
+            future.cancel()
+
+    def shutdown(self, cancel: bool = False) -> None:
+        """
+        Blocking: Shut down the TransferManager, cancelling uploads in flight if cancel is True,
+        otherwise wait for them to complete.
+        """
+        with self._lock:
+            transfer_manager = self._transfer_manager
+            self._transfer_manager = None
+            self._client = None
+        if transfer_manager:
+            transfer_manager.shutdown(cancel=cancel)
@@ -0,0 +1,233 @@
+"""
+Lossless transcoding of DICOM files on export.
+
+This module provides the ExportTranscoder class used by ProjectController._export_files to compress files stored
+with an uncompressed transfer syntax to a lossless compressed transfer syntax before they are sent.
+Files are encoded ahead of the send on a pool of worker threads and written to a temporary directory,
+the transcoded files are then sent from disk like any other file (chunked send, S3 upload).
+
+RLE Lossless is encoded by pydicom Dataset.compress(), which can only encode RLE with the pinned pydicom 2.4,
+JPEG2000 Lossless is encoded with openjpeg (pylibjpeg-openjpeg), see compress_dataset() and encoder_available().
+"""
+
+import logging
+import os
+import shutil
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from pydicom import Dataset, dcmread
+from pydicom.encaps import encapsulate
+from pydicom.uid import (
+    ExplicitVRBigEndian,
+    ExplicitVRLittleEndian,
+    ImplicitVRLittleEndian,
+    JPEG2000Lossless,
+    RLELossless,
+)
+
+logger = logging.getLogger(__name__)
+
+# ProjectModel.export_settings.transcode => Transfer Syntax UID:
+TRANSCODE_TRANSFER_SYNTAXES = {
+    "RLE": RLELossless,
+    "JPEG2000": JPEG2000Lossless,
+}
+
+# Only files stored with these transfer syntaxes are transcoded:
+UNCOMPRESSED_TRANSFER_SYNTAXES = [
+    ImplicitVRLittleEndian,
+    ExplicitVRLittleEndian,
+    ExplicitVRBigEndian,
+]
+
+
+def encoder_available(transfer_syntax: str) -> bool:
+    """
+    Returns True if an encoder with its dependencies is installed for the transfer syntax:
+    openjpeg for JPEG2000Lossless, otherwise a pydicom encoder.
+    """
+    if transfer_syntax == JPEG2000Lossless:
+        try:
+            from openjpeg.utils import encode_array  # noqa: F401
+
+            return True
+        except ImportError as e:
+            logger.warning(f"No encoder available for {transfer_syntax}: {e}")
+            return False
+    try:
+        from pydicom.encoders import get_encoder
+
+        return get_encoder(transfer_syntax).is_available
+    except (ImportError, NotImplementedError, ValueError) as e:
+        logger.warning(f"No encoder available for {transfer_syntax}: {e}")
+        return False
+
+
+def compress_dataset(ds: Dataset, transfer_syntax: str) -> None:
+    """
+    Compress the uncompressed pixel data of a dataset to transfer_syntax in place.
+    JPEG2000Lossless frames are encoded with openjpeg, other transfer syntaxes with pydicom Dataset.compress().
+
+    Raises:
+        ValueError: If the photometric interpretation cannot be encoded losslessly to JPEG2000.
+        Exception: Any exception raised by the encoder.
+    """
+    if transfer_syntax != JPEG2000Lossless:
+        ds.compress(transfer_syntax)
+        return
+
+    from openjpeg.utils import encode_array
+
+    if ds.PhotometricInterpretation not in ["MONOCHROME1", "MONOCHROME2", "RGB"]:
+        raise ValueError(f"JPEG2000 encoding of {ds.PhotometricInterpretation} not supported")
+    grayscale = ds.SamplesPerPixel == 1
+    pixels = ds.pixel_array
+    frames = pixels if int(ds.get("NumberOfFrames", 1) or 1) > 1 else [pixels]
+    encoded_frames = [
+        encode_array(arr=frame, photometric_interpretation=2 if grayscale else 1, use_mct=False) for frame in frames
+    ]
+
+    ds.PixelData = encapsulate(encoded_frames)
+    ds["PixelData"].VR = "OB"
+    ds["PixelData"].is_undefined_length = True
+    if not grayscale:
+        ds.PlanarConfiguration = 0
+    ds.file_meta.TransferSyntaxUID = JPEG2000Lossless
+    ds.is_implicit_VR = False
+    ds.is_little_endian = True
+
+
+@dataclass
+class TranscodeResult:
+    src_path: str  # file path in local storage
+    send_path: str  # transcoded file path in temporary directory or src_path if not transcoded
+    transcoded: bool
+    original_size: int  # bytes
+    send_size: int  # bytes
+
+
+def transcode_file(
+    src_path: str,
+    dest_dir: Path,
+    transfer_syntax: str,
+    should_transcode: Callable[[str], bool] | None = None,
+) -> TranscodeResult:
+    """
+    Blocking: Transcode a DICOM file with an uncompressed transfer syntax and pixel data to transfer_syntax.
+    The transcoded file is written to dest_dir with the same filename.
+    If the file is not transcoded or encoding fails, the result refers to the original file.
+
+    Args:
+        src_path (str): The path of the DICOM file.
+        dest_dir (Path): The directory to write the transcoded file to.
+        transfer_syntax (str): The lossless compressed Transfer Syntax UID.
+        should_transcode (Callable[[str], bool], optional): Called with the SOPClassUID of the file,
+            the file is only transcoded if it returns True (eg. destination accepts the compressed transfer syntax).
+
+    Returns:
+        TranscodeResult: The file to send.
+    """
+    original_size = os.path.getsize(src_path)
+    not_transcoded = TranscodeResult(src_path, src_path, False, original_size, original_size)
+    try:
+        ds = dcmread(src_path)
+        if "PixelData" not in ds or ds.file_meta.TransferSyntaxUID not in UNCOMPRESSED_TRANSFER_SYNTAXES:
+            return not_transcoded
+        if should_transcode and not should_transcode(ds.SOPClassUID):
+            return not_transcoded
+
+        compress_dataset(ds, transfer_syntax)
+        dest_path = dest_dir / Path(src_path).name
+        ds.save_as(dest_path)
+        return TranscodeResult(src_path, str(dest_path), True, original_size, os.path.getsize(dest_path))
+
+    except Exception as e:
+        logger.warning(f"Transcode to {transfer_syntax} failed, send original file {src_path}: {e}")
+        return not_transcoded
+
+
+class ExportTranscoder:
+    """
+    Transcodes files ahead of the send on a pool of worker threads shared by all export workers.
+    """
+
+    def __init__(self, transfer_syntax: str, workers: int, tmp_dir: Path):
+        self.transfer_syntax = transfer_syntax
+        self._workers = max(workers, 1)
+        self._tmp_dir = tmp_dir
+        self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="ExportTranscode")
+        logger.info(f"ExportTranscoder transfer_syntax={transfer_syntax} workers={self._workers}")
+
+    def transcode(
+        self,
+        file_paths: list[str],
+        should_transcode: Callable[[str], bool] | None = None,
+    ) -> Iterator[TranscodeResult]:
+        """
+        Blocking generator: Transcode files in parallel, keeping up to 2 files per worker encoded ahead of the consumer,
+        and yield the results in order of file_paths.
+        Transcoded files are deleted when the consumer requests the next result or closes the generator.
+
+        Args:
+            file_paths (list[str]): The paths of the DICOM files to transcode.
+            should_transcode (Callable[[str], bool], optional): see transcode_file()
+
+        Yields:
+            TranscodeResult: The file to send for each file path.
+        """
+        dest_dir = self._new_dest_dir()
+        pending_paths = deque(file_paths)
+        futures: deque[Future] = deque()
+        try:
+            while pending_paths or futures:
+                while pending_paths and len(futures) < 2 * self._workers:
+                    futures.append(
+                        self._executor.submit(
+                            transcode_file, pending_paths.popleft(), dest_dir, self.transfer_syntax, should_transcode
+                        )
+                    )
+                result: TranscodeResult = futures.popleft().result()
+                try:
+                    yield result
+                finally:
+                    if result.transcoded:
+                        os.remove(result.send_path)
+        finally:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            shutil.rmtree(dest_dir, ignore_errors=True)
+
+    @contextmanager
+    def transcode_all(self, file_paths: list[str]) -> Iterator[list[TranscodeResult]]:
+        """
+        Blocking context manager: Transcode all files in parallel, for senders which send files concurrently.
+        Transcoded files are deleted on exit.
+
+        Args:
+            file_paths (list[str]): The paths of the DICOM files to transcode.
+
+        Yields:
+            list[TranscodeResult]: The file to send for each file path, in order of file_paths.
+        """
+        dest_dir = self._new_dest_dir()
+        try:
+            yield list(
+                self._executor.map(lambda path: transcode_file(path, dest_dir, self.transfer_syntax), file_paths)
+            )
+        finally:
+            shutil.rmtree(dest_dir, ignore_errors=True)
+
+    def _new_dest_dir(self) -> Path:
+        dest_dir = self._tmp_dir / uuid.uuid4().hex
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        return dest_dir
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -8,13 +8,14 @@ import logging
 import xml.etree.ElementTree as ET
 from contextlib import contextmanager
 from dataclasses import dataclass, fields
+from datetime import datetime
 from functools import wraps
 from pathlib import Path
 from pprint import pformat
 from typing import ClassVar, NamedTuple
 
 from pydicom import Dataset
-from sqlalchemy import ForeignKey, Integer, String, create_engine, delete, func, select, text
+from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, create_engine, delete, func, select, text
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -106,6 +107,65 @@ class UID(Base):
     phi_uid: Mapped[str] = mapped_column(String, unique=True, index=True)
 
 
+# Bulk move jobs (MoveStudiesRequest) persisted by ProjectController so they can be resumed after a restart or crash
+class MoveJob(Base):
+    __tablename__ = "move_jobs"
+
+    job_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    scp_name: Mapped[str] = mapped_column(String)
+    dest_scp_ae: Mapped[str] = mapped_column(String)
+    level: Mapped[str] = mapped_column(String)
+    created: Mapped[str] = mapped_column(String)  # ISO format datetime
+    complete: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
+
+    studies: Mapped[list["MoveJobStudy"]] = relationship(back_populates="job", cascade="all, delete-orphan", init=False)
+
+
+class MoveJobStudy(Base):
+    __tablename__ = "move_job_studies"
+
+    job_study_pk: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, init=False)
+    job_id: Mapped[int] = mapped_column(Integer, ForeignKey("move_jobs.job_id"), index=True)
+    job: Mapped[MoveJob] = relationship(back_populates="studies", init=False)
+    study_uid: Mapped[str] = mapped_column(String)
+    patient_id: Mapped[str] = mapped_column(String)
+    hierarchy: Mapped[str] = mapped_column(Text)  # JSON of StudyUIDHierarchy, as set by ProjectController
+    complete: Mapped[bool] = mapped_column(Boolean, default=False)
+    last_error_msg: Mapped[str | None] = mapped_column(String, default=None)
+
+
+# Export manifest: anonymized instances confirmed sent to each export destination by ProjectController
+class ExportedInstance(Base):
+    __tablename__ = "exported_instances"
+
+    dest_name: Mapped[str] = mapped_column(String, primary_key=True)
+    sop_instance_uid: Mapped[str] = mapped_column(String, primary_key=True)  # anonymized SOPInstanceUID
+    patient_id: Mapped[str] = mapped_column(String, index=True)  # anonymized PatientID
+    exported: Mapped[str] = mapped_column(String)  # ISO format datetime
+
+
+# Last time the export manifest of a patient was reconciled with the contents of an export destination
+class ExportReconciliation(Base):
+    __tablename__ = "export_reconciliations"
+
+    dest_name: Mapped[str] = mapped_column(String, primary_key=True)
+    patient_id: Mapped[str] = mapped_column(String, primary_key=True)  # anonymized PatientID
+    reconciled: Mapped[str] = mapped_column(String)  # ISO format datetime
+
+
+# Persistent export queue: patients queued for export to each destination by ProjectController,
+# removed when exported, retried with backoff after a transient error and resumed after a restart or crash
+class ExportQueueEntry(Base):
+    __tablename__ = "export_queue"
+
+    dest_name: Mapped[str] = mapped_column(String, primary_key=True)
+    patient_id: Mapped[str] = mapped_column(String, primary_key=True)  # anonymized PatientID
+    queued: Mapped[str] = mapped_column(String)  # ISO format datetime
+    next_attempt: Mapped[str] = mapped_column(String, index=True)  # ISO format datetime
+    attempts: Mapped[int] = mapped_column(Integer, default=0)  # failed attempts
+    last_error_msg: Mapped[str | None] = mapped_column(String, default=None)
+
+
 @dataclass
 class PHI_IndexRecord:
     anon_patient_id: str
@@ -694,6 +754,203 @@ class AnonymizerModel:
 
         return sum(len(series.instances) for series in study.series) >= study.target_instance_count
 
+    @use_session()
+    def create_move_job(self, scp_name: str, dest_scp_ae: str, level: str, studies: list[tuple[str, str, str]]) -> int:
+        """
+        Persists a new bulk move job and the state of its studies.
+
+        Args:
+            scp_name (str): The name of the source SCP.
+            dest_scp_ae (str): The AE title of the move destination SCP.
+            level (str): The requested move level.
+            studies (list[tuple[str, str, str]]): List of (study_uid, patient_id, hierarchy json) for each study.
+
+        Returns:
+            int: The job_id of the new move job.
+        """
+        job = MoveJob(
+            scp_name=scp_name,
+            dest_scp_ae=dest_scp_ae,
+            level=level,
+            created=datetime.now().isoformat(timespec="seconds"),
+        )
+        self.session.add(job)
+        self.session.flush()  # assign job_id
+        self.session.add_all(
+            [
+                MoveJobStudy(job_id=job.job_id, study_uid=study_uid, patient_id=patient_id, hierarchy=hierarchy)
+                for study_uid, patient_id, hierarchy in studies
+            ]
+        )
+        logger.info(f"MoveJob[{job.job_id}] created for {len(studies)} studies from {scp_name}")
+        return job.job_id
+
+    @use_session()
+    def update_move_job_study(
+        self, job_id: int, study_uid: str, hierarchy: str, complete: bool, last_error_msg: str | None
+    ) -> None:
+        """
+        Updates the persisted state of a study of a bulk move job.
+        """
+        stmt = select(MoveJobStudy).where(MoveJobStudy.job_id == job_id, MoveJobStudy.study_uid == study_uid)
+        job_study: MoveJobStudy | None = self.session.execute(stmt).scalars().first()
+        if not job_study:
+            logger.error(f"MoveJob[{job_id}] study {study_uid} not found")
+            return
+        job_study.hierarchy = hierarchy
+        job_study.complete = complete
+        job_study.last_error_msg = last_error_msg
+
+    @use_session()
+    def complete_move_job(self, job_id: int) -> None:
+        """
+        Marks a bulk move job as complete, it will no longer be resumed.
+        """
+        job = self.session.get(MoveJob, job_id)
+        if job:
+            job.complete = True
+            logger.info(f"MoveJob[{job_id}] complete")
+
+    @use_session(is_read_only_operation=True)
+    def get_incomplete_move_jobs(self) -> list[MoveJob]:
+        """
+        Retrieves all bulk move jobs which have not completed, with their studies eagerly loaded.
+        """
+        stmt = (
+            select(MoveJob)
+            .where(MoveJob.complete.is_(False))
+            .options(selectinload(MoveJob.studies))
+            .order_by(MoveJob.job_id)
+        )
+        return list(self.session.execute(stmt).scalars().all())
+
+    @use_session()
+    def add_exported_instances(self, dest_name: str, patient_id: str, sop_instance_uids: list[str]) -> None:
+        """
+        Records anonymized instances confirmed sent to an export destination in the export manifest.
+
+        Args:
+            dest_name (str): The name of the export destination.
+            patient_id (str): The anonymized PatientID.
+            sop_instance_uids (list[str]): The anonymized SOPInstanceUIDs sent.
+        """
+        exported = datetime.now().isoformat(timespec="seconds")
+        # Replace any previous records of these instances:
+        self.session.execute(
+            delete(ExportedInstance).where(
+                ExportedInstance.dest_name == dest_name, ExportedInstance.sop_instance_uid.in_(sop_instance_uids)
+            )
+        )
+        self.session.add_all(
+            [
+                ExportedInstance(dest_name=dest_name, sop_instance_uid=uid, patient_id=patient_id, exported=exported)
+                for uid in sop_instance_uids
+            ]
+        )
+
+    @use_session(is_read_only_operation=True)
+    def get_exported_instances(self, dest_name: str, patient_id: str) -> set[str]:
+        """
+        Returns the anonymized SOPInstanceUIDs of a patient recorded as sent to an export destination.
+        """
+        stmt = select(ExportedInstance.sop_instance_uid).where(
+            ExportedInstance.dest_name == dest_name, ExportedInstance.patient_id == patient_id
+        )
+        return set(self.session.execute(stmt).scalars().all())
+
+    @use_session(is_read_only_operation=True)
+    def get_export_reconciled(self, dest_name: str, patient_id: str) -> datetime | None:
+        """
+        Returns when the export manifest of a patient was last reconciled with the export destination,
+        None if it has never been reconciled.
+        """
+        reconciliation = self.session.get(ExportReconciliation, (dest_name, patient_id))
+        return datetime.fromisoformat(reconciliation.reconciled) if reconciliation else None
+
+    @use_session()
+    def reconcile_exported_instances(self, dest_name: str, patient_id: str, sop_instance_uids: set[str]) -> None:
+        """
+        Replaces the export manifest of a patient with the anonymized instances found on the export destination.
+
+        Args:
+            dest_name (str): The name of the export destination.
+            patient_id (str): The anonymized PatientID.
+            sop_instance_uids (set[str]): The anonymized SOPInstanceUIDs of the patient found on the destination.
+        """
+        self.session.execute(
+            delete(ExportedInstance).where(
+                ExportedInstance.dest_name == dest_name, ExportedInstance.patient_id == patient_id
+            )
+        )
+        now = datetime.now().isoformat(timespec="seconds")
+        self.session.add_all(
+            [
+                ExportedInstance(dest_name=dest_name, sop_instance_uid=uid, patient_id=patient_id, exported=now)
+                for uid in sop_instance_uids
+            ]
+        )
+        self.session.merge(ExportReconciliation(dest_name=dest_name, patient_id=patient_id, reconciled=now))
+        logger.info(f"Export manifest for {patient_id} on {dest_name} reconciled: {len(sop_instance_uids)} instances")
+
+    @use_session()
+    def enqueue_exports(self, dest_name: str, patient_ids: list[str]) -> None:
+        """
+        Adds patients to the persistent export queue of a destination, due immediately.
+        Patients already queued are reset to no failed attempts.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        for patient_id in patient_ids:
+            self.session.merge(
+                ExportQueueEntry(dest_name=dest_name, patient_id=patient_id, queued=now, next_attempt=now)
+            )
+        logger.info(f"Export queue {dest_name}: {len(patient_ids)} patients queued")
+
+    @use_session(is_read_only_operation=True)
+    def get_export_queue(self, due_before: datetime | None = None) -> list[ExportQueueEntry]:
+        """
+        Retrieves the entries of the persistent export queues of all destinations in order of queueing,
+        only those due for an export attempt before due_before if specified.
+        """
+        stmt = select(ExportQueueEntry)
+        if due_before:
+            stmt = stmt.where(ExportQueueEntry.next_attempt <= due_before.isoformat(timespec="seconds"))
+        return list(self.session.execute(stmt.order_by(ExportQueueEntry.queued)).scalars().all())
+
+    @use_session()
+    def record_export_failure(self, dest_name: str, patient_id: str, error_msg: str) -> int:
+        """
+        Records a failed export attempt of a patient in the persistent export queue of a destination.
+
+        Returns:
+            int: The number of failed attempts, 0 if the patient is not queued.
+        """
+        entry = self.session.get(ExportQueueEntry, (dest_name, patient_id))
+        if not entry:
+            return 0
+        entry.attempts += 1
+        entry.last_error_msg = error_msg
+        return entry.attempts
+
+    @use_session()
+    def schedule_export(self, dest_name: str, patient_id: str, next_attempt: datetime) -> None:
+        """
+        Sets the time of the next export attempt of a patient in the persistent export queue of a destination.
+        """
+        entry = self.session.get(ExportQueueEntry, (dest_name, patient_id))
+        if entry:
+            entry.next_attempt = next_attempt.isoformat(timespec="seconds")
+
+    @use_session()
+    def dequeue_exports(self, dest_name: str, patient_ids: list[str]) -> None:
+        """
+        Removes patients from the persistent export queue of a destination.
+        """
+        self.session.execute(
+            delete(ExportQueueEntry).where(
+                ExportQueueEntry.dest_name == dest_name, ExportQueueEntry.patient_id.in_(patient_ids)
+            )
+        )
+
     # --- Helper methods for capture_phi ---
     # These helpers will be called by capture_phi and use the session provided by capture_phi's decorator.
     # They do not need their own @use_session decorator if only called by capture_phi.
@@ -833,7 +1090,9 @@ class AnonymizerModel:
         return new_instance
 
     @use_session()
-    def capture_phi(self, source: str, ds: Dataset, date_delta: int) -> tuple[str, str, str | None]:
+    def capture_phi(
+        self, source: str, ds: Dataset, date_delta: int, record_instance: bool = True
+    ) -> tuple[str, str, str | None]:
         """
         Capture PHI (Protected Health Information) from a DICOM dataset
 
@@ -841,6 +1100,7 @@ class AnonymizerModel:
             source (str): The source of the dataset.
             ds (Dataset): The dataset containing the PHI.
             date_delta (int): The anonymization date offset.
+            record_instance (bool): If False the instance is not recorded, see capture_instance.
 
         Returns:
             tuple[str, str, int]: A tuple containing the PHI patient ID, anonymized patient ID, and anonymized accession number.
@@ -858,10 +1118,24 @@ class AnonymizerModel:
         phi = self._get_or_create_phi(ds)
         study = self._get_or_create_study(ds, phi, date_delta, source)
         series = self._get_or_create_series(ds, study)
-        self._get_or_create_instance(ds, series)
+        if record_instance:
+            self._get_or_create_instance(ds, series)
 
         return phi.patient_id, phi.anon_patient_id, study.anon_accession_number
 
+    @use_session()
+    def capture_instance(self, phi_series_uid: str, phi_instance_uid: str) -> None:
+        """
+        Record an instance of a series captured by capture_phi(record_instance=False), once the instance is stored.
+        """
+        if self.session.get(Instance, phi_instance_uid):
+            return
+        stmt = select(UID.anon_uid).where(UID.phi_uid == phi_instance_uid)
+        anon_uid = self.session.execute(stmt).scalar_one_or_none() or self._create_anon_uid(phi_instance_uid)
+        self.session.add(
+            Instance(sop_instance_uid=phi_instance_uid, anon_sop_instance_uid=anon_uid, series_uid=phi_series_uid)
+        )
+
     @use_session()
     def remove_phi(self, anon_pt_id: str, anon_study_uid: str) -> bool:
         """
@@ -47,6 +47,120 @@ class NetworkTimeouts:
     network: float  # max time to wait for network messages
 
 
+@dataclass
+class MoveSettings:
+    adaptive: bool  # AIMD tuning of concurrent study moves & per study move level fallback
+    concurrent_moves: int  # initial (or fixed, if not adaptive) number of concurrent study moves
+    max_concurrent_moves: int  # upper limit for adaptive concurrency
+    lowest_move_level: str  # lowest level for per study fallback: STUDY, SERIES or INSTANCE
+    study_batch_size: int = 1  # number of studies per C-MOVE request at STUDY level, 1 = one study per request
+    concurrent_series_moves: int = 3  # max associations for SERIES level moves, shared by all studies of a move
+
+
+@dataclass
+class BandwidthWindow:
+    start: str  # local time of day "HH:MM"
+    end: str  # local time of day "HH:MM", window wraps past midnight if end < start
+    limits: Dict[str, float]  # destination name (remote_scps key or "AWS") => MB/s during window, 0 = unlimited
+
+
+@dataclass
+class ExportSettings:
+    multi_context_association: bool = True  # negotiate all presentation contexts of a patient's files up front
+    chunked_send: bool = True  # stream files from disk in PDU sized chunks without decoding
+    s3_max_concurrency: int = 10  # max concurrent S3 upload requests shared by all patient export threads
+    s3_multipart_threshold: int = 8 * 1024 * 1024  # bytes, files of this size or larger use multipart upload
+    s3_multipart_chunksize: int = 8 * 1024 * 1024  # bytes, part size of multipart uploads, S3 minimum is 5MB
+    export_workers: int = 4  # export worker threads shared by all patients of an export
+    export_work_item_max_files: int = 200  # max files per export work item, large studies are split
+    export_manifest: bool = True  # skip instances recorded as sent in the local export manifest
+    manifest_reconcile_interval: float = 0  # hours, re-query destination after interval, 0 = only on first export
+    bandwidth_limits: Dict[str, float] = field(default_factory=dict)  # destination name => MB/s, 0 = unlimited
+    bandwidth_schedule: List[BandwidthWindow] = field(default_factory=list)  # time of day overrides of limits
+    transcode: str = ""  # lossless transcode of uncompressed files on export: "RLE", "JPEG2000", "" = off
+    transcode_workers: int = 2  # encoder threads shared by all export workers
+    archive_dir: str = ""  # local or mounted directory for archive export
+    archive_format: str = "zip"  # "zip" or "tar.zst" (requires zstandard package)
+    archive_max_size: int = 4 * 1024 * 1024 * 1024  # bytes of file data per archive part, 0 = no split
+    archive_compression_level: int = 6  # zlib level 0-9 for zip, zstd level 1-22 for tar.zst
+    archive_workers: int = 2  # archive parts written concurrently
+    archive_zstd_threads: int = -1  # zstd compression threads per tar.zst part, -1 = number of CPUs
+    export_queue: bool = True  # persist exports, retry transient errors with backoff & resume after restart
+    export_retry_max_attempts: int = 5  # failed attempts of a patient's export before it is removed from the queue
+    export_retry_backoff: float = 30  # seconds before first retry, doubled for each further failed attempt
+    export_retry_backoff_max: float = 3600  # seconds, maximum delay between retries
+
+
+# PixelPHIRule.action:
+PIXEL_PHI_OCR = "ocr"  # full OCR, text detection & recognition
+PIXEL_PHI_DETECT = "detect"  # fast, text detection only, all detected text areas are removed
+PIXEL_PHI_BLACKOUT = "blackout"  # blackout the fixed template areas of the rule, no OCR
+PIXEL_PHI_SKIP = "skip"  # no pixel PHI removal
+PIXEL_PHI_ACTIONS = [PIXEL_PHI_OCR, PIXEL_PHI_DETECT, PIXEL_PHI_BLACKOUT, PIXEL_PHI_SKIP]
+
+# PixelPHISettings.in_memory:
+PIXEL_PHI_IN_MEMORY_OFF = ""  # write anonymized file, pixel PHI worker re-reads, cleans & re-writes it
+PIXEL_PHI_IN_MEMORY_HOLD = "hold"  # hold the write until the pixel PHI worker has cleaned the dataset in memory
+# held instances are recorded as received only once written, quarantined if pixel PHI removal fails,
+# held instances lost on a crash are not recorded and are anonymized again when next received
+PIXEL_PHI_IN_MEMORY_PROVISIONAL = "provisional"  # write provisional file, pixel PHI worker cleans dataset in memory
+
+# PixelPHISettings.ocr_backend:
+OCR_BACKEND_EASYOCR = "easyocr"  # easyocr on pytorch, GPU if available
+OCR_BACKEND_ONNX = "onnx"  # easyocr models exported to ONNX, ONNX Runtime CPU, requires optional onnxruntime package
+OCR_BACKEND_ONNX_INT8 = "onnx_int8"  # as OCR_BACKEND_ONNX with int8 quantized models
+OCR_BACKENDS = [OCR_BACKEND_EASYOCR, OCR_BACKEND_ONNX, OCR_BACKEND_ONNX_INT8]
+
+
+@dataclass
+class PixelPHIRule:
+    action: str  # one of PIXEL_PHI_ACTIONS
+    modality: str = ""  # match Modality, "" = any
+    sop_class_uid: str = ""  # match SOPClassUID, "" = any
+    image_type: str = ""  # match if value is one of the values of ImageType, eg. "AXIAL", "" = any
+    burned_in_annotation: str = ""  # match BurnedInAnnotation, "YES" or "NO", "" = any
+    manufacturer: str = ""  # match if case insensitive substring of Manufacturer, "" = any
+    blackout_areas: List[List[int]] = field(default_factory=list)  # [x1, y1, x2, y2] pixel areas for blackout action
+
+
+def default_pixel_phi_rules() -> List[PixelPHIRule]:
+    # No rules, every instance is processed with PixelPHISettings.default_action:
+    return []
+
+
+def skip_axial_ct_mr_pixel_phi_rules() -> List[PixelPHIRule]:
+    # Opt-in preset for PixelPHISettings.rules, skip axial CT & MR unless BurnedInAnnotation is YES.
+    # First matching rule applies:
+    return [
+        PixelPHIRule(PIXEL_PHI_OCR, burned_in_annotation="YES"),
+        PixelPHIRule(PIXEL_PHI_SKIP, modality="CT", image_type="AXIAL"),
+        PixelPHIRule(PIXEL_PHI_SKIP, modality="MR", image_type="AXIAL"),
+    ]
+
+
+@dataclass
+class PixelPHISettings:
+    workers: int = 2  # pixel PHI worker threads pulling files from the pixel PHI queue
+    ocr_concurrency: int = 2  # max workers running OCR inference at once on the shared OCR model
+    ocr_languages: List[str] = field(default_factory=lambda: ["en", "de", "fr", "es"])  # easyocr language codes
+    ocr_idle_timeout: float = 300  # seconds without use after which the OCR model is unloaded, 0 = never
+    ocr_backend: str = OCR_BACKEND_EASYOCR  # OCR inference backend, see above
+    cpu_threads: int = 0  # total CPU threads budgeted across pixel PHI workers, 0 = number of CPUs
+    ocr_batch_size: int = 8  # frames of a multi-frame instance run through OCR as one batch, 1 = frame by frame
+    temporal_mask: bool = False  # multi-frame: OCR max & min projections & changed keyframes, one mask for all frames
+    temporal_change_threshold: float = 8.0  # mean abs difference (0-255) of a 32x32 block in a text region to re-OCR
+    text_prefilter: bool = False  # skip OCR of blank & smooth frames without any candidate text region
+    reencode: str = "JPEG2000"  # lossless re-compression of compressed instances: "RLE", "JPEG2000"
+    reencode_threads: int = 4  # frames of a multi-frame instance re-compressed in parallel per worker
+    tiled_ocr: bool = False  # OCR frames over the downscale threshold in overlapping full resolution tiles
+    tile_size: int = 0  # tiled OCR tile size in pixels, 0 = from PixelSpacing
+    tile_threads: int = 2  # batches of tiles OCR'd in parallel per worker
+    in_memory: str = PIXEL_PHI_IN_MEMORY_OFF  # remove pixel PHI from the anonymized dataset in memory, see above
+    in_memory_max_queued: int = 64  # max datasets held in memory for pixel PHI workers, dataset workers then block
+    rules: List[PixelPHIRule] = field(default_factory=default_pixel_phi_rules)  # instance routing, first match applies
+    default_action: str = PIXEL_PHI_OCR  # action for instances not matched by any rule
+
+
 @dataclass
 class LoggingLevels:
     anonymizer: int  # Logging level
@@ -85,7 +199,7 @@ class ProjectModel:
     """
 
     # Project Model Version Control
-    MODEL_VERSION = 5
+    MODEL_VERSION = 6
 
     # SQLite DB configuration for SQLAlchemy
     # TODO: expand for other supported databases (PostgreSQL, MySQL, etc.)
@@ -153,6 +267,10 @@ class ProjectModel:
     def default_storage_classes() -> List[str]:
         return []
 
+    @staticmethod
+    def default_federated_scps() -> List[str]:
+        return []
+
     @staticmethod
     def default_modalities() -> List[str]:
         return ["CR", "DX", "CT", "MR"]
@@ -165,6 +283,18 @@ class ProjectModel:
     def default_timeouts() -> NetworkTimeouts:
         return NetworkTimeouts(5, 30, 30, 60)
 
+    @staticmethod
+    def default_move_settings() -> MoveSettings:
+        return MoveSettings(True, 2, 6, "INSTANCE")
+
+    @staticmethod
+    def default_export_settings() -> ExportSettings:
+        return ExportSettings()
+
+    @staticmethod
+    def default_pixel_phi_settings() -> PixelPHISettings:
+        return PixelPHISettings()
+
     @staticmethod
     def default_logging_levels() -> LoggingLevels:
         return LoggingLevels(INFO, WARNING, False, False, False)
@@ -178,6 +308,7 @@ class ProjectModel:
     project_name: str = field(default_factory=default_project_name)
     uid_root: str = field(default_factory=default_uid_root)
     remove_pixel_phi: bool = False
+    pixel_phi_settings: PixelPHISettings = field(default_factory=default_pixel_phi_settings)
     storage_dir: Path = field(default_factory=default_storage_dir, metadata=path_field)
     modalities: List[str] = field(default_factory=default_modalities)
     storage_classes: List[str] = field(default_factory=default_storage_classes)  # re-initialised in post_init
@@ -186,9 +317,13 @@ class ProjectModel:
     scu: DICOMNode = field(default_factory=default_local_server)
     scp: DICOMNode = field(default_factory=default_local_server)
     remote_scps: Dict[str, DICOMNode] = field(default_factory=default_remote_scps)
+    # names of additional remote_scps for federated query:
+    federated_scps: List[str] = field(default_factory=default_federated_scps)
     export_to_AWS: bool = False
     aws_cognito: AWSCognito = field(default_factory=default_aws_cognito)
     network_timeouts: NetworkTimeouts = field(default_factory=default_timeouts)
+    move_settings: MoveSettings = field(default_factory=default_move_settings)
+    export_settings: ExportSettings = field(default_factory=default_export_settings)
     anonymizer_script_path: Path = field(default=Path("assets/scripts/default-anonymizer.script"), metadata=path_field)
 
     def __post_init__(self):
@@ -8,11 +8,13 @@ import os
 import tkinter as tk
 from datetime import datetime
 from queue import Empty, Full, Queue
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 
 import customtkinter as ctk
 
 from anonymizer.controller.project import (
+    ARCHIVE_EXPORT_DEST,
+    AWS_EXPORT_DEST,
     ExportPatientsRequest,
     ExportPatientsResponse,
     ProjectController,
@@ -59,6 +61,7 @@ class ExportView(tk.Toplevel):
         _select_all_button (ctk.CTkButton): The button for selecting all patients.
         _clear_selection_button (ctk.CTkButton): The button for clearing the selection.
         _export_button (ctk.CTkButton): The button for initiating export.
+        _archive_button (ctk.CTkButton): The button for initiating export to archive files in a selected directory.
     """
 
     ux_poll_export_response_interval = 500  # milli-seconds
@@ -98,6 +101,7 @@ class ExportView(tk.Toplevel):
 
         self.title(f"{title} -> {dest}")
         self._export_active = False
+        self._export_dest_name: str | None = None  # destination of the active or last export
         self._patients_processed = 0
         self._patients_to_process = 0
         self._patient_ids_to_export = []  # dynamically as per export progress
@@ -107,6 +111,10 @@ class ExportView(tk.Toplevel):
         self.bind("<Escape>", self._escape_keypress)
         self._create_widgets()
         self._enable_action_buttons()
+        # Show the progress of export queue retries while this view is open:
+        self._export_queue_ux_Q: Queue = Queue()
+        self._controller.export_queue_ux_Q = self._export_queue_ux_Q
+        self._tree.after(self.ux_poll_export_response_interval, self._monitor_export_queue_response)
 
     def _create_widgets(self):
         logger.info("_create_widgets")
@@ -238,6 +246,14 @@ class ExportView(tk.Toplevel):
         self._export_button.grid(row=0, column=10, padx=PAD, pady=PAD, sticky="e")
         self._export_button.focus_set()
 
+        self._archive_button = ctk.CTkButton(
+            self._status_frame,
+            width=ButtonWidth,
+            text=_("Export to Archive"),
+            command=self._archive_button_pressed,
+        )
+        self._archive_button.grid(row=0, column=11, padx=PAD, pady=PAD, sticky="e")
+
     def busy(self):
         return self._export_active
 
@@ -245,6 +261,7 @@ class ExportView(tk.Toplevel):
         logger.info("_disable_action_buttons")
         self._refresh_button.configure(state="disabled")
         self._export_button.configure(state="disabled")
+        self._archive_button.configure(state="disabled")
         self._select_all_button.configure(state="disabled")
         self._clear_selection_button.configure(state="disabled")
         self._cancel_export_button.configure(state="enabled")
@@ -254,6 +271,7 @@ class ExportView(tk.Toplevel):
         logger.info("_enable_action_buttons")
         self._refresh_button.configure(state="enabled")
         self._export_button.configure(state="enabled")
+        self._archive_button.configure(state="enabled")
         self._select_all_button.configure(state="enabled")
         self._clear_selection_button.configure(state="enabled")
         self._cancel_export_button.configure(state="disabled")
@@ -366,17 +384,7 @@ class ExportView(tk.Toplevel):
                 resp: ExportPatientsResponse = ux_Q.get_nowait()
                 logger.debug(f"{resp}")
 
-                # Update treeview item:
-                current_values = list(self._tree.item(resp.patient_id, "values"))
-                # Ensure there are strings in all current_values:
-                while len(current_values) < len(self._attr_map):
-                    current_values.append("")
-                # Format the date and time as "YYYY-MM-DD HH:MM:SS"
-                current_values[5] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                current_values[6] = str(resp.files_sent)
-                current_values[7] = resp.error if resp.error else ""
-                self._tree.item(resp.patient_id, values=current_values)
-                self._tree.see(resp.patient_id)
+                self._update_patient_export_row(resp)
 
                 # Check for completion or critical error of this patient's export
                 if resp.complete:
@@ -384,13 +392,11 @@ class ExportView(tk.Toplevel):
                     logger.debug(f"Patient {resp.patient_id} export complete")
                     self._patient_ids_to_export.remove(resp.patient_id)
                     self._tree.selection_remove(resp.patient_id)
-                    self._tree.item(resp.patient_id, tags="green")
                     self._patients_processed += 1
                     self._update_export_progress()
 
                 if resp.error:
                     self._tree.selection_remove(resp.patient_id)
-                    self._tree.item(resp.patient_id, tags="red")
 
             except Empty:
                 logger.info("Queue is empty")
@@ -411,7 +417,10 @@ class ExportView(tk.Toplevel):
                 ):
                     # Select failed patients in treeview to retry export:
                     self._tree.selection_add(self._patient_ids_to_export)
-                    self._export_button_pressed()
+                    if self._export_dest_name == ARCHIVE_EXPORT_DEST:
+                        self._start_export(ARCHIVE_EXPORT_DEST)
+                    else:
+                        self._export_button_pressed()
                     return
 
         else:
@@ -422,6 +431,38 @@ class ExportView(tk.Toplevel):
                 ux_Q,
             )
 
+    def _update_patient_export_row(self, resp: ExportPatientsResponse):
+        # Update treeview item:
+        current_values = list(self._tree.item(resp.patient_id, "values"))
+        # Ensure there are strings in all current_values:
+        while len(current_values) < len(self._attr_map):
+            current_values.append("")
+        # Format the date and time as "YYYY-MM-DD HH:MM:SS"
+        current_values[5] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        current_values[6] = str(resp.files_sent)
+        current_values[7] = resp.error if resp.error else ""
+        if resp.retry:
+            current_values[7] += " - " + _("Retry scheduled")
+        self._tree.item(resp.patient_id, values=current_values)
+        self._tree.see(resp.patient_id)
+        if resp.error:
+            self._tree.item(resp.patient_id, tags="red")
+        elif resp.complete:
+            self._tree.item(resp.patient_id, tags="green")
+
+    def _monitor_export_queue_response(self):
+        if not self.winfo_exists():  # view closed
+            return
+        while not self._export_queue_ux_Q.empty():
+            try:
+                resp: ExportPatientsResponse = self._export_queue_ux_Q.get_nowait()
+                if self._tree.exists(resp.patient_id):
+                    self._update_patient_export_row(resp)
+            except Empty:
+                break
+
+        self._tree.after(self.ux_poll_export_response_interval, self._monitor_export_queue_response)
+
     def _enter_keypress(self, event):
         logger.info("_enter_pressed")
         self._export_button_pressed()
@@ -450,6 +491,42 @@ class ExportView(tk.Toplevel):
         self._export_button.configure(text_color="light green")
         self._parent._send_button.configure(text_color="light green")
 
+        self._start_export(AWS_EXPORT_DEST if self._export_to_AWS else _("EXPORT"))
+
+    def _archive_button_pressed(self):
+        logger.info("Export to Archive button pressed")
+        if self._export_active:
+            logger.error("Selection disabled, export is active")
+            return
+
+        self._error_frame.grid_remove()
+
+        export_settings = self._controller.model.export_settings
+        archive_dir = filedialog.askdirectory(
+            title=_("Select Archive Export Directory"),
+            initialdir=export_settings.archive_dir or os.path.expanduser("~"),
+            mustexist=True,
+            parent=self,
+        )
+        if not archive_dir:
+            return
+
+        if export_settings.archive_dir != archive_dir:
+            export_settings.archive_dir = archive_dir
+            self._controller.save_model()
+
+        self._start_export(ARCHIVE_EXPORT_DEST)
+
+    def _start_export(self, dest_name: str):
+        if self._controller.bulk_export_active():
+            logger.error("Export already active, eg. queued export retry")
+            messagebox.showerror(
+                title=_("Export Error"),
+                message=_("An export is already active, please try again later."),
+                parent=self,
+            )
+            return
+
         self._patient_ids_to_export = list(self._tree.selection())
 
         self._patients_to_process = len(self._patient_ids_to_export)
@@ -474,15 +551,25 @@ class ExportView(tk.Toplevel):
         ux_Q = Queue()
 
         # Export all selected patients using a background thread pool
-        self._controller.export_patients_ex(
+        self._export_dest_name = dest_name
+        if not self._controller.export_patients_ex(
             ExportPatientsRequest(
-                "AWS" if self._export_to_AWS else _("EXPORT"),
+                dest_name,
                 self._patient_ids_to_export.copy(),
                 ux_Q,
             )
-        )
+        ):
+            # Export queue retry started since the check above:
+            self._export_active = False
+            self._enable_action_buttons()
+            messagebox.showerror(
+                title=_("Export Error"),
+                message=_("An export is already active, please try again later."),
+                parent=self,
+            )
+            return
 
-        logger.info(f"Export of {self._patients_to_process} patients initiated")
+        logger.info(f"Export of {self._patients_to_process} patients to {dest_name} initiated")
 
         # Trigger the queue monitor
         self._tree.after(
@@ -504,5 +591,7 @@ class ExportView(tk.Toplevel):
             else:
                 self._controller.abort_export()
 
+        if self._controller.export_queue_ux_Q is self._export_queue_ux_Q:
+            self._controller.export_queue_ux_Q = None
         self.grab_release()
         self.destroy()
@@ -216,7 +216,10 @@ class ImportStudiesDialog(tk.Toplevel):
                 mr: MoveStudiesRequest = MoveStudiesRequest(
                     self._scp_name, self._controller.model.scu.aet, self._move_level, self.studies
                 )
-                self._controller.move_studies_ex(mr)
+                if not self._controller.move_studies_ex(mr):
+                    self._import_status_label.configure(text=_("Move already active, try again later"))
+                    self._cancel_button.configure(text=_("Close"))
+                    return
                 study_or_studies = _("Study") if len(self.studies) == 1 else _("Studies")
                 self._import_status_label.configure(
                     text=_("Importing")
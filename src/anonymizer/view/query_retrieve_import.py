@@ -439,6 +439,8 @@ class QueryView(tk.Toplevel):
                         results.append(resp.study_result)
                     if resp.status.Status == C_SUCCESS:
                         self._query_active = False
+                        if "ErrorComment" in resp.status:  # federated query, some sources failed
+                            logger.warning(f"Query incomplete: {resp.status.ErrorComment}")
                 else:
                     assert resp.status.Status == C_FAILURE
                     self._query_active = False
@@ -1,7 +1,6 @@
 import difflib
 import gc
 import logging
-import os
 import tkinter as tk
 from enum import StrEnum, auto
 from pathlib import Path
@@ -10,10 +9,10 @@ from pprint import pformat
 import customtkinter as ctk
 import numpy as np
 import torch
-from easyocr import Reader
 from pydicom import Dataset
 
 from anonymizer.controller.create_projections import apply_windowing, get_wl_ww, load_series_frames, save_series_frames
+from anonymizer.controller.ocr_service import get_ocr_service
 from anonymizer.controller.remove_pixel_phi import (
     OCRText,
     UserRectangle,
@@ -48,7 +47,7 @@ class SeriesView(tk.Toplevel):
 
         self._anon_model = anon_model
         self._series_path = series_path
-        self._ocr_reader = None  # only created if user clicks "Detect Text" button
+        self._ocr_service = get_ocr_service()  # OCR models only loaded if user clicks "Detect Text" button
         self.edit_context: EditContext = EditContext.FRAME
         self.detected_text: dict[int, list[OCRText]] = {}  # Store all detected text per frame
         self._whitelist_changed = False
@@ -280,32 +279,6 @@ class SeriesView(tk.Toplevel):
         )
         return ds, np.concatenate([projections, series_frames], axis=0)
 
-    def initialise_ocr(self):
-        # Once-off initialisation of easyocr.Reader (and underlying pytorch model):
-        # if pytorch models not downloaded yet, they will be when Reader initializes
-        logging.info("OCR Reader initialising...")
-
-        model_dir = Path("assets") / "ocr" / "model"  # Default is: Path("~/.EasyOCR/model").expanduser()
-        if not model_dir.exists():
-            # TODO: notify user via status bar or messagebox
-            logger.warning(
-                f"EasyOCR model directory: {model_dir}, does not exist, EasyOCR will create it, models still to be downloaded..."
-            )
-        else:
-            logger.info(f"EasyOCR downloaded models: {os.listdir(model_dir)}")
-
-        # Initialize the EasyOCR reader with the desired language(s), if models are not in model_dir, they will be downloaded
-        # TODO: use thread for this if models not downloaded yet, provide status updates during download:
-        # TODO: optimize so reader is only initialised once - reference passed by ProjectionView or IndexView or global?
-        self._ocr_reader = Reader(
-            lang_list=["en", "de", "fr", "es"],
-            gpu=True,
-            model_storage_directory=model_dir,
-            verbose=True,
-        )
-
-        logging.info("OCR Reader initialised successfully")
-
     def filter_text_data(self, frame_index: int, similarity_threshold: float = 0.75) -> list[OCRText]:
         """
         Filters the text_data for a frame based on fuzzy matching against the whitelist.
@@ -356,20 +329,19 @@ class SeriesView(tk.Toplevel):
     def process_single_frame_ocr(self, frame_index: int):
         """Performs OCR on a single frame, filters, and stores results."""
         with torch.no_grad():
-            if self._ocr_reader:
-                results = detect_text(
-                    pixels=apply_windowing(
-                        self.image_viewer.current_wl,
-                        self.image_viewer.current_ww,
-                        self.image_viewer.images[frame_index],
-                    ),
-                    ocr_reader=self._ocr_reader,
-                    draw_boxes_and_text=False,
-                )
-                if results:
-                    logger.debug(f"OCR Results:\n{pformat(results)}")
-                    self.detected_text[frame_index] = results
-                    self.draw_text_overlay(frame_index)
+            results = detect_text(
+                pixels=apply_windowing(
+                    self.image_viewer.current_wl,
+                    self.image_viewer.current_ww,
+                    self.image_viewer.images[frame_index],
+                ),
+                ocr_reader=self._ocr_service.interactive(),  # not queued behind the pixel PHI workers
+                draw_boxes_and_text=False,
+            )
+            if results:
+                logger.debug(f"OCR Results:\n{pformat(results)}")
+                self.detected_text[frame_index] = results
+                self.draw_text_overlay(frame_index)
 
     def detect_text_for_series(self):
         """Detects text in all frames of the series."""
@@ -383,12 +355,8 @@ class SeriesView(tk.Toplevel):
     def detect_text_button_clicked(self):
         logger.info("Detecting text...")
 
-        if self._ocr_reader is None:
-            self.initialise_ocr()
-
-        # Check if GPU available
-        logger.info(f"Apple MPS (Metal) GPU Available: {torch.backends.mps.is_available()}")
-        logger.info(f"CUDA GPU Available: {torch.cuda.is_available()}")
+        if not self._ocr_service.loaded():
+            self.update_status(_("OCR Reader initialising") + "...")
 
         if self.edit_context == EditContext.FRAME:
             self.update_status(_("OCR on current frame") + "...")
@@ -429,9 +397,6 @@ class SeriesView(tk.Toplevel):
     def remove_text_button_clicked(self):
         logger.debug(f"Removing text, current edit context={self.edit_context}")
 
-        if self._ocr_reader is None:
-            self.initialise_ocr()
-
         if self.edit_context == EditContext.FRAME:
             ndx = self.image_viewer.current_image_index
             ocr_texts = self.image_viewer.overlay_data[ndx].ocr_texts
@@ -569,12 +534,6 @@ class SeriesView(tk.Toplevel):
         if hasattr(self, "image_viewer") and self.image_viewer:
             self.image_viewer.clear_cache()
 
-        if self._ocr_reader:
-            # Attempt to unload the model
-            del self._ocr_reader
-            self._ocr_reader = None
-            gc.collect()
-
         self._frames = None
         self._ds = None
         self._projection = None
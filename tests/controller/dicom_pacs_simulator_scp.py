@@ -289,7 +289,9 @@ def _handle_move(event, storage_dir: str, known_aet_dict: dict):
 
     if ds.QueryRetrieveLevel == "STUDY":
         if "StudyInstanceUID" in ds:
-            matching = [inst for inst in instances if inst.StudyInstanceUID == ds.StudyInstanceUID]
+            # List of UID matching:
+            study_uids = ds.StudyInstanceUID if ds["StudyInstanceUID"].VM > 1 else [ds.StudyInstanceUID]
+            matching = [inst for inst in instances if inst.StudyInstanceUID in study_uids]
 
     elif ds.QueryRetrieveLevel == "SERIES":
         if "StudyInstanceUID" in ds and "SeriesInstanceUID" in ds:
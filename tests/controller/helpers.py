@@ -1,4 +1,5 @@
 import os
+import time
 from pathlib import Path
 from queue import Queue
 
@@ -83,8 +84,12 @@ def request_to_move_studies_from_scp_to_local_scp(
     req: MoveStudiesRequest = MoveStudiesRequest(
         scp_name=scp.aet, dest_scp_ae=LocalStorageSCP.aet, level=level, studies=studies
     )
-    controller.move_studies_ex(mr=req)
-    return True
+    # The move lock of a previous move is released just after its studies are moved:
+    for __ in range(100):
+        if not controller.bulk_move_active():
+            break
+        time.sleep(0.1)
+    return controller.move_studies_ex(mr=req)
 
 
 def verify_files_sent_to_pacs_simulator(dsets: list[Dataset], tempdir: str, controller: ProjectController):
@@ -125,7 +130,13 @@ def verify_files_sent_to_pacs_simulator(dsets: list[Dataset], tempdir: str, cont
 def export_patients_from_local_storage_to_test_pacs(patient_ids: list[str], controller) -> bool:
     ux_Q: Queue[ExportPatientsResponse] = Queue()
     req: ExportPatientsRequest = ExportPatientsRequest(PACSSimulatorSCP.aet, patient_ids, ux_Q)
-    controller.export_patients_ex(req)
+    # The export lock of a previous export is released just after its last response:
+    for __ in range(50):
+        if not controller.bulk_export_active():
+            break
+        time.sleep(0.1)
+    if not controller.export_patients_ex(req):
+        return False
     export_count = 0
     while export_count != len(patient_ids):
         try:
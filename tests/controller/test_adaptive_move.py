@@ -0,0 +1,132 @@
+import pytest
+
+from src.anonymizer.controller import adaptive_move
+from src.anonymizer.controller.adaptive_move import (
+    AdaptiveMoveController,
+    MoveLevel,
+    MoveOutcome,
+    MoveOutcomeType,
+)
+
+
+def test_move_level_from_str() -> None:
+    """Test conversion of MoveStudiesRequest level strings to MoveLevel"""
+    assert MoveLevel.from_str("STUDY", MoveLevel.SERIES) == MoveLevel.STUDY
+    assert MoveLevel.from_str("series", MoveLevel.STUDY) == MoveLevel.SERIES
+    assert MoveLevel.from_str("IMAGE", MoveLevel.SERIES) == MoveLevel.INSTANCE
+    assert MoveLevel.from_str("INSTANCE", MoveLevel.SERIES) == MoveLevel.INSTANCE
+    assert MoveLevel.from_str(None, MoveLevel.SERIES) == MoveLevel.SERIES
+    assert MoveLevel.from_str("UNKNOWN", MoveLevel.SERIES) == MoveLevel.SERIES
+
+
+def test_move_level_from_translated_str(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test conversion of the translated move levels of the QueryView to MoveLevel"""
+    german = {"STUDY": "STUDIE", "SERIES": "SERIE", "INSTANCE": "INSTANZ", "IMAGE": "BILD"}
+    monkeypatch.setattr(adaptive_move, "_", lambda msg: german.get(msg, msg))
+    assert MoveLevel.from_str("STUDIE", MoveLevel.SERIES) == MoveLevel.STUDY
+    assert MoveLevel.from_str("SERIE", MoveLevel.STUDY) == MoveLevel.SERIES
+    assert MoveLevel.from_str("INSTANZ", MoveLevel.SERIES) == MoveLevel.INSTANCE
+    assert MoveLevel.from_str("BILD", MoveLevel.SERIES) == MoveLevel.INSTANCE
+
+
+def test_move_outcome_type() -> None:
+    """Test classification of ProjectController move error messages"""
+    assert MoveOutcome("1.2", MoveLevel.STUDY, 1, 10, None).outcome_type() == MoveOutcomeType.SUCCESS
+    assert (
+        MoveOutcome("1.2", MoveLevel.STUDY, 1, 0, "All Instances already imported").outcome_type()
+        == MoveOutcomeType.SKIPPED
+    )
+    assert (
+        MoveOutcome("1.2", MoveLevel.STUDY, 1, 0, "C-MOVE@Study[1.2] Import Timeout").outcome_type()
+        == MoveOutcomeType.TIMEOUT
+    )
+    assert (
+        MoveOutcome("1.2", MoveLevel.STUDY, 1, 0, "Connection timed out or aborted moving study_uid").outcome_type()
+        == MoveOutcomeType.TIMEOUT
+    )
+    assert (
+        MoveOutcome("1.2", MoveLevel.STUDY, 1, 0, "C-MOVE@Study[1.2] failure, status:0XC000: Failed").outcome_type()
+        == MoveOutcomeType.FAILURE_STATUS
+    )
+    assert (
+        MoveOutcome(
+            "1.2", MoveLevel.STUDY, 1, 0, "C-MOVE@Study[1.2] failure, status:0XA801: Move destination unknown"
+        ).outcome_type()
+        == MoveOutcomeType.PERMANENT_ERROR
+    )
+
+
+def test_invalid_controller_arguments() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveMoveController(initial_concurrency=1, max_concurrency=0)
+    with pytest.raises(ValueError):
+        AdaptiveMoveController(initial_concurrency=1, max_concurrency=4, decrease_factor=1.5)
+
+
+def test_additive_increase_on_success() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=2, max_concurrency=4)
+    for _ in range(5):
+        assert controller.record(MoveOutcome("1.2", MoveLevel.SERIES, 1.0, 10, None)) is None
+    assert controller.concurrency == 4  # limited by max_concurrency
+    assert controller.avg_throughput == pytest.approx(10.0)
+
+
+def test_multiplicative_decrease_and_fallback_on_timeout() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=4, max_concurrency=8)
+    outcome = MoveOutcome("1.2", MoveLevel.STUDY, 30.0, 0, "C-MOVE@Study[1.2] Import Timeout")
+    assert controller.record(outcome) == MoveLevel.SERIES
+    assert controller.concurrency == 2
+
+    outcome = MoveOutcome("1.2", MoveLevel.SERIES, 30.0, 0, "C-MOVE@Series[1.2.3] Import Timeout")
+    assert controller.record(outcome) == MoveLevel.INSTANCE
+    assert controller.concurrency == 1
+
+    outcome = MoveOutcome("1.2", MoveLevel.INSTANCE, 30.0, 0, "C-MOVE@Instance[1.2.3.4] Import Timeout")
+    assert controller.record(outcome) is None
+    assert controller.concurrency == 1  # limited by min_concurrency
+
+
+def test_decrease_on_degraded_throughput() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=2, max_concurrency=8)
+    controller.record(MoveOutcome("1.1", MoveLevel.SERIES, 1.0, 100, None))
+    assert controller.concurrency == 3
+    controller.record(MoveOutcome("1.2", MoveLevel.SERIES, 10.0, 100, None))
+    assert controller.concurrency == 1
+
+
+def test_fallback_limited_by_lowest_level() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=2, max_concurrency=4, lowest_level=MoveLevel.SERIES)
+    outcome = MoveOutcome("1.2", MoveLevel.SERIES, 30.0, 0, "C-MOVE@Series[1.2.3] Import Timeout")
+    assert controller.record(outcome) is None
+
+
+def test_no_fallback_on_permanent_error() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=2, max_concurrency=4)
+    outcome = MoveOutcome("1.2", MoveLevel.STUDY, 1.0, 0, "C-MOVE@Study[1.2] failure, status:0XA801: Unknown")
+    assert controller.record(outcome) is None
+    assert controller.concurrency == 2
+
+
+def test_not_adaptive() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=2, max_concurrency=2, adaptive=False)
+    assert controller.record(MoveOutcome("1.2", MoveLevel.STUDY, 30.0, 0, "Import Timeout")) is None
+    assert controller.record(MoveOutcome("1.2", MoveLevel.STUDY, 1.0, 10, None)) is None
+    assert controller.concurrency == 2
+
+
+def test_record_batch_adapts_concurrency_once() -> None:
+    controller = AdaptiveMoveController(initial_concurrency=2, max_concurrency=8)
+    outcomes = [MoveOutcome(f"1.{i}", MoveLevel.STUDY, 10.0, 10, None) for i in range(4)]
+    assert controller.record_batch(outcomes) == [None] * 4
+    assert controller.concurrency == 3  # one increase for the single C-MOVE request
+    assert controller.avg_throughput == pytest.approx(4.0)  # 40 instances in 10s
+
+    # Failed studies of a batch fallback individually, concurrency decreased once:
+    outcomes = [
+        MoveOutcome("1.1", MoveLevel.STUDY, 30.0, 10, None),
+        MoveOutcome("1.2", MoveLevel.STUDY, 30.0, 0, "C-MOVE@Study[1.2] Import Timeout"),
+        MoveOutcome("1.3", MoveLevel.STUDY, 30.0, 0, "All Instances already imported"),
+        MoveOutcome("1.4", MoveLevel.STUDY, 30.0, 0, "C-MOVE@Study[1.4] Import Timeout"),
+    ]
+    assert controller.record_batch(outcomes) == [None, MoveLevel.SERIES, None, MoveLevel.SERIES]
+    assert controller.concurrency == 1
@@ -2,6 +2,7 @@
 # use pytest from terminal to show full logging output
 
 import os
+import threading
 import pytest
 from copy import deepcopy
 from pathlib import Path
@@ -11,8 +12,10 @@ from pydicom import dcmread
 from pydicom.data import get_testdata_file
 from pydicom.dataset import Dataset
 
+from anonymizer.controller import anonymizer as anonymizer_module
 from anonymizer.controller.anonymizer import AnonymizerController, QuarantineDirectories
 from anonymizer.controller.project import ProjectController
+from anonymizer.model.project import PIXEL_PHI_BLACKOUT, PIXEL_PHI_IN_MEMORY_HOLD, PixelPHIRule
 from tests.controller.dicom_test_files import (
     cr1_filename,
     hash_cr1_StudyInstanceUID,
@@ -347,6 +350,78 @@ def test_anonymize_dataset_with_PatientID_1_study(controller):
     assert phi.patient_id == phi_ds.PatientID
 
 
+def test_anonymize_remove_pixel_phi_in_memory_before_single_write(controller: ProjectController):
+    controller.anonymizer.stop()
+    model = controller.model
+    model.remove_pixel_phi = True
+    model.pixel_phi_settings.workers = 1
+    model.pixel_phi_settings.in_memory = PIXEL_PHI_IN_MEMORY_HOLD
+    model.pixel_phi_settings.rules = [PixelPHIRule(PIXEL_PHI_BLACKOUT, modality="CT", blackout_areas=[[0, 0, 128, 20]])]
+    anonymizer = AnonymizerController(model)
+    try:
+        ds = get_testdata_file(ct_small_filename, read=True)
+        assert isinstance(ds, Dataset)
+        phi_instance_uid = ds.SOPInstanceUID
+        anonymizer.anonymize_dataset_ex(LocalSCU, ds)
+        sleep(0.5)
+        anon_filename = anonymizer.local_storage_path(model.images_dir(), ds)
+        for __ in range(50):
+            if anon_filename.exists() and anonymizer.idle():
+                break
+            sleep(0.1)
+        anon_ds = dcmread(anon_filename)
+        assert anon_ds.PatientID == model.site_id + "-000001"
+        assert not anon_ds.pixel_array[:20].any()
+        assert anon_ds.pixel_array[20:].any()
+        assert anonymizer.model.instance_received(phi_instance_uid)
+        assert anonymizer.model.get_anon_uid(phi_instance_uid) == anon_ds.SOPInstanceUID
+    finally:
+        anonymizer.stop()
+
+
+def test_anonymize_held_dataset_quarantined_if_pixel_phi_removal_fails(
+    controller: ProjectController, monkeypatch: pytest.MonkeyPatch
+):
+    controller.anonymizer.stop()
+    model = controller.model
+    model.remove_pixel_phi = True
+    model.pixel_phi_settings.workers = 1
+    model.pixel_phi_settings.in_memory = PIXEL_PHI_IN_MEMORY_HOLD
+    model.pixel_phi_settings.rules = [PixelPHIRule(PIXEL_PHI_BLACKOUT, modality="CT", blackout_areas=[[0, 0, 128, 20]])]
+    anonymizer = AnonymizerController(model)
+    try:
+        ds = get_testdata_file(ct_small_filename, read=True)
+        assert isinstance(ds, Dataset)
+        phi_instance_uid = ds.SOPInstanceUID
+
+        removal_calls = []
+        release_removal = threading.Event()
+
+        def remove_pixel_phi_fails(*args, **kwargs):
+            removal_calls.append(args)
+            release_removal.wait(5)
+            raise RuntimeError("Pixel PHI removal failed")
+
+        monkeypatch.setattr(anonymizer_module, "remove_pixel_phi_from_dataset", remove_pixel_phi_fails)
+        duplicate_ds = deepcopy(ds)
+        assert anonymizer.anonymize(LocalSCU, ds) is None
+        # Not recorded as received while held, but duplicates are dropped until it is written:
+        assert not anonymizer.model.instance_received(phi_instance_uid)
+        assert anonymizer.instance_received(phi_instance_uid)
+        assert anonymizer.anonymize(LocalSCU, duplicate_ds) is None
+        release_removal.set()
+        anonymizer._anon_px_Q.join()
+        assert len(removal_calls) == 1
+
+        assert not anonymizer.local_storage_path(model.images_dir(), ds).exists()
+        qpath = Path(anonymizer.get_quarantine_path(), QuarantineDirectories.PIXEL_PHI_ERROR.value)
+        assert anonymizer.local_storage_path(qpath, ds).exists()
+        assert not anonymizer.instance_received(phi_instance_uid)
+        assert anonymizer.model.get_anon_uid(phi_instance_uid) is None
+    finally:
+        anonymizer.stop()
+
+
 # QUARANTINE Tests:
 def test_anonymize_file_not_found(temp_dir: str, controller: ProjectController):
     anonymizer: AnonymizerController = controller.anonymizer
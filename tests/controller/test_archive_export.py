@@ -0,0 +1,132 @@
+import json
+import os
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from queue import Queue
+
+import pytest
+
+from anonymizer.controller.archive_export import (
+    INDEX_FILENAME,
+    PARTIAL_SUFFIX,
+    ArchiveFile,
+    plan_archive_parts,
+    write_archive_part,
+)
+from anonymizer.controller.project import (
+    ARCHIVE_EXPORT_DEST,
+    ExportPatientsRequest,
+    ExportPatientsResponse,
+    ProjectController,
+)
+from tests.controller.dicom_test_files import CT_STUDY_1_SERIES_4_IMAGES, MR_STUDY_3_SERIES_11_IMAGES
+from tests.controller.dicom_test_nodes import LocalStorageSCP
+from tests.controller.helpers import send_files_to_scp
+
+
+def create_archive_files(base_dir: str, patients: int, files_per_patient: int, size: int) -> list[ArchiveFile]:
+    files = []
+    for p in range(patients):
+        for i in range(files_per_patient):
+            arcname = f"PT{p}/1.2.{p}/1.2.{p}.1/1.2.{p}.1.{i}.dcm"
+            path = Path(base_dir, "images", arcname)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(bytes([p]) * size)
+            files.append(ArchiveFile(str(path), arcname, size))
+    return files
+
+
+def test_plan_archive_parts_split_at_max_size(temp_dir: str):
+    files = create_archive_files(temp_dir, patients=2, files_per_patient=5, size=1000)
+    parts = plan_archive_parts(files, Path(temp_dir), "test", "zip", max_size=3000)
+    assert [len(part.files) for part in parts] == [3, 3, 3, 1]
+    assert [part.path.name for part in parts] == [f"test_{n:03d}.zip" for n in range(1, 5)]
+    # Patient PT0 files straddle parts 1 & 2:
+    assert parts[1].patient_ids() == ["PT0", "PT1"]
+
+    assert len(plan_archive_parts(files, Path(temp_dir), "test", "zip", max_size=0)) == 1
+    assert plan_archive_parts([], Path(temp_dir), "test", "zip", max_size=0) == []
+    with pytest.raises(ValueError):
+        plan_archive_parts(files, Path(temp_dir), "test", "rar", max_size=0)
+
+
+def test_write_zip_archive_part_with_index(temp_dir: str):
+    files = create_archive_files(temp_dir, patients=2, files_per_patient=3, size=10000)
+    parts = plan_archive_parts(files, Path(temp_dir, "archive"), "test", "zip", max_size=0)
+    written = []
+    assert write_archive_part(
+        parts[0], 1, 6, header_reader=lambda path: {"Modality": "CT"}, on_file_written=written.append
+    )
+    assert written == files
+
+    with zipfile.ZipFile(parts[0].path) as zf:
+        assert zf.namelist() == [file.arcname for file in files] + [INDEX_FILENAME]
+        assert zf.read(files[0].arcname) == Path(files[0].path).read_bytes()
+        index = json.loads(zf.read(INDEX_FILENAME))
+
+    assert os.path.getsize(parts[0].path) < sum(file.size for file in files)
+    assert index["part"] == 1 and index["parts"] == 1
+    assert [patient["PatientID"] for patient in index["patients"]] == ["PT0", "PT1"]
+    series = index["patients"][0]["studies"][0]["series"][0]
+    assert series["Modality"] == "CT"
+    assert [instance["file"] for instance in series["instances"]] == [file.arcname for file in files[:3]]
+
+
+def test_write_archive_part_abort_deletes_partial(temp_dir: str):
+    files = create_archive_files(temp_dir, patients=1, files_per_patient=4, size=1000)
+    part = plan_archive_parts(files, Path(temp_dir, "archive"), "test", "zip", max_size=0)[0]
+    written = []
+    assert not write_archive_part(part, 1, 6, abort=lambda: len(written) == 2, on_file_written=written.append)
+    assert len(written) == 2
+    assert not part.path.exists()
+    assert not part.path.with_name(part.path.name + PARTIAL_SUFFIX).exists()
+
+
+def test_write_tar_zst_archive_part(temp_dir: str):
+    zstandard = pytest.importorskip("zstandard")
+    files = create_archive_files(temp_dir, patients=1, files_per_patient=3, size=10000)
+    part = plan_archive_parts(files, Path(temp_dir, "archive"), "test", "tar.zst", max_size=0)[0]
+    assert write_archive_part(part, 1, 3, zstd_threads=2)
+
+    with (
+        open(part.path, "rb") as fh,
+        zstandard.ZstdDecompressor().stream_reader(fh) as reader,
+        tarfile.open(fileobj=reader, mode="r|") as tar,
+    ):
+        names = [member.name for member in tar]
+    assert names == [file.arcname for file in files] + [INDEX_FILENAME]
+
+
+def test_export_2_patients_to_zip_archive_parts(temp_dir: str, controller: ProjectController):
+    archive_dir = Path(temp_dir, "archive")
+    controller.model.export_settings.archive_dir = str(archive_dir)
+    controller.model.export_settings.archive_max_size = 2 * 1024 * 1024
+    # Send Patient 1: 1 CT study with 4 files & Patient 2: 1 MR study with 11 files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    send_files_to_scp(MR_STUDY_3_SERIES_11_IMAGES, LocalStorageSCP, controller)
+    time.sleep(1)
+    patient_ids = [controller.model.site_id + "-000001", controller.model.site_id + "-000002"]
+
+    ux_Q: Queue[ExportPatientsResponse] = Queue()
+    controller.export_patients_ex(ExportPatientsRequest(ARCHIVE_EXPORT_DEST, patient_ids, ux_Q))
+    files_sent: dict[str, int] = {}
+    while len(files_sent) < len(patient_ids):
+        resp: ExportPatientsResponse = ux_Q.get(timeout=10)
+        assert not resp.error
+        if resp.complete:
+            files_sent[resp.patient_id] = resp.files_sent
+    assert files_sent == {patient_ids[0]: 4, patient_ids[1]: 11}
+    time.sleep(0.5)
+    assert not controller.bulk_export_active()
+
+    archived_names = []
+    for archive_path in sorted(archive_dir.iterdir()):
+        assert archive_path.suffix == ".zip"
+        with zipfile.ZipFile(archive_path) as zf:
+            archived_names += [name for name in zf.namelist() if name != INDEX_FILENAME]
+            index = json.loads(zf.read(INDEX_FILENAME))
+            assert index["parts"] == len(list(archive_dir.iterdir()))
+    assert len(archived_names) == 15
+    assert {Path(name).parts[0] for name in archived_names} == set(patient_ids)
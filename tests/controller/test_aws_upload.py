@@ -1,13 +1,22 @@
 import os
+import time
+from concurrent.futures import CancelledError
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from queue import Queue
+
+import boto3
 import pytest
 
 from botocore.exceptions import NoCredentialsError
 from dotenv import load_dotenv
 from pydicom.data import get_testdata_file
 
-from anonymizer.controller.project import ProjectController
-from tests.controller.dicom_test_files import ct_small_filename
+from anonymizer.controller.project import ExportPatientsRequest, ExportPatientsResponse, ProjectController
+from anonymizer.controller.s3_export import S3ExportEngine
+from tests.controller.dicom_test_files import CT_STUDY_1_SERIES_4_IMAGES, ct_small_filename
+from tests.controller.dicom_test_nodes import LocalStorageSCP
+from tests.controller.helpers import send_files_to_scp
 
 # Load environment variables from .env file (for username/password for AWS upload)
 load_dotenv()
@@ -78,3 +87,99 @@ def test_send_1_dicomfile_to_AWS_S3_and_list_objects(temp_dir: str, controller:
             filenames.extend([os.path.basename(obj["Key"]) for obj in page["Contents"]])
 
     assert ct_small_filename in filenames
+
+
+# Local S3 stand-in tests, using moto to mock S3:
+MB = 1024 * 1024
+TEST_BUCKET = "test-bucket"
+
+
+@pytest.fixture
+def local_s3(monkeypatch):
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+    with moto.mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket=TEST_BUCKET)
+        yield s3
+
+
+def create_test_files(temp_dir: str, sizes: list[int]) -> list[str]:
+    file_paths = []
+    for i, size in enumerate(sizes):
+        file_path = os.path.join(temp_dir, f"file_{i}.bin")
+        with open(file_path, "wb") as f:
+            f.write(os.urandom(size))
+        file_paths.append(file_path)
+    return file_paths
+
+
+def test_s3_export_engine_concurrent_multipart_upload(temp_dir: str, local_s3):
+    sizes = [12 * MB, 1024, 2048, 6 * MB]
+    file_paths = create_test_files(temp_dir, sizes)
+    uploads = [(file_path, f"prefix/{Path(file_path).name}") for file_path in file_paths]
+
+    engine = S3ExportEngine(max_concurrency=4, multipart_threshold=5 * MB, multipart_chunksize=5 * MB)
+    progress = []
+    uploaded = []
+    engine.upload_files(local_s3, TEST_BUCKET, uploads, progress.append, uploaded.append)
+    engine.shutdown()
+
+    assert uploaded == file_paths
+    assert sum(progress) == sum(sizes)
+
+    response = local_s3.list_objects_v2(Bucket=TEST_BUCKET, Prefix="prefix/")
+    assert {obj["Key"]: obj["Size"] for obj in response["Contents"]} == {
+        key: size for (_, key), size in zip(uploads, sizes, strict=True)
+    }
+    # Files larger than multipart threshold uploaded in parts:
+    assert "-" in local_s3.head_object(Bucket=TEST_BUCKET, Key=uploads[0][1])["ETag"]
+    assert "-" not in local_s3.head_object(Bucket=TEST_BUCKET, Key=uploads[1][1])["ETag"]
+
+
+def test_s3_export_engine_cancel_aborts_multipart_upload(temp_dir: str, local_s3):
+    file_paths = create_test_files(temp_dir, [20 * MB])
+    engine = S3ExportEngine(max_concurrency=1, multipart_threshold=5 * MB, multipart_chunksize=5 * MB)
+
+    def cancel_on_first_progress(bytes_transferred: int) -> None:
+        engine.cancel()
+
+    with pytest.raises(CancelledError):
+        engine.upload_files(local_s3, TEST_BUCKET, [(file_paths[0], "large.bin")], cancel_on_first_progress)
+    engine.shutdown()
+
+    assert "Contents" not in local_s3.list_objects_v2(Bucket=TEST_BUCKET)
+    assert "Uploads" not in local_s3.list_multipart_uploads(Bucket=TEST_BUCKET)
+
+
+def test_export_patient_CT_study_to_local_s3(temp_dir: str, controller: ProjectController, local_s3):
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+
+    # Use local S3 client as cached AWS credentials:
+    controller.model.export_to_AWS = True
+    controller.model.aws_cognito.s3_bucket = TEST_BUCKET
+    controller._aws_credentials = {"Credentials": {}}
+    controller._aws_expiration_datetime = datetime.now(timezone.utc) + timedelta(hours=1)
+    controller._aws_user_directory = "test_user"
+    controller._s3 = local_s3
+
+    ux_Q: Queue[ExportPatientsResponse] = Queue()
+    controller.export_patients_ex(ExportPatientsRequest("AWS", [anon_pt_id], ux_Q))
+    while True:
+        resp: ExportPatientsResponse = ux_Q.get(timeout=10)
+        assert not resp.error
+        if resp.complete:
+            break
+
+    assert resp.files_sent == len(CT_STUDY_1_SERIES_4_IMAGES)
+    assert resp.bytes_sent == sum(
+        os.path.getsize(os.path.join(root, file))
+        for root, _, files in os.walk(controller.model.images_dir() / anon_pt_id)
+        for file in files
+    )
+    assert len(controller.AWS_get_instances(anon_pt_id)) == len(CT_STUDY_1_SERIES_4_IMAGES)
@@ -0,0 +1,95 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from anonymizer.controller.bandwidth import MB, ExportBandwidthLimiter, TokenBucket
+from anonymizer.model.project import BandwidthWindow
+
+
+def test_token_bucket_unlimited() -> None:
+    bucket = TokenBucket(0)
+    start = time.monotonic()
+    assert bucket.consume(100 * MB)
+    assert time.monotonic() - start < 0.05
+
+
+def test_token_bucket_rate() -> None:
+    bucket = TokenBucket(1 * MB)
+    start = time.monotonic()
+    assert bucket.consume(1 * MB)  # burst, bucket starts full
+    assert time.monotonic() - start < 0.1
+    assert bucket.consume(MB // 2)  # debt, wait for refill
+    assert time.monotonic() - start == pytest.approx(0.5, abs=0.15)
+
+
+def test_token_bucket_shared_across_threads() -> None:
+    bucket = TokenBucket(1 * MB)
+    bucket.consume(1 * MB)  # empty bucket
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.consume, args=(MB // 4,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 4 x 0.25MB at 1MB/s:
+    assert time.monotonic() - start == pytest.approx(1.0, abs=0.2)
+
+
+def test_token_bucket_abort() -> None:
+    bucket = TokenBucket(1 * MB)
+    start = time.monotonic()
+    assert not bucket.consume(10 * MB, abort=lambda: time.monotonic() - start > 0.2)
+    assert time.monotonic() - start < 0.5
+
+
+def test_export_bandwidth_limiter_schedule() -> None:
+    limiter = ExportBandwidthLimiter(
+        limits={"EXPORT": 10, "AWS": 20},
+        schedule=[
+            BandwidthWindow("08:00", "18:00", {"AWS": 2}),
+            BandwidthWindow("22:00", "06:00", {"EXPORT": 0}),
+        ],
+    )
+    assert limiter.current_limit("AWS", datetime(2026, 1, 5, 9, 30)) == 2
+    assert limiter.current_limit("AWS", datetime(2026, 1, 5, 18, 0)) == 20
+    assert limiter.current_limit("EXPORT", datetime(2026, 1, 5, 9, 30)) == 10
+    # Window wraps past midnight:
+    assert limiter.current_limit("EXPORT", datetime(2026, 1, 5, 23, 0)) == 0
+    assert limiter.current_limit("EXPORT", datetime(2026, 1, 5, 5, 59)) == 0
+    assert limiter.current_limit("EXPORT", datetime(2026, 1, 5, 6, 0)) == 10
+    assert limiter.current_limit("UNKNOWN", datetime(2026, 1, 5, 9, 30)) == 0
+
+
+def test_export_bandwidth_limiter_invalid_window_ignored() -> None:
+    limiter = ExportBandwidthLimiter(
+        limits={"EXPORT": 10},
+        schedule=[
+            BandwidthWindow("9:00", "18:00", {"EXPORT": 1}),  # not zero padded, "9:00" > "10:00"
+            BandwidthWindow("08:00", "25:00", {"EXPORT": 2}),
+        ],
+    )
+    assert limiter.current_limit("EXPORT", datetime(2026, 1, 5, 10, 0)) == 10
+    assert limiter.current_limit("EXPORT", datetime(2026, 1, 5, 23, 0)) == 10
+
+
+def test_export_bandwidth_limiter_large_file_does_not_block_other_workers() -> None:
+    limiter = ExportBandwidthLimiter(limits={"EXPORT": 1}, schedule=[])
+    finished: dict[str, float] = {}
+    start = time.monotonic()
+
+    def send(name: str, nbytes: int) -> None:
+        assert limiter.throttle("EXPORT", nbytes)
+        finished[name] = time.monotonic() - start
+
+    large = threading.Thread(target=send, args=("large", 3 * MB))
+    large.start()
+    time.sleep(0.1)
+    small = threading.Thread(target=send, args=("small", MB // 10))
+    small.start()
+    large.join()
+    small.join()
+    # Large file reserves 1 second of tokens at a time, small file is served after the large file's 2nd chunk:
+    assert finished["small"] == pytest.approx(1.1, abs=0.2)
+    assert finished["large"] == pytest.approx(2.1, abs=0.2)
@@ -1,6 +1,7 @@
 # UNIT TESTS for controller/dicom_storage_scp.py
 # use pytest from terminal to show full logging output: pytest --log-cli-level=DEBUG
 import os
+import threading
 import time
 
 import pytest
@@ -14,6 +15,7 @@ from pydicom.dataset import Dataset
 # )
 from anonymizer.controller.project import (
     InstanceUIDHierarchy,
+    MoveStudiesRequest,
     ProjectController,
     SeriesUIDHierarchy,
     StudyUIDHierarchy,
@@ -300,6 +302,80 @@ def test_move_at_instance_level_1_CT_file_from_pacs_with_file_to_local_storage(
     assert series.remaining_sub_ops == 0
 
 
+def test_study_uid_hierarchy_json_round_trip():
+    series = SeriesUIDHierarchy(
+        uid=ct_small_SeriesInstanceUID,
+        number=1,
+        modality="CT",
+        sop_class_uid="1.2.840.10008.5.1.4.1.1.2",
+        instance_count=1,
+        instances={ct_small_SOPInstanceUID: InstanceUIDHierarchy(ct_small_SOPInstanceUID, 1)},
+    )
+    study = StudyUIDHierarchy(ct_small_StudyInstanceUID, patient3_id, {series.uid: series})
+    study.last_error_msg = "C-MOVE@Study Import Timeout"
+
+    restored = StudyUIDHierarchy.from_json(study.to_json())
+
+    assert restored.uid == study.uid
+    assert restored.ptid == study.ptid
+    assert restored.last_error_msg == study.last_error_msg
+    assert restored.get_number_of_instances() == 1
+    restored_series = restored.series[ct_small_SeriesInstanceUID]
+    assert restored_series.modality == "CT"
+    assert restored_series.sop_class_uid == series.sop_class_uid
+    assert restored_series.instances[ct_small_SOPInstanceUID].number == 1
+
+
+def test_resume_interrupted_move_job_1_CT_file_from_pacs_to_local_storage(temp_dir: str, controller: ProjectController):
+    send_file_to_scp(ct_small_filename, PACSSimulatorSCP, controller)
+
+    error_msg, ct_small_study_hierarchy = controller.get_study_uid_hierarchy(
+        PACSSimulatorSCP.aet, ct_small_StudyInstanceUID, patient3_id
+    )
+    assert error_msg is None
+
+    # Persist a move job as if the application was shutdown before the move was performed:
+    job_id = controller.anonymizer.model.create_move_job(
+        PACSSimulatorSCP.aet,
+        LocalStorageSCP.aet,
+        "SERIES",
+        [(ct_small_study_hierarchy.uid, ct_small_study_hierarchy.ptid, ct_small_study_hierarchy.to_json())],
+    )
+    incomplete_jobs = controller.anonymizer.model.get_incomplete_move_jobs()
+    assert [job.job_id for job in incomplete_jobs] == [job_id]
+
+    controller.resume_move_jobs()
+
+    assert controller.get_number_of_pending_instances(ct_small_study_hierarchy) == 0
+    assert controller.anonymizer.model.get_incomplete_move_jobs() == []
+
+
+def test_resume_move_jobs_excludes_user_moves_and_stops_on_abort(temp_dir: str, controller: ProjectController, mocker):
+    for study_uid in ["1.2.3.1", "1.2.3.2"]:
+        study = StudyUIDHierarchy(study_uid, patient3_id, {})
+        controller.anonymizer.model.create_move_job(
+            PACSSimulatorSCP.aet, LocalStorageSCP.aet, "SERIES", [(study.uid, study.ptid, study.to_json())]
+        )
+    resumed_job_ids = []
+
+    def manage_move(req: MoveStudiesRequest) -> None:
+        resumed_job_ids.append(req.job_id)
+        # Resumed move job visible as an active move, user moves rejected:
+        assert controller.bulk_move_active()
+        assert not controller.move_studies_ex(
+            MoveStudiesRequest(PACSSimulatorSCP.aet, LocalStorageSCP.aet, "SERIES", [])
+        )
+        controller.abort_move()
+
+    mocker.patch.object(controller, "_manage_move", side_effect=manage_move)
+    controller.resume_move_jobs()
+
+    # Remaining move job not resumed after abort, left for the next restart:
+    assert len(resumed_job_ids) == 1
+    assert len(controller.anonymizer.model.get_incomplete_move_jobs()) == 2
+    assert not controller.bulk_move_active()
+
+
 def test_move_at_study_level_CT_1_Series_4_Images_from_pacs_with_file_to_local_storage(
     temp_dir: str, controller: ProjectController
 ):
@@ -343,6 +419,31 @@ def test_move_at_study_level_CT_1_Series_4_Images_from_pacs_with_file_to_local_s
     assert total_files == 4
 
 
+def test_move_at_series_level_MR_3_Series_11_Images_on_3_associations_from_pacs_to_local_storage(
+    temp_dir: str, controller: ProjectController
+):
+    dsets: list[Dataset] = send_files_to_scp(MR_STUDY_3_SERIES_11_IMAGES, PACSSimulatorSCP, controller)
+    verify_files_sent_to_pacs_simulator(dsets, temp_dir, controller)
+
+    error_msg, mr_study_hierarchy = controller.get_study_uid_hierarchy(
+        PACSSimulatorSCP.aet, dsets[0].StudyInstanceUID, patient2_id
+    )
+    assert error_msg is None
+    assert mr_study_hierarchy.get_number_of_instances() == 11
+    assert len(mr_study_hierarchy.series) == 3
+
+    # Move all 3 series concurrently:
+    controller.model.move_settings.concurrent_series_moves = 3
+    error_msg = controller._move_study_at_series_level(PACSSimulatorSCP.aet, LocalStorageSCP.aet, mr_study_hierarchy)
+
+    assert error_msg is None
+    assert mr_study_hierarchy.pending_instances == 0
+    assert controller.get_number_of_pending_instances(mr_study_hierarchy) == 0
+    for series in mr_study_hierarchy.series.values():
+        assert series.completed_sub_ops == series.instance_count
+        assert series.failed_sub_ops == 0
+
+
 def test_move_at_series_level_CT_1_Series_4_Images_from_pacs_with_file_to_local_storage(
     temp_dir: str, controller: ProjectController
 ):
@@ -585,6 +686,40 @@ def test_move_at_study_level_3_studies_from_pacs_to_local_storage(temp_dir: str,
     assert total_files == 13
 
 
+def test_move_3_studies_in_1_batch_at_study_level_from_pacs_to_local_storage(
+    temp_dir: str, controller: ProjectController
+):
+    ds1: Dataset = send_file_to_scp(cr1_filename, PACSSimulatorSCP, controller)
+    ds2: Dataset = send_file_to_scp(ct_small_filename, PACSSimulatorSCP, controller)
+    dsets: list[Dataset] = send_files_to_scp(MR_STUDY_3_SERIES_11_IMAGES, PACSSimulatorSCP, controller)
+    verify_files_sent_to_pacs_simulator([ds1, ds2] + dsets, temp_dir, controller)
+
+    studies: list[StudyUIDHierarchy] = []
+    for study_uid, patient_id in [
+        (ds1.StudyInstanceUID, patient1_id),
+        (ds2.StudyInstanceUID, patient3_id),
+        (dsets[0].StudyInstanceUID, patient2_id),
+    ]:
+        error_msg, study_hierarchy = controller.get_study_uid_hierarchy(PACSSimulatorSCP.aet, study_uid, patient_id)
+        assert error_msg is None
+        studies.append(study_hierarchy)
+
+    # All 3 studies in one C-MOVE request:
+    outcomes = controller._move_study_batch(PACSSimulatorSCP.aet, LocalStorageSCP.aet, studies)
+
+    assert len(outcomes) == 3
+    assert [outcome.error_msg for outcome in outcomes] == [None, None, None]
+    assert [outcome.instances_moved for outcome in outcomes] == [1, 1, 11]
+    for study in studies:
+        assert study.last_error_msg is None
+        assert study.pending_instances == 0
+        assert controller.get_number_of_pending_instances(study) == 0
+
+    # Second batch move is skipped per study:
+    outcomes = controller._move_study_batch(PACSSimulatorSCP.aet, LocalStorageSCP.aet, studies)
+    assert [outcome.error_msg for outcome in outcomes] == ["All Instances already imported"] * 3
+
+
 def test_move_at_series_level_3_studies_from_pacs_to_local_storage(temp_dir: str, controller: ProjectController):
     # Send 3 studies to TEST PACS
     ds1: Dataset = send_file_to_scp(cr1_filename, PACSSimulatorSCP, controller)
@@ -671,6 +806,55 @@ def test_move_at_series_level_3_studies_from_pacs_to_local_storage(temp_dir: str
     assert total_files == 13
 
 
+def test_move_at_series_level_3_studies_shares_series_associations(temp_dir: str, controller: ProjectController):
+    ds1: Dataset = send_file_to_scp(cr1_filename, PACSSimulatorSCP, controller)
+    ds2: Dataset = send_file_to_scp(ct_small_filename, PACSSimulatorSCP, controller)
+    dsets: list[Dataset] = send_files_to_scp(MR_STUDY_3_SERIES_11_IMAGES, PACSSimulatorSCP, controller)
+    verify_files_sent_to_pacs_simulator([ds1, ds2] + dsets, temp_dir, controller)
+
+    studies = []
+    for ds, patient_id in [(ds1, patient1_id), (ds2, patient3_id), (dsets[0], patient2_id)]:
+        error_msg, study_hierarchy = controller.get_study_uid_hierarchy(
+            PACSSimulatorSCP.aet, ds.StudyInstanceUID, patient_id
+        )
+        assert error_msg is None
+        studies.append(study_hierarchy)
+
+    # 3 concurrent studies, series associations limited to 2 across all studies of the move:
+    controller.model.move_settings.adaptive = False
+    controller.model.move_settings.concurrent_moves = 3
+    controller.model.move_settings.concurrent_series_moves = 2
+
+    active_series_moves = 0
+    max_active_series_moves = 0
+    lock = threading.Lock()
+    move_series = controller._move_series
+
+    def counting_move_series(*args, **kwargs):
+        nonlocal active_series_moves, max_active_series_moves
+        with lock:
+            active_series_moves += 1
+            max_active_series_moves = max(max_active_series_moves, active_series_moves)
+        try:
+            time.sleep(0.5)
+            return move_series(*args, **kwargs)
+        finally:
+            with lock:
+                active_series_moves -= 1
+
+    controller._move_series = counting_move_series
+
+    assert request_to_move_studies_from_scp_to_local_scp("SERIES", studies, PACSSimulatorSCP, controller)
+
+    timeout = controller.model.network_timeouts.network - 1
+    while any(controller.get_number_of_pending_instances(study) for study in studies) and timeout > 0:
+        time.sleep(1)
+        timeout -= 1
+
+    assert timeout > 0
+    assert max_active_series_moves == 2
+
+
 def test_move_at_instance_level_of_3_studies_from_pacs_to_local_storage(temp_dir: str, controller: ProjectController):
     # Send 3 studies to TEST PACS
     ds1: Dataset = send_file_to_scp(cr1_filename, PACSSimulatorSCP, controller)
@@ -1,13 +1,19 @@
 import os
 import time
+from pathlib import Path
+from queue import Queue
 
 import pytest
+from pydicom import dcmread
 from pydicom.data import get_testdata_file
 from pydicom.dataset import Dataset
 from pydicom.errors import InvalidDicomError
+from pydicom.uid import RLELossless
 
 import tests.controller.dicom_pacs_simulator_scp as pacs_simulator_scp
-from anonymizer.controller.project import ProjectController
+from anonymizer.controller.dicom_C_codes import C_FAILURE, C_SUCCESS
+from anonymizer.controller.project import ExportPatientsRequest, ExportPatientsResponse, ProjectController
+from anonymizer.model.project import DICOMNode
 from anonymizer.utils.storage import count_studies_series_images
 from tests.controller.dicom_test_files import (
     CR_STUDY_3_SERIES_3_IMAGES,
@@ -130,12 +136,77 @@ def test_send_1_MR_file_explicit_VR_big_endian_to_test_pacs(temp_dir: str, contr
     verify_files_sent_to_pacs_simulator([ds], temp_dir, controller)
 
 
+def test_send_chunked_mixed_transfer_syntaxes_to_test_pacs(temp_dir: str, controller: ProjectController):
+    from pynetdicom import _config
+
+    assert controller.model.export_settings.chunked_send
+    assert _config.STORE_SEND_CHUNKED_DATASET
+
+    filenames = [ct_small_filename, mr_small_implicit_filename, mr_small_bigendian_filename]
+    file_paths = [str(get_testdata_file(filename)) for filename in filenames]
+    # Exact presentation contexts negotiated from file headers, files streamed without decoding:
+    assert controller.send(file_paths, PACSSimulatorSCP.aet) == 3
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 3
+
+
 def test_send_CT_MR_files_find_all_studies_on_test_pacs(temp_dir: str, controller: ProjectController):
     ds1: Dataset = send_file_to_scp(ct_small_filename, PACSSimulatorSCP, controller)
     ds2: Dataset = send_file_to_scp(mr_small_filename, PACSSimulatorSCP, controller)
     verify_files_sent_to_pacs_simulator([ds1, ds2], temp_dir, controller)
 
 
+def test_federated_find_deduplicates_studies_and_routes_moves(temp_dir: str, controller: ProjectController):
+    ds1: Dataset = send_file_to_scp(ct_small_filename, PACSSimulatorSCP, controller)
+    ds2: Dataset = send_file_to_scp(mr_small_filename, PACSSimulatorSCP, controller)
+    verify_files_sent_to_pacs_simulator([ds1, ds2], temp_dir, controller)
+
+    # Second remote SCP name for the same PACS simulator, every study is held by both:
+    controller.model.remote_scps = dict(controller.model.remote_scps)
+    controller.model.remote_scps["TESTPACS2"] = PACSSimulatorSCP
+    controller.model.federated_scps = ["TESTPACS2", "UNKNOWN"]
+
+    scp_names = controller.federated_scp_names(PACSSimulatorSCP.aet)
+    assert scp_names == [PACSSimulatorSCP.aet, "TESTPACS2"]
+
+    results = controller.find_studies_federated(scp_names, "", "", "", "", "", None, False)
+    assert results
+    assert sorted(result.StudyInstanceUID for result in results) == sorted([ds1.StudyInstanceUID, ds2.StudyInstanceUID])
+    assert sorted(controller._study_sources[ds1.StudyInstanceUID]) == sorted(scp_names)
+
+    # Least loaded source is selected:
+    first = controller._select_move_source(PACSSimulatorSCP.aet, ds1.StudyInstanceUID)
+    second = controller._select_move_source(PACSSimulatorSCP.aet, ds1.StudyInstanceUID)
+    assert {first, second} == set(scp_names)
+    controller._release_move_source(first)
+    controller._release_move_source(second)
+
+    # A single SCP query clears the sources of the federated query, moves are routed to the queried SCP:
+    assert controller.find_studies("TESTPACS2", "", "", "", "", "", None, False)
+    assert not controller._study_sources
+    assert controller._select_move_source("TESTPACS2", ds1.StudyInstanceUID) == "TESTPACS2"
+    controller._release_move_source("TESTPACS2")
+
+    # Sources are recorded again by the next federated query:
+    controller.find_studies_federated(scp_names, "", "", "", "", "", None, False)
+    assert sorted(controller._study_sources[ds1.StudyInstanceUID]) == sorted(scp_names)
+
+    # Failure of one source is reported with the final success status, sources of the previous query are cleared:
+    controller.model.remote_scps["TESTPACS2"] = DICOMNode("127.0.0.1", 1, "NOTRUNNING", False)
+    ux_Q: Queue = Queue()
+    results = controller.find_studies_federated(scp_names, "", "", "", "", "", ux_Q, False)
+    assert len(results) == 2
+    assert controller._study_sources[ds1.StudyInstanceUID] == [PACSSimulatorSCP.aet]
+    responses = list(ux_Q.queue)
+    assert responses[-1].status.Status == C_SUCCESS
+    assert "TESTPACS2" in responses[-1].status.ErrorComment
+
+    # Failure of all sources is reported with a failure status:
+    controller.model.remote_scps[PACSSimulatorSCP.aet] = controller.model.remote_scps["TESTPACS2"]
+    ux_Q = Queue()
+    assert controller.find_studies_federated(scp_names, "", "", "", "", "", ux_Q, False) == []
+    assert ux_Q.queue[-1].status.Status == C_FAILURE
+
+
 def test_send_3_CR_files_to_test_pacs(temp_dir: str, controller: ProjectController):
     dsets: list[Dataset] = send_files_to_scp(CR_STUDY_3_SERIES_3_IMAGES, PACSSimulatorSCP, controller)
     verify_files_sent_to_pacs_simulator(dsets, temp_dir, controller)
@@ -151,6 +222,25 @@ def test_send_11_MR_files_to_test_pacs(temp_dir: str, controller: ProjectControl
     verify_files_sent_to_pacs_simulator(dsets, temp_dir, controller)
 
 
+def test_group_files_by_presentation_contexts(controller: ProjectController):
+    file_paths = [
+        str(get_testdata_file(filename)) for filename in [cr1_filename, ct_small_filename, mr_small_filename]
+    ] + [str(get_testdata_file(filename)) for filename in CT_STUDY_1_SERIES_4_IMAGES]
+
+    groups = controller._group_files_by_presentation_contexts(file_paths)
+    assert len(groups) == 1
+    contexts, group_file_paths = groups[0]
+    assert len(contexts) == len(set((ctx.abstract_syntax, ctx.transfer_syntax[0]) for ctx in contexts))
+    assert sorted(group_file_paths) == sorted(file_paths)
+
+    # Limit presentation contexts per association:
+    controller._max_presentation_contexts = 1
+    groups = controller._group_files_by_presentation_contexts(file_paths)
+    assert len(groups) == len(contexts)
+    assert all(len(group_contexts) == 1 for group_contexts, __ in groups)
+    assert sum(len(group_file_paths) for __, group_file_paths in groups) == len(file_paths)
+
+
 def test_export_patient_CR_study_to_test_pacs(temp_dir: str, controller: ProjectController):
     # Send 1 Study with 1 CR files to local storage:
     send_files_to_scp([cr1_filename], LocalStorageSCP, controller)
@@ -177,6 +267,196 @@ def test_export_patient_CT_study_to_test_pacs(temp_dir: str, controller: Project
     assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
 
 
+def test_re_export_patient_uses_export_manifest(temp_dir: str, controller: ProjectController, mocker):
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+    # First export queries test PACS and records instances sent in export manifest:
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    dest_key = controller._export_destination_key(PACSSimulatorSCP.aet)
+    assert len(controller.anonymizer.model.get_exported_instances(dest_key, anon_pt_id)) == 4
+
+    # Re-export is resolved from export manifest without querying test PACS:
+    spy = mocker.spy(controller, "_get_study_instance_counts")
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert spy.call_count == 0
+
+    # Without export manifest, test PACS is queried:
+    controller.model.export_settings.export_manifest = False
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert spy.call_count == 1
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 4
+
+
+def test_queued_dicom_export_not_routed_to_aws(temp_dir: str, controller: ProjectController, mocker):
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+    controller.anonymizer.model.enqueue_exports(PACSSimulatorSCP.aet, [anon_pt_id])
+
+    # AWS export enabled after the DICOM export was queued, the queued export is still sent to the DICOM destination:
+    controller.model.export_to_AWS = True
+    aws_authenticate = mocker.patch.object(controller, "AWS_authenticate")
+    assert not controller._export_destination_key(PACSSimulatorSCP.aet).startswith("s3://")
+    controller._process_export_queue()
+    assert aws_authenticate.call_count == 0
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 4
+    assert controller.anonymizer.model.get_export_queue() == []
+
+
+def test_export_pre_check_study_level_fast_path(temp_dir: str, controller: ProjectController, mocker):
+    controller.model.export_settings.export_manifest = False
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 4
+
+    # Study fully present on test PACS, no instance level queries:
+    spy = mocker.spy(controller, "get_study_uid_hierarchy")
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert spy.call_count == 0
+
+    # Study partially present on test PACS, instance level query for the study & missing files sent:
+    for filename in os.listdir(pacs_storage_dir(temp_dir))[:2]:
+        os.remove(os.path.join(pacs_storage_dir(temp_dir), filename))
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert spy.call_count == 1
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 4
+
+
+def test_export_pre_check_falls_back_to_instance_level_query(temp_dir: str, controller: ProjectController, mocker):
+    controller.model.export_settings.export_manifest = False
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+    spy = mocker.spy(controller, "get_study_uid_hierarchy")
+
+    # STUDY level query fails, eg. storage only destination, instance level query & all files sent:
+    mocker.patch.object(controller, "_get_study_instance_counts", side_effect=ConnectionError("Association rejected"))
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert spy.call_count == 1
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 4
+
+    # NumberOfStudyRelatedInstances not returned, instance level query, study not re-sent:
+    study_uid = os.listdir(Path(controller.model.images_dir(), anon_pt_id))[0]
+    mocker.patch.object(controller, "_get_study_instance_counts", return_value={study_uid: None})
+    send_spy = mocker.spy(controller, "_export_files")
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    assert spy.call_count == 2
+    assert send_spy.call_count == 0
+
+
+def test_export_2_patients_split_into_work_items(temp_dir: str, controller: ProjectController):
+    controller.model.export_settings.export_workers = 3
+    controller.model.export_settings.export_work_item_max_files = 2
+    # Send Patient 1: 1 CR study with 3 files & Patient 2: 1 MR study with 11 files to local storage:
+    send_files_to_scp(CR_STUDY_3_SERIES_3_IMAGES, LocalStorageSCP, controller)
+    send_files_to_scp(MR_STUDY_3_SERIES_11_IMAGES, LocalStorageSCP, controller)
+    time.sleep(1)
+    patient_ids = [controller.model.site_id + "-000001", controller.model.site_id + "-000002"]
+
+    # Work items of at most 2 files:
+    work_items = controller._plan_patient_export(PACSSimulatorSCP.aet, patient_ids[1])
+    assert work_items is not None
+    assert len(work_items) == 6
+    assert all(len(work_item) <= 2 for work_item in work_items)
+
+    ux_Q: Queue[ExportPatientsResponse] = Queue()
+    controller.export_patients_ex(ExportPatientsRequest(PACSSimulatorSCP.aet, patient_ids, ux_Q))
+    files_sent: dict[str, int] = {}
+    while len(files_sent) < len(patient_ids):
+        resp: ExportPatientsResponse = ux_Q.get(timeout=10)
+        assert not resp.error
+        if resp.complete:
+            files_sent[resp.patient_id] = resp.files_sent
+
+    # Per patient progress aggregated across work items:
+    assert files_sent == {patient_ids[0]: 3, patient_ids[1]: 11}
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 14
+    time.sleep(0.5)
+    assert not controller.bulk_export_active()
+
+
+def test_export_transcode_not_accepted_sends_stored_transfer_syntax(temp_dir: str, controller: ProjectController):
+    controller.model.export_settings.transcode = "RLE"
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+
+    # RLE context proposed in addition to the stored transfer syntax:
+    file_paths = [str(path) for path in Path(controller.model.images_dir(), anon_pt_id).rglob("*.dcm")]
+    groups = controller._group_files_by_presentation_contexts(file_paths, RLELossless)
+    assert len(groups) == 1
+    assert RLELossless in [context.transfer_syntax[0] for context in groups[0][0]]
+
+    # Test PACS only accepts uncompressed transfer syntaxes:
+    assert export_patients_from_local_storage_to_test_pacs([anon_pt_id], controller)
+    stored_files = os.listdir(pacs_storage_dir(temp_dir))
+    assert len(stored_files) == 4
+    for filename in stored_files:
+        ds = dcmread(os.path.join(pacs_storage_dir(temp_dir), filename), stop_before_pixels=True)
+        assert ds.file_meta.TransferSyntaxUID != RLELossless
+
+
+def test_export_transient_error_retried_from_export_queue(temp_dir: str, controller: ProjectController, mocker):
+    controller.model.export_settings.export_retry_backoff = 0
+    # Send 1 Study with 4 CT files to local storage:
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+
+    # Transient error, patient remains queued for retry:
+    mocker.patch.object(controller, "_export_files", side_effect=ConnectionError("Connection refused"))
+    ux_Q: Queue[ExportPatientsResponse] = Queue()
+    controller.export_patients_ex(ExportPatientsRequest(PACSSimulatorSCP.aet, [anon_pt_id], ux_Q))
+    resp: ExportPatientsResponse = ux_Q.get(timeout=10)
+    while not resp.complete:
+        resp = ux_Q.get(timeout=10)
+    assert resp.error and resp.retry
+    queue = controller.anonymizer.model.get_export_queue()
+    assert [(entry.dest_name, entry.patient_id, entry.attempts) for entry in queue] == [
+        (PACSSimulatorSCP.aet, anon_pt_id, 1)
+    ]
+    time.sleep(0.5)
+    assert not controller.bulk_export_active()
+    mocker.stopall()
+
+    # Export queue skipped while another export is active, which also rejects a user export:
+    with controller._export_lock:
+        controller._process_export_queue()
+        assert len(controller.anonymizer.model.get_export_queue()) == 1
+        assert not controller.export_patients_ex(ExportPatientsRequest(PACSSimulatorSCP.aet, [anon_pt_id], Queue()))
+
+    # Retry from export queue once backoff elapsed succeeds, patient removed from queue, progress reported to the view:
+    controller.export_queue_ux_Q = Queue()
+    controller._process_export_queue()
+    assert len(os.listdir(pacs_storage_dir(temp_dir))) == 4
+    assert controller.anonymizer.model.get_export_queue() == []
+    resp = list(controller.export_queue_ux_Q.queue)[-1]
+    assert resp.patient_id == anon_pt_id and resp.complete and resp.files_sent == 4
+
+
+def test_export_permanent_error_not_queued(temp_dir: str, controller: ProjectController, mocker):
+    send_files_to_scp(CT_STUDY_1_SERIES_4_IMAGES, LocalStorageSCP, controller)
+    time.sleep(0.5)
+    anon_pt_id = controller.model.site_id + "-000001"
+
+    mocker.patch.object(controller, "_export_files", side_effect=ValueError("Invalid DICOM file"))
+    ux_Q: Queue[ExportPatientsResponse] = Queue()
+    controller.export_patients_ex(ExportPatientsRequest(PACSSimulatorSCP.aet, [anon_pt_id], ux_Q))
+    resp: ExportPatientsResponse = ux_Q.get(timeout=10)
+    while not resp.complete:
+        resp = ux_Q.get(timeout=10)
+    assert resp.error and not resp.retry
+    assert controller.anonymizer.model.get_export_queue() == []
+
+
 def test_export_1_patient_2_studies_CR_CT_to_test_pacs(temp_dir: str, controller: ProjectController):
     # SAME Patient: (Doe^Archibald)
     # Send CR & CT studies to local storage:
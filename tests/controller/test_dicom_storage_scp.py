@@ -695,19 +695,9 @@ def test_send_JPEG_Baseline(temp_dir: str, controller: ProjectController):
     # Restart LocalStorageSCP to apply new config:
     controller.update_model()
 
-    # Try again to send test file, even though LocalStorageSCP is setup with required context, send_context must be specified:
-    try:
-        files_sent = controller.send([dcm_file_path], LocalStorageSCP.aet)
-    except Exception as e:
-        assert "No presentation context" in str(e)
-
-    # Create Presentation Context for sending as per the file format, since no transcoding is implemented:
-    # If this is not specified (as above in last send) the ProjectController AE will use the SCP contexts in requested_contexts property
-    # which includes the default syntaxes and the negotiation will settle on first common syntax which wil be Explicit VR Little Endian
-    send_context = build_context(SC_SOP_CLASS_UID, JPEG_BASELINE_TS)
-
-    # Try again to send test file to LocalStorageSCP, this should now succeed
-    files_sent = controller.send([dcm_file_path], LocalStorageSCP.aet, [send_context])
+    # Try again to send test file to LocalStorageSCP, this should now succeed without specifying send_contexts,
+    # the presentation contexts are built from the SOP class & transfer syntax in the file header:
+    files_sent = controller.send([dcm_file_path], LocalStorageSCP.aet)
 
     assert files_sent == 1
 
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from cv2 import FONT_HERSHEY_SIMPLEX, NORM_MINMAX, normalize, putText
+from pydicom import dcmread
+from pydicom.data import get_testdata_file
+
+from anonymizer.controller import ocr_onnx
+from anonymizer.controller.ocr_onnx import ONNXOCRReader, compare_ocr_readers, ctc_greedy_decode, export_onnx_models
+from anonymizer.controller.ocr_service import OCR_MODEL_DIR
+
+TEST_TEXT = ["PATIENT SMITH", "DOB 19600101", "MRN 12345678", "ST JOHNS HOSPITAL", "ACC 998877", "LEFT"]
+
+
+def create_text_frames() -> list[np.ndarray]:
+    # Burnt-in text on a CT image & on noise, at different sizes & positions:
+    ct_small = get_testdata_file("CT_small.dcm")
+    assert isinstance(ct_small, str)
+    ct_pixels = normalize(dcmread(ct_small).pixel_array, None, 0, 255, NORM_MINMAX).astype(np.uint8)
+    ct_frame = np.kron(ct_pixels, np.ones((4, 4), dtype=np.uint8))  # 512 x 512
+    rng = np.random.default_rng(0)
+    frames = []
+    for i, text in enumerate(TEST_TEXT):
+        frame = ct_frame.copy() if i % 2 == 0 else rng.integers(0, 60, (480, 640), dtype=np.uint8)
+        putText(frame, text, (20 + 10 * i, 60 + 50 * i), FONT_HERSHEY_SIMPLEX, 0.6 + 0.15 * i, 255, 2)
+        frames.append(frame)
+    return frames
+
+
+def test_ctc_greedy_decode():
+    characters = "ABC"
+    # Sequence: A A blank B blank B C, class 0 = blank:
+    indices = [1, 1, 0, 2, 0, 2, 3]
+    probabilities = np.full((1, len(indices), 4), 0.1, dtype=np.float32)
+    for step, index in enumerate(indices):
+        probabilities[0, step, index] = 0.7
+    [(text, confidence)] = ctc_greedy_decode(probabilities, characters)
+    assert text == "ABBC"
+    assert 0 < confidence < 1
+
+    # Ignored characters are never decoded:
+    [(text, __)] = ctc_greedy_decode(probabilities, characters, ignore_indices=[3])
+    assert "C" not in text
+
+
+def test_onnx_ocr_reader_agrees_with_easyocr(temp_dir: str, monkeypatch: pytest.MonkeyPatch):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("onnx")  # int8 quantization
+    from easyocr import Reader
+
+    monkeypatch.setattr(ocr_onnx, "ONNX_MODEL_DIR", Path(temp_dir))
+    easyocr_reader = Reader(["en"], gpu=False, quantize=False, model_storage_directory=OCR_MODEL_DIR, verbose=False)
+    export_onnx_models(easyocr_reader, ["en"], quantize=True)
+    frames = create_text_frames()
+
+    comparison = compare_ocr_readers(easyocr_reader, ONNXOCRReader(["en"]), frames, min_size=1, rotation_info=[90])
+    assert comparison.reference_boxes >= len(TEST_TEXT)
+    assert comparison.box_recall() >= 0.9
+    assert comparison.text_agreement() >= 0.9
+
+    comparison = compare_ocr_readers(easyocr_reader, ONNXOCRReader(["en"], quantized=True), frames, min_size=1)
+    assert comparison.box_recall() >= 0.8
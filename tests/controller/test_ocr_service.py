@@ -0,0 +1,92 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from anonymizer.controller.ocr_service import OCRService
+
+
+class SlowOCRReader:
+    def __init__(self, languages: list[str]):
+        self.languages = languages
+        self._lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+    def readtext(self, pixels, **kwargs) -> list:
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self._lock:
+            self.active -= 1
+        return [pixels]
+
+
+def test_ocr_service_lazy_load_shared_reader_bounded_concurrency():
+    readers: list[SlowOCRReader] = []
+
+    def reader_factory(languages: list[str]) -> SlowOCRReader:
+        readers.append(SlowOCRReader(languages))
+        return readers[-1]
+
+    ocr_service = OCRService(reader_factory=reader_factory)
+    ocr_service.configure(max_concurrency=2, idle_timeout=0)
+    assert not ocr_service.loaded()
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(lambda i: ocr_service.readtext(i, paragraph=False), range(12)))
+    assert results == [[i] for i in range(12)]
+    assert len(readers) == 1
+    assert readers[0].max_active == 2
+    assert ocr_service.loaded()
+
+    # Change of languages reloads the reader on next use:
+    ocr_service.configure(languages=["en"])
+    ocr_service.readtext(0)
+    assert len(readers) == 2
+    assert readers[1].languages == ["en"]
+
+
+def test_ocr_service_idle_unload():
+    ocr_service = OCRService(reader_factory=SlowOCRReader)
+    ocr_service.configure(idle_timeout=0.2)
+    ocr_service.readtext(0)
+    assert ocr_service.loaded()
+    time.sleep(0.5)
+    assert not ocr_service.loaded()
+
+    # Not unloaded while in use:
+    with ocr_service.reader():
+        time.sleep(0.5)
+        assert ocr_service.loaded()
+
+    # One idle check thread while loaded, not one per call:
+    idle_thread = ocr_service._idle_thread
+    assert idle_thread and idle_thread.is_alive()
+    for i in range(5):
+        ocr_service.readtext(i)
+        assert ocr_service._idle_thread is idle_thread
+    time.sleep(0.5)
+    assert not ocr_service.loaded()
+    idle_thread.join(1)
+    assert not idle_thread.is_alive()
+
+
+def test_ocr_service_interactive_slot_not_blocked_by_workers():
+    ocr_service = OCRService(reader_factory=SlowOCRReader)
+    ocr_service.configure(max_concurrency=1, idle_timeout=0)
+    worker_slot_taken = threading.Event()
+    release_worker_slot = threading.Event()
+
+    def worker():
+        with ocr_service._semaphore:
+            worker_slot_taken.set()
+            release_worker_slot.wait(5)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(worker)
+        assert worker_slot_taken.wait(5)
+        start = time.monotonic()
+        assert ocr_service.interactive().readtext(1) == [1]
+        assert time.monotonic() - start < 1
+        release_worker_slot.set()
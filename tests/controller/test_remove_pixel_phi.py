@@ -0,0 +1,300 @@
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+from cv2 import FONT_HERSHEY_SIMPLEX, absdiff, putText
+from pydicom import Dataset, dcmread
+from pydicom.data import get_testdata_file
+from pydicom.uid import JPEG2000Lossless, RLELossless
+
+from anonymizer.controller.remove_pixel_phi import (
+    TextPrefilter,
+    UserRectangle,
+    _frame_change,
+    remove_pixel_phi,
+    remove_pixel_phi_from_dataset,
+    select_pixel_phi_rule,
+    split_thread_budget,
+    tiled_ocr_geometry,
+)
+from anonymizer.model.project import (
+    PIXEL_PHI_BLACKOUT,
+    PIXEL_PHI_OCR,
+    PIXEL_PHI_SKIP,
+    PixelPHIRule,
+    default_pixel_phi_rules,
+    skip_axial_ct_mr_pixel_phi_rules,
+)
+
+
+def test_split_thread_budget():
+    assert split_thread_budget(8, 2) == 4
+    assert split_thread_budget(8, 3) == 2
+    assert split_thread_budget(2, 4) == 1
+    assert split_thread_budget(8, 0) == 8
+    assert split_thread_budget(0, 1) >= 1
+
+
+class FirstFrameTextOCRReader:
+    # Detects one text box in the first frame of an instance only:
+    def __init__(self):
+        self.batches: list[int] = []
+
+    def readtext_batched(self, ocr_frames: list, batch_size: int = 1) -> list[list]:
+        self.batches.append(len(ocr_frames))
+        results: list[list] = [[] for __ in ocr_frames]
+        if len(self.batches) == 1:
+            results[0] = [([[30, 30], [74, 30], [74, 74], [30, 74]], "PHI", 0.99)]
+        return results
+
+    def readtext(self, ocr_frame) -> list:
+        return self.readtext_batched([ocr_frame])[0]
+
+
+def test_remove_pixel_phi_batched_ocr_keeps_frames_without_text(temp_dir: str):
+    emri_small = get_testdata_file("emri_small.dcm")  # 10 frames, 64 x 64
+    assert isinstance(emri_small, str)
+    dcm_path = Path(shutil.copy(emri_small, Path(temp_dir, "emri_small.dcm")))
+    source_pixels = dcmread(dcm_path).pixel_array
+
+    ocr_reader = FirstFrameTextOCRReader()
+    assert remove_pixel_phi(dcm_path, ocr_reader, ocr_batch_size=4)  # type: ignore
+    assert ocr_reader.batches == [4, 4, 2]
+
+    deid_pixels = dcmread(dcm_path).pixel_array
+    assert deid_pixels.shape == source_pixels.shape
+    assert np.array_equal(deid_pixels[1:], source_pixels[1:])
+
+
+def test_select_pixel_phi_rule():
+    # No default rules, all instances processed with the default action:
+    ds = Dataset()
+    ds.Modality = "CT"
+    ds.ImageType = ["ORIGINAL", "PRIMARY", "AXIAL"]
+    assert select_pixel_phi_rule(default_pixel_phi_rules(), ds) is None
+
+    rules = skip_axial_ct_mr_pixel_phi_rules() + [
+        PixelPHIRule(PIXEL_PHI_BLACKOUT, modality="US", manufacturer="acme", blackout_areas=[[0, 0, 100, 40]])
+    ]
+    ds = Dataset()
+    ds.Modality = "CT"
+    ds.ImageType = ["ORIGINAL", "PRIMARY", "AXIAL"]
+    rule = select_pixel_phi_rule(rules, ds)
+    assert rule and rule.action == PIXEL_PHI_SKIP
+
+    ds.BurnedInAnnotation = "YES"
+    rule = select_pixel_phi_rule(rules, ds)
+    assert rule and rule.action == PIXEL_PHI_OCR
+
+    ds = Dataset()
+    ds.Modality = "US"
+    ds.Manufacturer = "ACME Ultrasound"
+    rule = select_pixel_phi_rule(rules, ds)
+    assert rule and rule.action == PIXEL_PHI_BLACKOUT
+
+    ds.Manufacturer = "Other"
+    assert select_pixel_phi_rule(rules, ds) is None
+
+
+def test_remove_pixel_phi_blackout_areas_without_ocr(temp_dir: str):
+    ct_small = get_testdata_file("CT_small.dcm")  # 128 x 128
+    assert isinstance(ct_small, str)
+    dcm_path = Path(shutil.copy(ct_small, Path(temp_dir, "CT_small.dcm")))
+    source_pixels = dcmread(dcm_path).pixel_array
+
+    assert remove_pixel_phi(dcm_path, None, blackout_areas=[UserRectangle((0, 0), (128, 20))])
+
+    deid_pixels = dcmread(dcm_path).pixel_array
+    assert not deid_pixels[:20].any()
+    assert np.array_equal(deid_pixels[20:], source_pixels[20:])
+
+
+def test_remove_pixel_phi_temporal_mask_ocr_projection_and_keyframes_only(temp_dir: str):
+    emri_small = get_testdata_file("emri_small.dcm")  # 10 frames, 64 x 64
+    assert isinstance(emri_small, str)
+    dcm_path = Path(shutil.copy(emri_small, Path(temp_dir, "emri_small.dcm")))
+    source_pixels = dcmread(dcm_path).pixel_array
+
+    # Text found on the max projection, no frame differs enough from the first frame to be a keyframe,
+    # OCR max & min projections, then the first frame only:
+    ocr_reader = FirstFrameTextOCRReader()
+    assert remove_pixel_phi(  # type: ignore
+        dcm_path, ocr_reader, ocr_batch_size=4, temporal_mask=True, temporal_change_threshold=255
+    )
+    assert ocr_reader.batches == [2, 1]
+    assert dcmread(dcm_path).pixel_array.shape == source_pixels.shape
+
+    # Every frame a keyframe:
+    shutil.copy(emri_small, dcm_path)
+    ocr_reader = FirstFrameTextOCRReader()
+    assert remove_pixel_phi(  # type: ignore
+        dcm_path, ocr_reader, ocr_batch_size=4, temporal_mask=True, temporal_change_threshold=-1
+    )
+    assert ocr_reader.batches == [2, 4, 4, 2]
+
+
+class NoTextOCRReader(FirstFrameTextOCRReader):
+    def readtext_batched(self, ocr_frames: list, batch_size: int = 1) -> list[list]:
+        self.batches.append(len(ocr_frames))
+        return [[] for __ in ocr_frames]
+
+
+def test_remove_pixel_phi_temporal_mask_ignores_change_outside_text_regions(temp_dir: str):
+    emri_small = get_testdata_file("emri_small.dcm")  # 10 frames, 64 x 64
+    assert isinstance(emri_small, str)
+    dcm_path = Path(shutil.copy(emri_small, Path(temp_dir, "emri_small.dcm")))
+    source_pixels = dcmread(dcm_path).pixel_array
+
+    # Every frame changes, but no text is found on the projections, OCR max & min projections & first frame only:
+    ocr_reader = NoTextOCRReader()
+    assert remove_pixel_phi(  # type: ignore
+        dcm_path, ocr_reader, ocr_batch_size=4, temporal_mask=True, temporal_change_threshold=-1
+    )
+    assert ocr_reader.batches == [2, 1]
+    assert np.array_equal(dcmread(dcm_path).pixel_array, source_pixels)
+
+
+def test_frame_change_of_small_overlay():
+    keyframe = np.zeros((512, 512), dtype=np.uint8)
+    frame = keyframe.copy()
+    putText(frame, "12:01", (20, 40), FONT_HERSHEY_SIMPLEX, 0.8, 255, 2)
+    # Negligible over the whole frame, but not in the region of the overlay:
+    assert float(np.mean(absdiff(frame, keyframe))) < 8.0
+    assert _frame_change(frame, keyframe) > 8.0
+    assert _frame_change(keyframe, keyframe) == 0
+
+
+def test_text_prefilter():
+    text_prefilter = TextPrefilter()
+    frame = np.zeros((140, 320), dtype=np.uint8)
+    assert not text_prefilter.text_likely(frame)
+
+    putText(frame, "PATIENT 12345", (30, 80), FONT_HERSHEY_SIMPLEX, 1, 255, 2)
+    assert text_prefilter.text_likely(frame)
+    assert text_prefilter.text_likely(np.dstack([frame, frame, frame]))
+
+    assert text_prefilter.frames_checked == 3
+    assert text_prefilter.frames_rejected == 1
+
+
+def test_text_prefilter_rejects_only_frames_without_candidate_regions():
+    text_prefilter = TextPrefilter()
+
+    # Smooth ramp, no edges:
+    ramp = np.tile(np.linspace(0, 255, 640, dtype=np.uint8), (480, 1))
+    assert not text_prefilter.text_likely(ramp)
+
+    # Large text, taller than a line of small print:
+    frame = np.zeros((480, 640), dtype=np.uint8)
+    putText(frame, "SMITH", (20, 300), FONT_HERSHEY_SIMPLEX, 6, 255, 12)
+    assert text_prefilter.text_likely(frame)
+
+    # Vertical text, eg. along the edge of an ultrasound or scanned image:
+    frame = np.zeros((140, 480), dtype=np.uint8)
+    putText(frame, "PATIENT 12345", (10, 80), FONT_HERSHEY_SIMPLEX, 1, 255, 2)
+    assert text_prefilter.text_likely(np.ascontiguousarray(np.rot90(frame)))
+
+    # Low contrast text on a smooth background:
+    frame = ramp // 4 + 60
+    assert not text_prefilter.text_likely(frame)
+    putText(frame, "DOB 19600101", (40, 240), FONT_HERSHEY_SIMPLEX, 1, int(frame[240, 40]) + 30, 2)
+    assert text_prefilter.text_likely(frame)
+
+    assert text_prefilter.frames_rejected == 2
+
+
+def test_remove_pixel_phi_text_prefilter_skips_ocr(temp_dir: str):
+    emri_small = get_testdata_file("emri_small.dcm")
+    assert isinstance(emri_small, str)
+    dcm_path = Path(shutil.copy(emri_small, Path(temp_dir, "emri_small.dcm")))
+
+    class NoTextPrefilter(TextPrefilter):
+        def text_likely(self, ocr_frame) -> bool:
+            self.frames_checked += 1
+            self.frames_rejected += 1
+            return False
+
+    ocr_reader = FirstFrameTextOCRReader()
+    text_prefilter = NoTextPrefilter()
+    assert not remove_pixel_phi(dcm_path, ocr_reader, ocr_batch_size=4, text_prefilter=text_prefilter)  # type: ignore
+    assert ocr_reader.batches == []
+    assert text_prefilter.rejection_rate() == 1.0
+
+
+def test_remove_pixel_phi_from_dataset_in_memory():
+    ct_small = get_testdata_file("CT_small.dcm")
+    assert isinstance(ct_small, str)
+    ds = dcmread(ct_small)
+    source_pixels = ds.pixel_array.copy()
+
+    assert remove_pixel_phi_from_dataset(ds, None, blackout_areas=[UserRectangle((0, 100), (128, 128))])
+
+    # Pixel data of the dataset changed, file not written:
+    deid_pixels = ds.pixel_array
+    assert not deid_pixels[100:].any()
+    assert np.array_equal(deid_pixels[:100], source_pixels[:100])
+    assert np.array_equal(dcmread(ct_small).pixel_array, source_pixels)
+
+
+def test_remove_pixel_phi_reencode_frames_in_parallel(temp_dir: str):
+    emri_small_j2k = get_testdata_file("emri_small_jpeg_2k_lossless.dcm")  # 10 frames, 64 x 64
+    assert isinstance(emri_small_j2k, str)
+    source_pixels = dcmread(emri_small_j2k).pixel_array
+    blackout_areas = [UserRectangle((0, 0), (64, 10))]
+
+    # JPEG-LS has no encoder with pydicom 2.4, invalid settings fall back to JPEG2000Lossless:
+    for reencode, transfer_syntax in [
+        ("RLE", RLELossless),
+        ("JPEG2000", JPEG2000Lossless),
+        ("JPEG-LS", JPEG2000Lossless),
+    ]:
+        ds = dcmread(emri_small_j2k)
+        assert remove_pixel_phi_from_dataset(
+            ds, None, blackout_areas=blackout_areas, reencode=reencode, reencode_threads=4
+        )
+        assert ds.file_meta.TransferSyntaxUID == transfer_syntax
+        dcm_path = Path(temp_dir, f"emri_small_{reencode}.dcm")
+        ds.save_as(dcm_path)
+
+        # Lossless, frames in order:
+        deid_pixels = dcmread(dcm_path).pixel_array
+        assert not deid_pixels[:, :10].any()
+        assert np.array_equal(deid_pixels[:, 10:], source_pixels[:, 10:])
+
+
+def test_tiled_ocr_geometry():
+    assert tiled_ocr_geometry(None) == (1024, 128, 1.0)
+    # Mammography at 0.05 mm: downscaled by half, 100 mm tiles:
+    assert tiled_ocr_geometry([0.05, 0.05]) == (1000, 125, 0.5)
+    assert tiled_ocr_geometry([0.2, 0.2], tile_size=4096) == (2048, 256, 1.0)
+
+
+class TileOCRReader:
+    # Records the OCR'd tiles, detects the same text box in every tile:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tile_shapes: list[tuple] = []
+
+    def readtext_batched(self, ocr_frames: list, batch_size: int = 1) -> list[list]:
+        with self._lock:
+            self.tile_shapes += [ocr_frame.shape for ocr_frame in ocr_frames]
+        return [[([[30, 30], [74, 30], [74, 74], [30, 74]], "PHI", 0.99)] for __ in ocr_frames]
+
+    def readtext(self, ocr_frame) -> list:
+        return self.readtext_batched([ocr_frame])[0]
+
+
+def test_remove_pixel_phi_tiled_ocr_at_native_resolution():
+    ct_small = get_testdata_file("CT_small.dcm")
+    assert isinstance(ct_small, str)
+    ds = dcmread(ct_small)
+    pixels = np.kron(ds.pixel_array, np.ones((16, 16), dtype=ds.pixel_array.dtype))  # 2048 x 2048
+    ds.Rows, ds.Columns = pixels.shape
+    ds.PixelData = pixels.tobytes()
+    ds.PixelSpacing = [0.1, 0.1]
+
+    ocr_reader = TileOCRReader()
+    remove_pixel_phi_from_dataset(ds, ocr_reader, ocr_batch_size=4, tiled_ocr=True, tile_threads=2)  # type: ignore
+    # 2088 x 2088 with border, 1000 pixel tiles overlapping by 125 pixels: 3 x 3 tiles, not downscaled:
+    assert ocr_reader.tile_shapes == [(1000, 1000)] * 9
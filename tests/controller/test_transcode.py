@@ -0,0 +1,79 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from pydicom import dcmread
+from pydicom.data import get_testdata_file
+from pydicom.uid import JPEG2000Lossless, RLELossless
+
+from anonymizer.controller.transcode import ExportTranscoder, encoder_available, transcode_file
+
+
+@pytest.fixture
+def ct_file() -> str:
+    ct_small = get_testdata_file("CT_small.dcm")
+    assert isinstance(ct_small, str)
+    return ct_small
+
+
+def test_transcode_file_rle(temp_dir: str, ct_file: str) -> None:
+    assert encoder_available(RLELossless)
+    result = transcode_file(ct_file, Path(temp_dir), RLELossless)
+    assert result.transcoded
+    assert result.src_path == ct_file
+    assert Path(result.send_path).name == Path(ct_file).name
+    assert result.send_size == os.path.getsize(result.send_path)
+
+    ds = dcmread(result.send_path)
+    assert ds.file_meta.TransferSyntaxUID == RLELossless
+    assert (ds.pixel_array == dcmread(ct_file).pixel_array).all()
+
+
+def test_transcode_file_jpeg2000(temp_dir: str, ct_file: str) -> None:
+    pytest.importorskip("openjpeg")
+    assert encoder_available(JPEG2000Lossless)
+    result = transcode_file(ct_file, Path(temp_dir), JPEG2000Lossless)
+    assert result.transcoded
+    assert result.send_size < result.original_size
+
+    ds = dcmread(result.send_path)
+    assert ds.file_meta.TransferSyntaxUID == JPEG2000Lossless
+    assert (ds.pixel_array == dcmread(ct_file).pixel_array).all()
+
+
+def test_transcode_file_not_accepted(temp_dir: str, ct_file: str) -> None:
+    result = transcode_file(ct_file, Path(temp_dir), RLELossless, lambda sop_class_uid: False)
+    assert not result.transcoded
+    assert result.send_path == ct_file
+    assert not os.listdir(temp_dir)
+
+
+def test_transcode_file_already_compressed(temp_dir: str) -> None:
+    rle_file = get_testdata_file("MR_small_RLE.dcm")
+    assert isinstance(rle_file, str)
+    result = transcode_file(rle_file, Path(temp_dir), JPEG2000Lossless)
+    assert not result.transcoded
+    assert result.send_path == rle_file
+
+
+def test_export_transcoder_deletes_transcoded_files(temp_dir: str, ct_file: str) -> None:
+    # Transcoded files are named after the source file, one per instance:
+    src_dir = Path(temp_dir, "images")
+    src_dir.mkdir()
+    file_paths = [str(shutil.copy(ct_file, src_dir / f"{i}.dcm")) for i in range(5)]
+    transcoder = ExportTranscoder(RLELossless, workers=2, tmp_dir=Path(temp_dir, "export_tmp"))
+    try:
+        sent = 0
+        for result in transcoder.transcode(file_paths):
+            assert result.transcoded
+            assert os.path.exists(result.send_path)
+            sent += 1
+        assert sent == 5
+        assert not os.listdir(Path(temp_dir, "export_tmp"))
+
+        with transcoder.transcode_all(file_paths[:1]) as results:
+            assert os.path.exists(results[0].send_path)
+        assert not os.path.exists(results[0].send_path)
+    finally:
+        transcoder.shutdown()
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -330,3 +331,49 @@ def test_capture_phi_with_ct_small_and_mr_brain_filename(anonymizer_model: Anony
     assert anonymizer_model.instance_received(ct1_ds.SOPInstanceUID) is True
     assert anonymizer_model.instance_received(mr1_ds.SOPInstanceUID) is True
     assert anonymizer_model.instance_received("non_existent_uid") is False
+
+
+def test_export_manifest(anonymizer_model: AnonymizerModel):
+    dest = "EXPORTAE@127.0.0.1:11112"
+    pt_id = TEST_SITEID + "-000001"
+    assert anonymizer_model.get_exported_instances(dest, pt_id) == set()
+    assert anonymizer_model.get_export_reconciled(dest, pt_id) is None
+
+    # Reconcile with instances found on destination:
+    anonymizer_model.reconcile_exported_instances(dest, pt_id, {"1.2.3.1", "1.2.3.2"})
+    assert anonymizer_model.get_export_reconciled(dest, pt_id) is not None
+    assert anonymizer_model.get_exported_instances(dest, pt_id) == {"1.2.3.1", "1.2.3.2"}
+
+    # Record instances sent, re-sending an instance is not an error:
+    anonymizer_model.add_exported_instances(dest, pt_id, ["1.2.3.2", "1.2.3.3"])
+    assert anonymizer_model.get_exported_instances(dest, pt_id) == {"1.2.3.1", "1.2.3.2", "1.2.3.3"}
+    assert anonymizer_model.get_exported_instances("OTHER@127.0.0.1:104", pt_id) == set()
+
+    # Reconciliation replaces manifest of patient:
+    anonymizer_model.reconcile_exported_instances(dest, pt_id, {"1.2.3.3"})
+    assert anonymizer_model.get_exported_instances(dest, pt_id) == {"1.2.3.3"}
+
+
+def test_export_queue(anonymizer_model: AnonymizerModel):
+    pt_ids = [TEST_SITEID + "-000001", TEST_SITEID + "-000002"]
+    anonymizer_model.enqueue_exports("EXPORT", pt_ids)
+    assert [entry.patient_id for entry in anonymizer_model.get_export_queue()] == pt_ids
+    assert len(anonymizer_model.get_export_queue(due_before=datetime.now())) == 2
+
+    # Failed attempt, retry scheduled:
+    assert anonymizer_model.record_export_failure("EXPORT", pt_ids[0], "Connection error") == 1
+    assert anonymizer_model.record_export_failure("EXPORT", pt_ids[0], "Connection error") == 2
+    anonymizer_model.schedule_export("EXPORT", pt_ids[0], datetime.now() + timedelta(hours=1))
+    due = anonymizer_model.get_export_queue(due_before=datetime.now())
+    assert [entry.patient_id for entry in due] == [pt_ids[1]]
+    entry = anonymizer_model.get_export_queue()[0]
+    assert entry.attempts == 2
+    assert entry.last_error_msg == "Connection error"
+
+    # Re-queue resets attempts:
+    anonymizer_model.enqueue_exports("EXPORT", pt_ids[:1])
+    assert all(entry.attempts == 0 for entry in anonymizer_model.get_export_queue())
+
+    anonymizer_model.dequeue_exports("EXPORT", pt_ids)
+    assert anonymizer_model.get_export_queue() == []
+    assert anonymizer_model.record_export_failure("EXPORT", pt_ids[0], "Connection error") == 0